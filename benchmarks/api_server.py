@@ -0,0 +1,306 @@
+"""
+Local stand-in for the api-football endpoints the fetchers use, for load
+testing fetch concurrency, the rate limiter and the retries without a key or
+quota. Point config.py at it and run the program as usual:
+
+    python -m benchmarks.api_server --port 8080 --per-minute 300 --latency 80 --jitter 40
+    BASE_URL = 'http://127.0.0.1:8080'
+
+Data comes from the synthetic generator (default) or from a cache directory
+(--source cache --data-dir COPY_OF_DATA), which replays recorded responses.
+"""
+import argparse
+import collections
+import json
+import random
+import threading
+import time
+
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl
+
+from benchmarks.synthetic import SyntheticWorld
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def encode(body):
+    # Not the cache serializer: synthetic mode runs without a config.py
+    if orjson is not None:
+        return orjson.dumps(body)
+    return json.dumps(body).encode('utf-8')
+
+class SyntheticSource:
+    """Answers every endpoint from a SyntheticWorld."""
+
+    def __init__(self, world, fixtures_per_day=5000):
+        self.world = world
+        self.fixtures_per_day = fixtures_per_day
+        self.days = {}
+        self._lock = threading.Lock()
+
+    def _day(self, date_str):
+        with self._lock:
+            if date_str not in self.days:
+                self.days[date_str] = self.world.fixtures_for_day(date_str, self.fixtures_per_day)['response']
+            return self.days[date_str]
+
+    def fixtures(self, params):
+        if 'ids' in params:
+            return [self.world.finished_fixture(int(fixture_id)) for fixture_id in params['ids'].split('-')]
+        if 'id' in params:
+            return [self.world.finished_fixture(int(params['id']))]
+        if 'league' in params:
+            self._day(params['date'])
+            with self._lock:
+                return self.world.league_fixtures_for_day(int(params['league']), params['date'])
+        return self._day(params.get('date') or datetime.now().strftime('%Y-%m-%d'))
+
+    def standings(self, params):
+        league_id = int(params['league'])
+        return self.world.standings(league_id)['response'] if league_id in self.world.leagues else []
+
+    def predictions(self, params):
+        fixture_id = int(params['fixture'])
+        if fixture_id not in self.world.fixtures:
+            return []
+        return self.world.prediction(fixture_id)['response']
+
+    def injuries(self, params):
+        return self.world.injuries(int(params['fixture']))
+
+    def players(self, params):
+        return self.world.players(int(params['fixture']))
+
+    def team_statistics(self, params):
+        return self.world.team_statistics(int(params['team']), int(params['league']))
+
+    def leagues(self, params):
+        return self.world.current_leagues()
+
+class CacheSource:
+    """Replays responses recorded in the local cache, ignoring their age."""
+
+    def __init__(self):
+        from helpers.data.cache import get_cache
+
+        self.get_cache = get_cache
+
+    def _recorded(self, cache_name, key):
+        data = self.get_cache(cache_name).get(key, ignore_ttl=True)
+        return data.get('response', []) if isinstance(data, dict) else []
+
+    def fixtures(self, params):
+        if 'ids' in params or 'id' in params:
+            fixture_ids = (params.get('ids') or params['id']).split('-')
+            fixtures = [self.get_cache('fixture').get(int(fixture_id), ignore_ttl=True) for fixture_id in fixture_ids]
+            return [fixture for fixture in fixtures if fixture]
+        day = self._recorded('fixtures', params.get('date') or datetime.now().strftime('%Y-%m-%d'))
+        if 'league' in params:
+            return [fixture for fixture in day if fixture['league']['id'] == int(params['league'])]
+        return day
+
+    def standings(self, params):
+        return self._recorded('standings', int(params['league']))
+
+    def predictions(self, params):
+        return self._recorded('predictions', int(params['fixture']))
+
+    def injuries(self, params):
+        return self._recorded('injuries', int(params['fixture']))
+
+    def players(self, params):
+        return self._recorded('players', int(params['fixture']))
+
+    def team_statistics(self, params):
+        return self._recorded('team_stats', int(params['team']))
+
+    def leagues(self, params):
+        return self._recorded('leagues', 'current')
+
+# Path -> name of the source method answering it
+ENDPOINTS = {
+    '/fixtures': 'fixtures',
+    '/standings': 'standings',
+    '/predictions': 'predictions',
+    '/injuries': 'injuries',
+    '/fixtures/players': 'players',
+    '/teams/statistics': 'team_statistics',
+    '/leagues': 'leagues',
+}
+
+class RateLimits:
+    """
+    Per-minute (sliding window) and daily request allowance, reported with the
+    same headers as api-football.
+    """
+
+    def __init__(self, per_minute, daily):
+        self.per_minute = per_minute
+        self.daily = daily
+        self.daily_used = 0
+        self.window = collections.deque()
+        self._lock = threading.Lock()
+
+    def take(self):
+        """
+        Count one request. Returns (outcome, headers, retry_after) where outcome
+        is 'ok', 'minute' (too many requests) or 'daily' (quota used up).
+        """
+        with self._lock:
+            now = time.monotonic()
+            while self.window and now - self.window[0] >= 60:
+                self.window.popleft()
+
+            if self.daily_used >= self.daily:
+                outcome, retry_after = 'daily', None
+            elif len(self.window) >= self.per_minute:
+                outcome, retry_after = 'minute', max(1, int(60 - (now - self.window[0])) + 1)
+            else:
+                outcome, retry_after = 'ok', None
+                self.window.append(now)
+                self.daily_used += 1
+
+            headers = {
+                'X-RateLimit-Limit': self.per_minute,
+                'X-RateLimit-Remaining': max(0, self.per_minute - len(self.window)),
+                'x-ratelimit-requests-limit': self.daily,
+                'x-ratelimit-requests-remaining': max(0, self.daily - self.daily_used),
+            }
+            return outcome, headers, retry_after
+
+class StandInHandler(BaseHTTPRequestHandler):
+    # Keep connections open so the client's connection pool is exercised
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.count('requests')
+
+        delay = max(0.0, random.uniform(server.latency - server.jitter, server.latency + server.jitter))
+        if delay:
+            time.sleep(delay / 1000)
+
+        if random.random() < server.drop_rate:
+            # Drop the connection without answering, like a proxy timing out
+            server.count('dropped')
+            self.close_connection = True
+            return
+
+        url = urlparse(self.path)
+        params = dict(parse_qsl(url.query))
+        endpoint = ENDPOINTS.get(url.path)
+        if endpoint is None:
+            server.count('not_found')
+            self.send_json(404, {'message': f"Endpoint '{url.path}' does not exist"})
+            return
+
+        envelope = {'get': url.path.lstrip('/'), 'parameters': params, 'errors': [], 'results': 0,
+                    'paging': {'current': 1, 'total': 1}, 'response': []}
+        if not self.headers.get('x-rapidapi-key') and not self.headers.get('x-apisports-key'):
+            envelope['errors'] = {'token': "Error/Missing application key."}
+            self.send_json(200, envelope)
+            return
+
+        outcome, headers, retry_after = server.limits.take()
+        if outcome == 'minute':
+            server.count('throttled')
+            headers['Retry-After'] = retry_after
+            self.send_json(429, {'message': "Too many requests. You have exceeded the rate limit per minute."}, headers)
+            return
+        if outcome == 'daily':
+            server.count('quota_exceeded')
+            envelope['errors'] = {'requests': "You have reached the request limit for the day."}
+            self.send_json(200, envelope, headers)
+            return
+
+        try:
+            response = getattr(server.source, endpoint)(params)
+        except (KeyError, ValueError) as e:
+            envelope['errors'] = {'parameters': f"Missing or invalid parameter: {e}"}
+            self.send_json(200, envelope, headers)
+            return
+
+        envelope['response'] = response
+        envelope['results'] = len(response) if isinstance(response, list) else 1
+        self.send_json(200, envelope, headers)
+
+    def send_json(self, status, body, headers=None):
+        raw = encode(body)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(raw)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, source, limits, latency=0.0, jitter=0.0, drop_rate=0.0, verbose=False):
+        super().__init__(address, StandInHandler)
+        self.source = source
+        self.limits = limits
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.verbose = verbose
+        self.counters = collections.Counter()
+        self._counters_lock = threading.Lock()
+
+    def count(self, name):
+        with self._counters_lock:
+            self.counters[name] += 1
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve api-football shaped responses locally for load testing.")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to bind (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8080, help="Port to listen on (default: 8080)")
+    parser.add_argument('--source', choices=['synthetic', 'cache'], default='synthetic',
+                        help="Generate responses, or replay the ones recorded in the local cache")
+    parser.add_argument('--data-dir', default=None,
+                        help="Recorded data directory for --source cache (default: BASE_DIR of config.py)")
+    parser.add_argument('--fixtures', type=int, default=5000, help="Synthetic fixtures per day")
+    parser.add_argument('--leagues', type=int, default=300, help="Synthetic leagues")
+    parser.add_argument('--per-minute', type=int, default=300, help="Requests allowed per minute before 429s")
+    parser.add_argument('--daily', type=int, default=7500, help="Requests allowed per day")
+    parser.add_argument('--latency', type=float, default=0.0, help="Added latency per request in ms")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Random +/- variation of the latency in ms")
+    parser.add_argument('--drop-rate', type=float, default=0.0, help="Share of requests answered by closing the connection")
+    parser.add_argument('--verbose', action='store_true', help="Log every request")
+    args = parser.parse_args(argv)
+
+    if args.source == 'cache':
+        if args.data_dir:
+            # Replay a copy of the cache, not the one the program under test writes to
+            from benchmarks.run import install_config
+
+            install_config(args.data_dir)
+        source = CacheSource()
+    else:
+        source = SyntheticSource(SyntheticWorld(league_count=args.leagues), args.fixtures)
+
+    server = StandInServer(
+        (args.host, args.port), source, RateLimits(args.per_minute, args.daily),
+        args.latency, args.jitter, args.drop_rate, args.verbose
+    )
+    print(f"api-football stand-in on http://{args.host}:{server.server_address[1]} "
+          f"({args.source} data, {args.per_minute}/min, {args.daily}/day, {args.latency:g}+/-{args.jitter:g} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(', '.join(f"{name}: {count}" for name, count in sorted(server.counters.items())) or "No requests served")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""
+Time the hot paths of a rating run on synthetic api-football data.
+
+Everything runs against a temporary data directory with the network stubbed
+out, so the real cache and the request quota are never touched:
+
+    python -m benchmarks.run --output bench_results.json
+    python -m benchmarks.run --output new.json --compare bench_results.json
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+
+from datetime import datetime
+
+DATA_DIRS = {
+    'PREDICTIONS_DIR': 'predictions_data',
+    'INJURIES_DIR': 'injuries_data',
+    'PLAYERS_DIR': 'players_data',
+    'STANDINGS_DIR': 'standings_data',
+    'FIXTURES_DIR': 'fixtures_data',
+    'RATINGS_DIR': 'rated_fixtures_data',
+    'TEAMS_DIR': 'teams_data',
+    'BETS_DIR': 'bets_data',
+}
+
+BENCH_DATE = '2024-10-05'
+
+def install_config(base_dir):
+    """
+    Point config at base_dir before any project module reads it. The other
+    settings of an existing config.py (serializer, compression, backend) are
+    kept so they can be compared; without one a minimal config is used.
+    """
+    try:
+        import config
+    except ImportError:
+        config = types.ModuleType('config')
+        config.API_KEY = 'benchmark'
+        config.BASE_URL = 'localhost'
+        sys.modules['config'] = config
+
+    config.BASE_DIR = base_dir
+    for name, folder in DATA_DIRS.items():
+        setattr(config, name, os.path.join(base_dir, folder))
+        os.makedirs(getattr(config, name), exist_ok=True)
+    config.SQLITE_PATH = os.path.join(base_dir, 'cache.sqlite3')
+    # The stubbed API answers instantly; do not pace it like the real one
+    config.RATE_LIMIT_PER_MINUTE = 10 ** 9
+    return config
+
+def install_stub_api(world):
+    """Replace the shared API client with one answering from the synthetic world."""
+    from helpers import api_client
+    from helpers.api_client import ApiClient, ApiResponse
+    from helpers.data.serializer import encode
+
+    class StubApiClient(ApiClient):
+        requests = 0
+
+        def _send(self, url):
+            StubApiClient.requests += 1
+            path, _, query = url.partition('?')
+            params = dict(param.split('=', 1) for param in query.split('&') if param)
+            if path == '/fixtures' and 'ids' in params:
+                body = {'response': [world.finished_fixture(int(fixture_id)) for fixture_id in params['ids'].split('-')]}
+            elif path == '/standings':
+                body = world.standings(int(params['league']))
+            elif path == '/predictions':
+                body = world.prediction(int(params['fixture']))
+            else:
+                return ApiResponse(404, 'Not Found', {}, b'{"errors": ["unknown endpoint"], "response": []}')
+            return ApiResponse(200, 'OK', {}, encode(body))
+
+    api_client._client = StubApiClient('localhost', 'benchmark')
+    return StubApiClient
+
+def measure(name, function, repeat, items, setup=None):
+    """
+    Run function repeat times and return its timings. When setup is given it
+    runs untimed before every repetition and its result is passed to function.
+    """
+    timings = []
+    for _ in range(repeat):
+        argument = setup() if setup is not None else None
+        started_at = time.perf_counter()
+        if setup is not None:
+            function(argument)
+        else:
+            function()
+        timings.append(time.perf_counter() - started_at)
+
+    median = statistics.median(timings)
+    return {
+        'name': name,
+        'items': items,
+        'repeat': repeat,
+        'min_ms': round(min(timings) * 1000, 3),
+        'median_ms': round(median * 1000, 3),
+        'mean_ms': round(statistics.mean(timings) * 1000, 3),
+        'per_item_us': round(median * 1e6 / items, 3) if items else None
+    }
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(fixture_count=5000, league_count=300, repeat=5, bet_count=500):
+    """Generate the synthetic data, time every hot path and return the results document."""
+    from benchmarks.synthetic import SyntheticWorld
+
+    world = SyntheticWorld(league_count=league_count)
+    day = world.fixtures_for_day(BENCH_DATE, fixture_count)
+    standings_payloads = {league_id: world.standings(league_id) for league_id in world.leagues}
+    stub_client = install_stub_api(world)
+
+    from services.fixtures import (
+        STATUSES_TO_SEARCH, TRUSTED_COUNTRIES, filter_fixtures, stream_fixtures, remove_duplicates,
+        save_rated_fixtures, load_rated_fixtures, forget_rated_fixture_index, rated_fixtures_paths
+    )
+    from services.standings import extract_team_info, get_team_rank
+    from services.predictions import rate_fixture
+    from services.bets import check_bets_success_rate
+    from services.records import FixtureRecord, RatingRecord
+    from helpers.data.cache import get_cache
+    from helpers.data.serializer import dump_file, SERIALIZER, COMPRESSION
+    from helpers.settings import CACHE_BACKEND
+    from config import BETS_DIR
+
+    fixtures = day['response']
+    results = []
+
+    results.append(measure(
+        'filter_fixtures', lambda: filter_fixtures(fixtures, STATUSES_TO_SEARCH, TRUSTED_COUNTRIES),
+        repeat, len(fixtures)
+    ))
+
+    get_cache('fixtures').set(BENCH_DATE, day)
+    results.append(measure(
+        'stream_fixtures (cached day)',
+        lambda: list(stream_fixtures(STATUSES_TO_SEARCH, TRUSTED_COUNTRIES, BENCH_DATE, offline=True)),
+        repeat, len(fixtures)
+    ))
+
+    results.append(measure(
+        'extract_team_info', lambda: [extract_team_info(payload) for payload in standings_payloads.values()],
+        repeat, len(standings_payloads)
+    ))
+
+    indexes = {league_id: extract_team_info(payload) for league_id, payload in standings_payloads.items()}
+    team_lists = {league_id: list(index) for league_id, index in indexes.items()}
+
+    def rank_all(team_info_by_league):
+        for fixture in fixtures:
+            home_team = fixture['teams']['home']
+            get_team_rank(team_info_by_league[fixture['league']['id']], home_team['name'], home_team['id'])
+
+    results.append(measure('get_team_rank (StandingsIndex)', lambda: rank_all(indexes), repeat, len(fixtures)))
+    results.append(measure('get_team_rank (list)', lambda: rank_all(team_lists), repeat, len(fixtures)))
+
+    # rate_fixture logs every fixture at INFO; keep the cost of the calls but not the output
+    logging.getLogger().setLevel(logging.WARNING)
+    rating_inputs = []
+    for fixture in fixtures[:2000]:
+        index = indexes[fixture['league']['id']]
+        rating_inputs.append((
+            world.prediction(fixture['fixture']['id'])['response'][0],
+            index.find(fixture['teams']['home']['id']),
+            index.find(fixture['teams']['away']['id'])
+        ))
+    results.append(measure(
+        'rate_fixture', lambda: [rate_fixture(*rating_input) for rating_input in rating_inputs],
+        repeat, len(rating_inputs)
+    ))
+
+    records = [
+        RatingRecord(FixtureRecord.from_api(fixture), 5, 1, 'two_star', fixture['teams']['home']['name'],
+                     fixture['teams']['home']['name'], "Win or draw | Double chance")
+        for fixture in fixtures
+    ]
+    # Every fourth fixture is rated twice, as when a day is rated by several runs
+    duplicated = records + records[::4]
+    results.append(measure('remove_duplicates', lambda: remove_duplicates(duplicated), repeat, len(duplicated)))
+
+    tiers = [records[0::4], records[1::4], records[2::4], records[3::4]]
+    today = datetime.now().strftime('%Y-%m-%d')
+
+    def clear_ratings():
+        for path in rated_fixtures_paths(today):
+            if os.path.exists(path):
+                os.remove(path)
+        forget_rated_fixture_index(today)
+
+    results.append(measure(
+        'save_rated_fixtures', lambda _: save_rated_fixtures(*tiers), repeat, len(records), setup=clear_ratings
+    ))
+    results.append(measure(
+        'load_rated_fixtures', lambda _: load_rated_fixtures(today), repeat, len(records),
+        setup=lambda: forget_rated_fixture_index(today)
+    ))
+
+    bet_rounds = iter(range(repeat))
+
+    def write_pending_bets():
+        # New fixture ids every round so each settlement starts from a cold cache
+        first_id = 5000000 + next(bet_rounds) * bet_count
+        bets = [{
+            'fixture_id': fixture_id,
+            'team_name': f"Home {fixture_id} vs Away {fixture_id}",
+            'multiplier': 1.8,
+            'home_team_points': 6,
+            'away_team_points': 1,
+            'predicted_winner': f"Predicted winner: Home {fixture_id}"
+        } for fixture_id in range(first_id, first_id + bet_count)]
+        dump_file(os.path.join(BETS_DIR, 'bets.json'), [])
+        return bets
+
+    requests_before = stub_client.requests
+    results.append(measure(
+        'check_bets_success_rate (stubbed network)', check_bets_success_rate, repeat, bet_count,
+        setup=write_pending_bets
+    ))
+    results[-1]['api_requests'] = (stub_client.requests - requests_before) // repeat
+
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {'serializer': SERIALIZER, 'compression': COMPRESSION, 'backend': CACHE_BACKEND},
+        'sizes': {'fixtures': fixture_count, 'leagues': league_count, 'bets': bet_count},
+        'results': results
+    }
+
+def print_results(document, baseline=None, threshold=0.1):
+    """Print the results, with the change against a baseline document when given."""
+    previous = {result['name']: result for result in (baseline or {}).get('results', [])}
+    if baseline and baseline.get('sizes') != document['sizes']:
+        print(f"Baseline was run with {baseline.get('sizes')}, not {document['sizes']}; changes are not comparable.")
+    regressions = []
+    print(f"{'benchmark':<44} {'items':>6} {'median ms':>10} {'per item us':>12} {'change':>8}")
+    for result in document['results']:
+        change = ''
+        old = previous.get(result['name'])
+        if old and old['median_ms']:
+            ratio = result['median_ms'] / old['median_ms'] - 1
+            change = f"{ratio:+.0%}"
+            if ratio > threshold:
+                change += ' !'
+                regressions.append(result['name'])
+        print(f"{result['name']:<44} {result['items']:>6} {result['median_ms']:>10.2f} "
+              f"{result['per_item_us'] or 0:>12.2f} {change:>8}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the rating hot paths on synthetic data.")
+    parser.add_argument('--output', default='bench_results.json', help="JSON file the results are written to")
+    parser.add_argument('--compare', default=None, help="Earlier results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.1, help="Slowdown reported as a regression (default: 0.1 = 10%%)")
+    parser.add_argument('--fixtures', type=int, default=5000, help="Fixtures in the synthetic day")
+    parser.add_argument('--leagues', type=int, default=300, help="Leagues with standings")
+    parser.add_argument('--bets', type=int, default=500, help="Pending bets settled per repetition")
+    parser.add_argument('--repeat', type=int, default=5, help="Repetitions per benchmark; the median is reported")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as file:
+            baseline = json.load(file)
+
+    with tempfile.TemporaryDirectory(prefix='bench_') as base_dir:
+        install_config(base_dir)
+        # The code under test reports progress with print; keep it out of the report
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            document = run_benchmarks(args.fixtures, args.leagues, args.repeat, args.bets)
+
+    with open(args.output, 'w') as file:
+        json.dump(document, file, indent=4)
+
+    regressions = print_results(document, baseline, args.threshold)
+    print(f"Results written to {args.output}")
+    if regressions:
+        print(f"Slower than {args.compare} by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,318 @@
+import random
+
+from datetime import datetime, timedelta
+
+# Countries of the synthetic leagues; the first nine are the trusted ones, so
+# roughly the same share of fixtures passes filter_fixtures as on a real day
+COUNTRIES = [
+    'England', 'Spain', 'Italy', 'Germany', 'France', 'Portugal', 'Netherlands', 'Sweden', 'Norway',
+    'Brazil', 'Argentina', 'USA', 'Mexico', 'Japan', 'South-Korea', 'China', 'Turkey', 'Greece', 'Poland',
+    'Belgium', 'Austria', 'Switzerland', 'Denmark', 'Scotland', 'Russia', 'Ukraine', 'Chile', 'Colombia',
+    'Egypt', 'Australia', 'Saudi-Arabia', 'World'
+]
+STATUSES = ['NS'] * 6 + ['TBD', 'FT', 'FT', '1H', 'HT', '2H', 'PST', 'CANC']
+PLACES = [
+    'North', 'South', 'East', 'West', 'Port', 'Lake', 'Mount', 'River', 'Green', 'Old', 'New', 'Royal',
+    'Saint', 'Black', 'White', 'Red', 'Blue', 'Golden', 'Silver', 'Iron'
+]
+# The first leagues of the trusted countries carry real names, so the trusted
+# leagues fetch mode finds them in the league list
+LEAGUE_NAMES = {
+    'England': ['Premier League', 'Championship'],
+    'Spain': ['La Liga', 'Segunda Divisi\u00f3n'],
+    'Italy': ['Serie A', 'Serie B'],
+    'Germany': ['Bundesliga', '2. Bundesliga'],
+    'France': ['Ligue 1'],
+    'Portugal': ['Primeira Liga'],
+    'Netherlands': ['Eredivisie'],
+    'Sweden': ['Allsvenskan', 'Superettan'],
+    'Norway': ['Eliteserien'],
+}
+POSITIONS = ['G', 'D', 'D', 'D', 'D', 'M', 'M', 'M', 'M', 'F', 'F', 'G', 'D', 'M', 'F', 'M']
+INJURY_REASONS = [('Missing Fixture', 'Knee Injury'), ('Missing Fixture', 'Red Card'), ('Questionable', 'Muscle Injury'),
+                  ('Missing Fixture', 'Hamstring Injury'), ('Questionable', 'Illness')]
+SUFFIXES = ['United', 'City', 'Rovers', 'Athletic', 'FC', 'Town', 'Wanderers', 'Albion', 'Sporting', 'Real', 'Dynamo', 'Olympic']
+
+class SyntheticWorld:
+    """
+    Deterministic set of leagues and teams from which api-football shaped
+    payloads are generated: fixtures by date, standings, predictions, squads,
+    injuries, team statistics and the league list.
+
+    :param league_count: Number of leagues (each with its own standings).
+    :param teams_per_league: Teams in every league.
+    :param seed: Seed of the random generator, so runs are comparable.
+    """
+
+    def __init__(self, league_count=300, teams_per_league=20, seed=42):
+        self.random = random.Random(seed)
+        self.season = 2024
+        self.leagues = {}
+        for league_id in range(1, league_count + 1):
+            country = COUNTRIES[(league_id - 1) % len(COUNTRIES)]
+            teams = []
+            for position in range(teams_per_league):
+                team_id = league_id * 1000 + position
+                name = f"{self.random.choice(PLACES)} {country[:4]} {self.random.choice(SUFFIXES)} {position}"
+                teams.append({'id': team_id, 'name': name, 'strength': self.random.random()})
+            real_names = LEAGUE_NAMES.get(country, [])
+            country_rank = (league_id - 1) // len(COUNTRIES)
+            self.leagues[league_id] = {
+                'id': league_id,
+                'name': real_names[country_rank] if country_rank < len(real_names) else f"{country} League {league_id}",
+                'country': country,
+                'teams': teams
+            }
+        self.fixtures = {}
+
+    def form(self, strength):
+        return ''.join(self.random.choices('WDL', weights=[strength + 0.2, 0.3, 1.2 - strength], k=5))
+
+    def make_fixture(self, fixture_id, date_str, league, home_team, away_team, status=None):
+        status = status or self.random.choice(STATUSES)
+        finished = status == 'FT'
+        home_goals = self.random.randint(0, 4) if finished else None
+        away_goals = self.random.randint(0, 3) if finished else None
+        kickoff = datetime.strptime(date_str, '%Y-%m-%d') + timedelta(minutes=self.random.randrange(10 * 60, 22 * 60, 15))
+        return {
+            'fixture': {
+                'id': fixture_id,
+                'referee': f"Referee {fixture_id % 97}",
+                'timezone': 'UTC',
+                'date': kickoff.strftime('%Y-%m-%dT%H:%M:%S+00:00'),
+                'timestamp': int(kickoff.timestamp()),
+                'periods': {'first': None, 'second': None},
+                'venue': {'id': home_team['id'], 'name': f"{home_team['name']} Stadium", 'city': home_team['name'].split()[0]},
+                'status': {'long': status, 'short': status, 'elapsed': 90 if finished else None}
+            },
+            'league': {
+                'id': league['id'],
+                'name': league['name'],
+                'country': league['country'],
+                'logo': f"https://media.example/leagues/{league['id']}.png",
+                'flag': f"https://media.example/flags/{league['country']}.svg",
+                'season': self.season,
+                'round': f"Regular Season - {self.random.randint(1, 38)}"
+            },
+            'teams': {
+                'home': {'id': home_team['id'], 'name': home_team['name'], 'logo': f"https://media.example/teams/{home_team['id']}.png",
+                         'winner': None if not finished else home_goals > away_goals},
+                'away': {'id': away_team['id'], 'name': away_team['name'], 'logo': f"https://media.example/teams/{away_team['id']}.png",
+                         'winner': None if not finished else away_goals > home_goals}
+            },
+            'goals': {'home': home_goals, 'away': away_goals},
+            'score': {
+                'halftime': {'home': None, 'away': None},
+                'fulltime': {'home': home_goals, 'away': away_goals},
+                'extratime': {'home': None, 'away': None},
+                'penalty': {'home': None, 'away': None}
+            }
+        }
+
+    def fixtures_for_day(self, date_str, count=5000, first_id=None):
+        """/fixtures?date= payload with count fixtures spread over all leagues."""
+        # Every generated day continues the fixture ids of the days before it
+        first_id = first_id or 1000000 + len(self.fixtures)
+        league_ids = list(self.leagues)
+        response = []
+        for offset in range(count):
+            league = self.leagues[self.random.choice(league_ids)]
+            home_team, away_team = self.random.sample(league['teams'], 2)
+            fixture = self.make_fixture(first_id + offset, date_str, league, home_team, away_team)
+            self.fixtures[fixture['fixture']['id']] = fixture
+            response.append(fixture)
+        return {
+            'get': 'fixtures',
+            'parameters': {'date': date_str},
+            'errors': [],
+            'results': len(response),
+            'paging': {'current': 1, 'total': 1},
+            'response': response
+        }
+
+    def league_fixtures_for_day(self, league_id, date_str):
+        """Fixtures of one league on a day, as /fixtures?league=&season=&date= returns them."""
+        if not any(fixture['fixture']['date'].startswith(date_str) for fixture in self.fixtures.values()):
+            self.fixtures_for_day(date_str)
+        return [
+            fixture for fixture in self.fixtures.values()
+            if fixture['league']['id'] == league_id and fixture['fixture']['date'].startswith(date_str)
+        ]
+
+    def finished_fixture(self, fixture_id):
+        """The fixture with the given id as it looks after full time."""
+        fixture = self.fixtures.get(fixture_id)
+        if fixture is None:
+            league = self.leagues[1 + fixture_id % len(self.leagues)]
+            home_team, away_team = league['teams'][0], league['teams'][1]
+            fixture = self.make_fixture(fixture_id, '2024-10-05', league, home_team, away_team, status='FT')
+        elif fixture['score']['fulltime']['home'] is None:
+            fixture = self.make_fixture(
+                fixture_id, fixture['fixture']['date'][:10], self.leagues[fixture['league']['id']],
+                self.team(fixture['teams']['home']['id']), self.team(fixture['teams']['away']['id']), status='FT'
+            )
+        return fixture
+
+    def team(self, team_id):
+        return self.leagues[team_id // 1000]['teams'][team_id % 1000]
+
+    def standings(self, league_id):
+        """/standings payload of a league, ranked by team strength."""
+        league = self.leagues[league_id]
+        ranked_teams = sorted(league['teams'], key=lambda team: team['strength'], reverse=True)
+        table = []
+        for rank, team in enumerate(ranked_teams, 1):
+            played = 30
+            win = int(played * (0.2 + team['strength'] * 0.6))
+            draw = self.random.randint(0, played - win)
+            lose = played - win - draw
+            goals_for = win * 2 + draw
+            goals_against = lose * 2 + draw
+            table.append({
+                'rank': rank,
+                'team': {'id': team['id'], 'name': team['name'], 'logo': f"https://media.example/teams/{team['id']}.png"},
+                'points': win * 3 + draw,
+                'goalsDiff': goals_for - goals_against,
+                'group': league['name'],
+                'form': self.form(team['strength']),
+                'status': 'same',
+                'description': None,
+                'all': {'played': played, 'win': win, 'draw': draw, 'lose': lose,
+                        'goals': {'for': goals_for, 'against': goals_against}},
+                'home': {'played': played // 2, 'win': win // 2, 'draw': draw // 2, 'lose': lose // 2,
+                         'goals': {'for': goals_for // 2, 'against': goals_against // 2}},
+                'away': {'played': played // 2, 'win': win - win // 2, 'draw': draw - draw // 2, 'lose': lose - lose // 2,
+                         'goals': {'for': goals_for - goals_for // 2, 'against': goals_against - goals_against // 2}},
+                'update': '2024-10-04T00:00:00+00:00'
+            })
+        return {
+            'get': 'standings',
+            'parameters': {'league': str(league_id), 'season': str(self.season)},
+            'errors': [],
+            'results': 1,
+            'response': [{'league': {
+                'id': league_id, 'name': league['name'], 'country': league['country'], 'season': self.season,
+                'standings': [table]
+            }}]
+        }
+
+    def _prediction_team(self, team):
+        wins = int(15 * (0.3 + team['strength']))
+        loses = max(1, 15 - wins)
+        goals_for = wins * 2 + 3
+        goals_against = loses * 2 + 2
+        return {
+            'id': team['id'],
+            'name': team['name'],
+            'last_5': {'form': f"{int(team['strength'] * 100)}%", 'att': '60%', 'def': '50%'},
+            'league': {
+                'form': self.form(team['strength']) * 2,
+                'fixtures': {
+                    'played': {'home': 8, 'away': 8, 'total': 16},
+                    'wins': {'home': wins // 2, 'away': wins - wins // 2, 'total': wins},
+                    'draws': {'home': 0, 'away': 1, 'total': 1},
+                    'loses': {'home': loses // 2, 'away': loses - loses // 2, 'total': loses}
+                },
+                'goals': {
+                    'for': {'total': {'home': goals_for // 2, 'away': goals_for - goals_for // 2, 'total': goals_for}},
+                    'against': {'total': {'home': goals_against // 2, 'away': goals_against - goals_against // 2, 'total': goals_against}}
+                }
+            }
+        }
+
+    def prediction(self, fixture_id):
+        """/predictions payload for a fixture generated by fixtures_for_day."""
+        fixture = self.fixtures[fixture_id]
+        home_team = self.team(fixture['teams']['home']['id'])
+        away_team = self.team(fixture['teams']['away']['id'])
+        home_share = 0.5 + (home_team['strength'] - away_team['strength']) / 2
+        percent_home = int(max(5, min(85, home_share * 90)))
+        percent_draw = self.random.randint(5, 100 - percent_home - 5)
+        percent_away = 100 - percent_home - percent_draw
+        winner = home_team if percent_home >= percent_away else away_team
+        return {
+            'get': 'predictions',
+            'parameters': {'fixture': str(fixture_id)},
+            'errors': [],
+            'results': 1,
+            'response': [{
+                'predictions': {
+                    'winner': {'id': winner['id'], 'name': winner['name'], 'comment': 'Win or draw'},
+                    'win_or_draw': True,
+                    'under_over': '-3.5',
+                    'goals': {'home': '-2.5', 'away': '-1.5'},
+                    'advice': f"Double chance : {winner['name']} or draw",
+                    'percent': {'home': f"{percent_home}%", 'draw': f"{percent_draw}%", 'away': f"{percent_away}%"}
+                },
+                'league': fixture['league'],
+                'teams': {'home': self._prediction_team(home_team), 'away': self._prediction_team(away_team)},
+                'comparison': {'form': {'home': '60%', 'away': '40%'}, 'total': {'home': '55%', 'away': '45%'}},
+                'h2h': []
+            }]
+        }
+
+    def squad(self, team):
+        """Deterministic squad of a team: (player id, name, position, rating)."""
+        squad_random = random.Random(team['id'])
+        return [
+            (team['id'] * 100 + number, f"{squad_random.choice(PLACES)[0]}. Player{team['id']}{number:02d}",
+             POSITIONS[number], f"{squad_random.uniform(5.8, 8.6):.1f}")
+            for number in range(len(POSITIONS))
+        ]
+
+    def _fixture_teams(self, fixture_id):
+        fixture = self.fixtures.get(fixture_id) or self.finished_fixture(fixture_id)
+        return fixture, self.team(fixture['teams']['home']['id']), self.team(fixture['teams']['away']['id'])
+
+    def players(self, fixture_id):
+        """/fixtures/players response: both squads with their match ratings."""
+        _, home_team, away_team = self._fixture_teams(fixture_id)
+        return [{
+            'team': {'id': team['id'], 'name': team['name'], 'logo': f"https://media.example/teams/{team['id']}.png"},
+            'players': [{
+                'player': {'id': player_id, 'name': name, 'photo': f"https://media.example/players/{player_id}.png"},
+                'statistics': [{'games': {'minutes': 90, 'number': player_id % 100, 'position': position,
+                                          'rating': rating, 'captain': False, 'substitute': False}}]
+            } for player_id, name, position, rating in self.squad(team)]
+        } for team in (home_team, away_team)]
+
+    def injuries(self, fixture_id):
+        """/injuries response: up to three players missing per team."""
+        fixture, home_team, away_team = self._fixture_teams(fixture_id)
+        injury_random = random.Random(fixture_id)
+        response = []
+        for team in (home_team, away_team):
+            for player_id, name, _, _ in injury_random.sample(self.squad(team), injury_random.randint(0, 3)):
+                injury_type, reason = injury_random.choice(INJURY_REASONS)
+                response.append({
+                    'player': {'id': player_id, 'name': name, 'photo': f"https://media.example/players/{player_id}.png",
+                               'type': injury_type, 'reason': reason},
+                    'team': {'id': team['id'], 'name': team['name'], 'logo': f"https://media.example/teams/{team['id']}.png"},
+                    'fixture': {'id': fixture_id, 'timezone': 'UTC', 'date': fixture['fixture']['date'],
+                                'timestamp': fixture['fixture']['timestamp']},
+                    'league': fixture['league']
+                })
+        return response
+
+    def team_statistics(self, team_id, league_id):
+        """/teams/statistics response (an object, not a list)."""
+        league = self.leagues[league_id]
+        team = self.team(team_id)
+        prediction_team = self._prediction_team(team)['league']
+        return {
+            'league': {'id': league_id, 'name': league['name'], 'country': league['country'], 'season': self.season},
+            'team': {'id': team_id, 'name': team['name'], 'logo': f"https://media.example/teams/{team_id}.png"},
+            'form': prediction_team['form'],
+            'fixtures': prediction_team['fixtures'],
+            'goals': prediction_team['goals']
+        }
+
+    def current_leagues(self):
+        """/leagues?current=true response."""
+        return [{
+            'league': {'id': league['id'], 'name': league['name'], 'type': 'League',
+                       'logo': f"https://media.example/leagues/{league['id']}.png"},
+            'country': {'name': league['country'], 'code': league['country'][:2].upper(),
+                        'flag': f"https://media.example/flags/{league['country']}.svg"},
+            'seasons': [{'year': self.season, 'start': f"{self.season}-08-01", 'end': f"{self.season + 1}-05-31", 'current': True}]
+        } for league in self.leagues.values()]
@@ -0,0 +1,12 @@
+# The project modules read config.py when they are imported. Point it at a
+# throwaway data directory before any test imports them, so the tests never
+# touch the real cache, ratings or bets.
+import atexit
+import shutil
+import tempfile
+
+from benchmarks.run import install_config
+
+_data_dir = tempfile.mkdtemp(prefix='tests_')
+atexit.register(shutil.rmtree, _data_dir, True)
+install_config(_data_dir)
@@ -1,110 +1,66 @@
-import json
-import http.client
-
 from datetime import datetime
 
-from config import API_KEY, BASE_URL
+from helpers.api_client import get_api_client
 
 def fetch_league_standings(league_id):
-    conn = http.client.HTTPSConnection(BASE_URL)
-    headers = {
-        'x-rapidapi-host': BASE_URL,
-        'x-rapidapi-key': API_KEY
-    }
     url = f"/standings?league={league_id}&season=2024"  # Adjust endpoint as needed
-    conn.request("GET", url, headers=headers)
-    res = conn.getresponse()
-    data = res.read()
+    res = get_api_client().get(url)
     
-    return json.loads(data.decode("utf-8"))
+    return res.json()
 
 def fetch_match_predictions(fixture_id):
-    conn = http.client.HTTPSConnection(BASE_URL)
-    headers = {
-        'x-rapidapi-host': BASE_URL,
-        'x-rapidapi-key': API_KEY
-    }
     url = f"/predictions?fixture={fixture_id}"
-    conn.request("GET", url, headers=headers)
-    res = conn.getresponse()
-    data = res.read()
-    return json.loads(data.decode("utf-8"))
+    res = get_api_client().get(url)
+    return res.json()
 
 def fetch_players_for_fixture(fixture_id):
-    conn = http.client.HTTPSConnection(BASE_URL)
-
-    headers = {
-        'x-rapidapi-host': BASE_URL,
-        'x-rapidapi-key': API_KEY
-    }
-
     url = f"/fixtures/players?fixture={fixture_id}"
-    conn.request("GET", url, headers=headers)
-    res = conn.getresponse()
-    data = res.read()
+    res = get_api_client().get(url)
     
     if res.status != 200:
         print(f"Error fetching players: {res.status} - {res.reason}")
         return None
     
     # Decode the JSON data
-    parsed_data = json.loads(data.decode("utf-8"))
+    parsed_data = res.json()
     
     return parsed_data
 
 def fetch_injuries_for_fixture(fixture_id):
-    conn = http.client.HTTPSConnection(BASE_URL)
-    headers = {
-        'x-rapidapi-host': BASE_URL,
-        'x-rapidapi-key': API_KEY
-    }
     url = f"/injuries?fixture={fixture_id}"
-    conn.request("GET", url, headers=headers)
-    res = conn.getresponse()
-    data = res.read()
-    return json.loads(data.decode("utf-8"))
+    res = get_api_client().get(url)
+    return res.json()
 
 
 def fetch_team_stats(team_id, league_id):
-    conn = http.client.HTTPSConnection(BASE_URL)
-    headers = {
-        'x-rapidapi-host': BASE_URL,
-        'x-rapidapi-key': API_KEY
-    }
     url = f"/teams/statistics?season=2024&team={team_id}&league={league_id}"
-    conn.request("GET", url, headers=headers)
-    res = conn.getresponse()
-    data = res.read()
-    return json.loads(data.decode("utf-8"))
+    res = get_api_client().get(url)
+    return res.json()
 
-def fetch_fixtures_for_day():
+def fetch_fixtures_for_day(raw=False, date_str=None):
     try:
-        # Get the current date
-        today = datetime.today()
-        # Format the date as YYYY-MM-DD
-        current_date = today.strftime('%Y-%m-%d')
-
-        conn = http.client.HTTPSConnection(BASE_URL)
-
-        headers = {
-            'x-rapidapi-host': BASE_URL,
-            'x-rapidapi-key': API_KEY
-        }
+        # Use the current date unless another day was asked for, as YYYY-MM-DD
+        current_date = date_str or datetime.today().strftime('%Y-%m-%d')
 
         # Create the request URL for fixtures of the current day
         url = f"/fixtures?date={current_date}"
-        conn.request("GET", url, headers=headers)
-
-        res = conn.getresponse()
-        data = res.read()
+        res = get_api_client().get(url)
 
         # Check the response status
         if res.status != 200:
             print(f"Error fetching fixtures: {res.status} - {res.reason}")
             return None
 
+        # Hand the body over undecoded so it can be parsed incrementally
+        if raw:
+            body = res.body.decode('utf-8')
+            if '"response"' not in body:
+                print("No 'response' field found in the data.")
+                return None
+            return body
+
         # Decode the JSON data
-        parsed_data = json.loads(data.decode("utf-8"))
+        parsed_data = res.json()
 
         # Check for the expected structure in the data
         if 'response' not in parsed_data:
@@ -119,19 +75,9 @@ def fetch_fixtures_for_day():
     
 def fetch_fixture(fixture_id):
     try:
-        conn = http.client.HTTPSConnection(BASE_URL)
-        
-        headers = {
-            'x-rapidapi-host': BASE_URL,
-            'x-rapidapi-key': API_KEY
-        }
-
         # Create the request URL for a specific fixture's score
         url = f"/fixtures?id={fixture_id}"
-        conn.request("GET", url, headers=headers)
-
-        res = conn.getresponse()
-        data = res.read()
+        res = get_api_client().get(url)
 
         # Check the response status
         if res.status != 200:
@@ -139,7 +85,7 @@ def fetch_fixture(fixture_id):
             return None
 
         # Decode the JSON data
-        parsed_data = json.loads(data.decode("utf-8"))
+        parsed_data = res.json()
 
         # Check for the expected structure in the data
         if 'response' not in parsed_data or not parsed_data['response']:
@@ -152,4 +98,58 @@ def fetch_fixture(fixture_id):
 
     except Exception as e:
         print(f"An error occurred: {e}")
-        return None
\ No newline at end of file
+        return None
+
+# The /fixtures endpoint accepts at most this many ids per request
+MAX_FIXTURE_IDS_PER_REQUEST = 20
+
+def fetch_fixtures_by_ids(fixture_ids):
+    try:
+        # Create the request URL for up to MAX_FIXTURE_IDS_PER_REQUEST fixtures at once
+        ids = '-'.join(str(fixture_id) for fixture_id in fixture_ids)
+        url = f"/fixtures?ids={ids}"
+        res = get_api_client().get(url)
+
+        # Check the response status
+        if res.status != 200:
+            print(f"Error fetching fixtures: {res.status} - {res.reason}")
+            return None
+
+        # Decode the JSON data
+        parsed_data = res.json()
+
+        # Check for the expected structure in the data
+        if 'response' not in parsed_data:
+            print("No 'response' field found in the data.")
+            return None
+
+        return parsed_data['response']
+
+    except Exception as e:
+        print(f"An error occurred while fetching fixtures: {e}")
+        return None
+
+def fetch_current_leagues():
+    url = "/leagues?current=true"
+    res = get_api_client().get(url)
+
+    if res.status != 200:
+        print(f"Error fetching leagues: {res.status} - {res.reason}")
+        return None
+
+    return res.json()
+
+def fetch_league_fixtures_for_day(league_id, season, date_str):
+    url = f"/fixtures?league={league_id}&season={season}&date={date_str}"
+    res = get_api_client().get(url)
+
+    if res.status != 200:
+        print(f"Error fetching fixtures for league {league_id}: {res.status} - {res.reason}")
+        return None
+
+    parsed_data = res.json()
+    if 'response' not in parsed_data:
+        print("No 'response' field found in the data.")
+        return None
+
+    return parsed_data
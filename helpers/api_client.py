@@ -0,0 +1,165 @@
+import queue
+import threading
+
+from urllib.parse import urlsplit
+
+from helpers.data.serializer import decode
+from helpers.rate_limiter import get_rate_limiter
+from helpers.settings import API_POOL_SIZE
+
+from config import API_KEY, BASE_URL
+
+def parse_retry_after(value):
+    """
+    Seconds to wait from a Retry-After header, given either as seconds or as
+    an HTTP date. None when it is missing or unreadable, so the default pause applies.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    import email.utils
+    import time
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+class ApiResponse:
+    """Fully read response from the API so the connection can be reused straight away."""
+
+    def __init__(self, status, reason, headers, body):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return decode(self.body)
+
+class ApiClient:
+    """
+    Keep-alive HTTP(S) client shared by every fetcher.
+
+    Connections are kept in a small pool and handed out one per request, so
+    repeated calls reuse the same TCP + TLS session instead of opening a new
+    one each time. The pool is safe to use from several threads.
+
+    :param host: API host name (e.g. 'v3.football.api-sports.io'), or a URL such as
+                 'http://127.0.0.1:8080' to talk plain HTTP to a local stand-in.
+    :param api_key: Key sent with every request.
+    :param pool_size: Maximum number of idle connections kept open.
+    :param timeout: Socket timeout in seconds.
+    :param limiter: TokenBucket that paces requests; defaults to the shared one.
+    """
+
+    def __init__(self, host, api_key, pool_size=API_POOL_SIZE, timeout=30, limiter=None):
+        # A bare host name means HTTPS, as with the real API
+        url = urlsplit(host if '://' in host else f'https://{host}')
+        self.scheme = url.scheme
+        self.host = url.netloc
+        self.path_prefix = url.path.rstrip('/')
+        self.limiter = limiter or get_rate_limiter()
+        self.api_key = api_key
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.headers = {
+            'x-rapidapi-host': url.hostname,
+            'x-rapidapi-key': api_key
+        }
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    def _new_connection(self):
+        # http.client pulls in ssl and email; imported on the first request so
+        # runs served entirely from the cache never load it
+        import http.client
+
+        if self.scheme == 'http':
+            return http.client.HTTPConnection(self.host, timeout=self.timeout)
+        return http.client.HTTPSConnection(self.host, timeout=self.timeout)
+
+    def _acquire(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+
+    def _release(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def get(self, url, max_throttled=3):
+        """
+        Send a GET request and return an ApiResponse.
+
+        Every request first takes a token from the rate limiter, and the
+        limiter is updated from the response headers. A 429 response pauses the
+        limiter and the request is sent again, up to max_throttled times. A
+        pooled connection the server has already closed is retried once on a
+        fresh connection before the error is raised to the caller.
+        """
+        throttled = 0
+        while True:
+            self.limiter.acquire()
+            response = self._send(url)
+            self.limiter.update_from_headers(response.headers)
+
+            if response.status == 429 and throttled < max_throttled:
+                throttled += 1
+                retry_after = response.headers.get('Retry-After')
+                print(f"Rate limited by API, waiting before retrying {url}...")
+                self.limiter.throttle(parse_retry_after(retry_after))
+                continue
+            return response
+
+    def _send(self, url):
+        import http.client
+
+        for attempt in range(2):
+            conn = self._acquire()
+            try:
+                conn.request("GET", self.path_prefix + url, headers=self.headers)
+                res = conn.getresponse()
+                body = res.read()
+            except (http.client.HTTPException, ConnectionError):
+                conn.close()
+                if attempt == 1:
+                    raise
+                continue
+            except Exception:
+                conn.close()
+                raise
+
+            response = ApiResponse(res.status, res.reason, res.headers, body)
+            if res.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            return response
+
+    def close(self):
+        """Close every idle connection in the pool."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_api_client():
+    """Return the process-wide ApiClient, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ApiClient(BASE_URL, API_KEY)
+    return _client
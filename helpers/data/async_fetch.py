@@ -0,0 +1,58 @@
+from helpers.settings import FETCH_CONCURRENCY
+
+async def _fetch_as_completed(fetch_function, keys, concurrency):
+    import asyncio
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_one(key):
+        async with semaphore:
+            # The fetch functions are blocking; the shared API client and rate
+            # limiter are thread-safe, so each call runs in a worker thread.
+            return key, await asyncio.to_thread(fetch_function, key)
+
+    for next_result in asyncio.as_completed([fetch_one(key) for key in keys]):
+        yield await next_result
+
+async def _cancel_pending():
+    # Only left over when the caller stops consuming before every key was fetched.
+    import asyncio
+
+    pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+def fetch_concurrently(fetch_function, keys, concurrency=FETCH_CONCURRENCY):
+    """
+    Call fetch_function for every key concurrently and yield results as they arrive.
+
+    At most `concurrency` calls are in flight at once; pacing against the API
+    allowance is still done by the shared rate limiter. The caller can consume
+    the results with a plain for loop while the remaining fetches keep running.
+
+    :param fetch_function: Blocking function taking a single key (e.g. get_fixture_prediction).
+    :param keys: Keys to fetch, such as fixture ids.
+    :param concurrency: Maximum number of fetches running at the same time.
+    :return: Generator of (key, result) tuples in completion order.
+    """
+    keys = list(keys)
+    if not keys:
+        return
+
+    # asyncio is slow to import and only needed once there is something to fetch
+    import asyncio
+
+    loop = asyncio.new_event_loop()
+    results = _fetch_as_completed(fetch_function, keys, max(1, concurrency))
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(results.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(results.aclose())
+        loop.run_until_complete(_cancel_pending())
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
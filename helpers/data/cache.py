@@ -0,0 +1,319 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from collections import OrderedDict
+from contextlib import nullcontext, contextmanager
+
+from helpers.data.sqlite_store import SqliteStore
+from helpers.data.serializer import dump_file_atomic, load_file, compress, open_text, text_stream, write_file_atomic
+from helpers.data.file_lock import file_lock
+from helpers.settings import CACHE_TTLS, CACHE_MEMORY_ENTRIES, CACHE_BACKEND, SQLITE_PATH
+
+from config import STANDINGS_DIR, PREDICTIONS_DIR, PLAYERS_DIR, INJURIES_DIR, TEAMS_DIR, FIXTURES_DIR
+
+# Cross-process fetch locks per resource. Keys share a fixed set of lock files
+# so the number of files stays bounded however many keys are fetched.
+LOCK_STRIPES = 64
+
+def has_response(data):
+    """Valid when the payload holds a non-empty 'response' list."""
+    return bool(data and 'response' in data and isinstance(data['response'], list) and len(data['response']) > 0)
+
+def has_teams(data):
+    """Valid when the payload is a standings index with at least one team."""
+    return bool(data and data.get('teams'))
+
+def not_empty(data):
+    return data is not None
+
+class MemoryLRU:
+    """Bounded, thread-safe LRU of (stored_at, data) entries shared by all resources."""
+
+    def __init__(self, max_entries=CACHE_MEMORY_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, stored_at, data):
+        with self._lock:
+            self._entries[key] = (stored_at, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+_memory = MemoryLRU()
+_sqlite_store = None
+
+def get_sqlite_store():
+    global _sqlite_store
+    if _sqlite_store is None:
+        _sqlite_store = SqliteStore()
+    return _sqlite_store
+
+# In-process single-flight locks: (resource, key) -> [lock, threads using it]
+_key_locks = {}
+_key_locks_guard = threading.Lock()
+
+@contextmanager
+def _key_lock(lock_key):
+    with _key_locks_guard:
+        entry = _key_locks.setdefault(lock_key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _key_locks_guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del _key_locks[lock_key]
+
+def batch_writes():
+    """
+    Context manager grouping cache writes made by the current thread into one
+    transaction when the SQLite backend is used. A no-op for the file backend.
+    """
+    if CACHE_BACKEND == 'sqlite':
+        return get_sqlite_store().batch()
+    return nullcontext()
+
+class ResourceCache:
+    """
+    TTL cache for one kind of API resource with the shared in-memory LRU in front.
+    On disk it is either one file per key or a table in the SQLite store,
+    depending on CACHE_BACKEND.
+
+    :param name: Resource name, also used to look up its TTL in CACHE_TTLS.
+    :param directory: Directory holding the cache files.
+    :param filename: Filename template with a {key} placeholder.
+    :param validator: Function deciding whether a payload is worth keeping.
+    """
+
+    def __init__(self, name, directory, filename, validator=not_empty):
+        self.name = name
+        self.directory = directory
+        self.filename = filename
+        self.validator = validator
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @property
+    def ttl(self):
+        return CACHE_TTLS.get(self.name)
+
+    def path(self, key):
+        return os.path.join(self.directory, self.filename.format(key=key))
+
+    def _is_fresh(self, stored_at):
+        return self.ttl is None or time.time() - stored_at <= self.ttl
+
+    def get(self, key, ignore_ttl=False):
+        """
+        Return the cached payload for key, or None if it is missing, stale or invalid.
+        With ignore_ttl, stale entries are returned too (for offline re-rating).
+        """
+        source, data = self._lookup(key, ignore_ttl)
+        if source == 'memory':
+            self.memory_hits += 1
+        elif source == 'disk':
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+        return data
+
+    def _lookup(self, key, ignore_ttl=False):
+        entry = _memory.get((self.name, key))
+        if entry is not None:
+            stored_at, data = entry
+            if ignore_ttl or self._is_fresh(stored_at):
+                return 'memory', data
+            _memory.discard((self.name, key))
+
+        try:
+            entry = self._read_disk(key, ignore_ttl)
+            if entry is not None:
+                stored_at, data = entry
+                if self.validator(data):
+                    _memory.put((self.name, key), stored_at, data)
+                    return 'disk', data
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f"Error reading cached {self.name} data for {key}: {e}")
+
+        return None, None
+
+    def lock_path(self, key):
+        directory = os.path.dirname(SQLITE_PATH) if CACHE_BACKEND == 'sqlite' else self.directory
+        # crc32 rather than hash(), which differs between processes
+        stripe = zlib.crc32(str(key).encode('utf-8')) % LOCK_STRIPES
+        return os.path.join(directory, '.locks', f'{self.name}_{stripe}.lock')
+
+    @contextmanager
+    def single_flight(self, key, recheck=True):
+        """
+        Let only one thread or process at a time fetch the payload for key.
+
+        Call it after a cache miss and fetch inside the block. Yields the
+        payload when another worker stored it while this one was waiting, so
+        the fetch can be skipped; otherwise yields None. With recheck=False the
+        cache is not read again and None is always yielded.
+        """
+        with _key_lock((self.name, key)), file_lock(self.lock_path(key)):
+            data = None
+            if recheck:
+                source, data = self._lookup(key)
+                if source is not None:
+                    self.coalesced += 1
+            yield data
+
+    def _read_disk(self, key, ignore_ttl=False):
+        if CACHE_BACKEND == 'sqlite':
+            entry = get_sqlite_store().read(self.name, key)
+            if entry is None or not (ignore_ttl or self._is_fresh(entry[0])):
+                return None
+            return entry
+
+        file_path = self.path(key)
+        try:
+            stored_at = os.path.getmtime(file_path)
+        except FileNotFoundError:
+            return None
+        # Stale files are not parsed at all
+        if not (ignore_ttl or self._is_fresh(stored_at)):
+            return None
+        return stored_at, load_file(file_path)
+
+    def set(self, key, data):
+        """Store a payload on disk and in memory. Invalid payloads are not cached."""
+        if not self.validator(data):
+            return False
+
+        stored_at = time.time()
+        if CACHE_BACKEND == 'sqlite':
+            get_sqlite_store().write(self.name, key, stored_at, data)
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+            dump_file_atomic(self.path(key), data)
+        _memory.put((self.name, key), stored_at, data)
+        return True
+
+    def open_stream(self, key, ignore_ttl=False):
+        """
+        Open the cached payload for key as a text stream without parsing it,
+        for incremental readers such as iter_array_items.
+
+        :return: Readable text file object (the caller closes it), or None if
+                 the entry is missing or stale.
+        """
+        try:
+            if CACHE_BACKEND == 'sqlite':
+                entry = get_sqlite_store().read_raw(self.name, key)
+                if entry is None or not (ignore_ttl or self._is_fresh(entry[0])):
+                    return None
+                self.disk_hits += 1
+                return text_stream(entry[1])
+
+            file_path = self.path(key)
+            if not os.path.isfile(file_path) or not (ignore_ttl or self._is_fresh(os.path.getmtime(file_path))):
+                return None
+            self.disk_hits += 1
+            return open_text(file_path)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f"Error reading cached {self.name} data for {key}: {e}")
+            return None
+
+    def set_raw(self, key, text):
+        """Store an already serialized JSON payload unparsed, leaving it out of the memory cache."""
+        stored_at = time.time()
+        raw = compress(text.encode('utf-8'))
+        if CACHE_BACKEND == 'sqlite':
+            get_sqlite_store().write_raw(self.name, key, stored_at, raw)
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+            write_file_atomic(self.path(key), raw)
+        _memory.discard((self.name, key))
+
+    def get_or_fetch(self, key, fetch):
+        """
+        Return the cached payload, calling fetch() and caching its result on a
+        miss. Concurrent misses for the same key share a single fetch.
+        """
+        data = self.get(key)
+        if data is None:
+            with self.single_flight(key) as data:
+                if data is None:
+                    data = fetch()
+                    self.set(key, data)
+        return data
+
+    def stats(self):
+        return {'memory_hits': self.memory_hits, 'disk_hits': self.disk_hits, 'misses': self.misses, 'coalesced': self.coalesced}
+
+CACHES = {
+    'standings': ResourceCache('standings', STANDINGS_DIR, 'standings_{key}.json', has_response),
+    'predictions': ResourceCache('predictions', PREDICTIONS_DIR, 'predictions_data_{key}.json', has_response),
+    'standings_index': ResourceCache('standings_index', STANDINGS_DIR, 'standings_index_{key}.json', has_teams),
+    'players': ResourceCache('players', PLAYERS_DIR, 'players_data_{key}.json'),
+    'injuries': ResourceCache('injuries', INJURIES_DIR, 'injuries_data_{key}.json'),
+    'team_stats': ResourceCache('team_stats', TEAMS_DIR, 'teams_data_{key}.json'),
+    'fixtures': ResourceCache('fixtures', FIXTURES_DIR, 'fixtures_data_{key}.json'),
+    'fixture': ResourceCache('fixture', FIXTURES_DIR, 'fixture_{key}_score.json'),
+    'leagues': ResourceCache('leagues', FIXTURES_DIR, 'leagues_{key}.json', has_response),
+}
+
+def get_cache(name):
+    return CACHES[name]
+
+def cache_stats():
+    """Hit/miss counters for every resource, keyed by resource name."""
+    return {name: cache.stats() for name, cache in CACHES.items()}
+
+def print_cache_stats():
+    for name, stats in cache_stats().items():
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        if lookups:
+            print(f"Cache {name}: {stats['memory_hits']} memory hits, {stats['disk_hits']} disk hits, {stats['misses']} misses, {stats['coalesced']} fetched by another worker")
+
+def migrate_files_to_sqlite():
+    """Copy every existing JSON cache file into the SQLite store, keeping its timestamp."""
+    store = get_sqlite_store()
+    copied = 0
+    with store.batch():
+        for cache in CACHES.values():
+            if not os.path.isdir(cache.directory):
+                continue
+            prefix, suffix = cache.filename.split('{key}')
+            for filename in os.listdir(cache.directory):
+                if not (filename.startswith(prefix) and filename.endswith(suffix)):
+                    continue
+                key = filename[len(prefix):len(filename) - len(suffix)]
+                file_path = os.path.join(cache.directory, filename)
+                try:
+                    data = load_file(file_path)
+                except (OSError, ValueError) as e:
+                    print(f"Skipping {file_path}: {e}")
+                    continue
+                if cache.validator(data):
+                    store.write(cache.name, key, os.path.getmtime(file_path), data)
+                    copied += 1
+    print(f"Copied {copied} cached files into {store.path}")
+    return copied
@@ -1,19 +1,30 @@
-# Simplified function to add a fixed delay between each request
+# Pacing is done by the shared token-bucket limiter inside the API client, so this
+# helper only adds retries with backoff around a fetch function.
 import functools
 import time
 
-def fetch_data_with_rate_limit(fetch_function, *args, delay_seconds=6.1):
-    time.sleep(delay_seconds)
+from helpers.rate_limiter import DailyQuotaExceeded
+from helpers.settings import FETCH_MAX_RETRIES
+
+def fetch_data_with_rate_limit(fetch_function, *args, max_retries=FETCH_MAX_RETRIES):
     @functools.wraps(fetch_function)
     def wrapper():
-        while True:
+        delay = 2
+        for attempt in range(max_retries + 1):
             try:
                 # Attempt to fetch data
                 data = fetch_function(*args)
                 return data  # Return data if no error is detected
+            except DailyQuotaExceeded as e:
+                print(f"Error fetching data: {e}")
+                return None
             except Exception as e:
                 print(f"Error fetching data: {e}")
-                print("Retrying in 61 seconds...")
-                time.sleep(61)  # Wait before retrying in case of error
+                if attempt == max_retries:
+                    print("Giving up after repeated errors.")
+                    return None
+                print(f"Retrying in {delay} seconds...")
+                time.sleep(delay)  # Wait before retrying in case of error
+                delay = min(delay * 2, 61)
 
-    return wrapper()
\ No newline at end of file
+    return wrapper()
@@ -1,5 +1,9 @@
-def find_team_data_by_name(team_name, team_info):
+def find_team_data_by_name(team_name, team_info, team_id=None):
+    # A StandingsIndex looks teams up by id or normalized name without scanning
+    if hasattr(team_info, 'find'):
+        return team_info.find(team_id, team_name)
+
     for team in team_info:
         if team['team_name'] == team_name:
             return team
-    return None
\ No newline at end of file
+    return None
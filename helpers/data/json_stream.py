@@ -0,0 +1,122 @@
+import json
+
+_decoder = json.JSONDecoder()
+
+WHITESPACE = ' \t\n\r'
+# Characters that can follow the part of a number raw_decode has accepted
+NUMBER_CHARS = '0123456789.eE+-'
+
+class _Reader:
+    """Sliding text buffer over a file, trimmed as values are consumed."""
+
+    def __init__(self, file, chunk_size):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it ('' at the end)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of the JSON stream")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+                # A number at the end of the buffer, or cut after its '.', 'e' or sign
+                # ("1." decodes as 1), may continue in the next chunk
+                if self.eof or (end < len(self.buffer) and self.buffer[end] not in NUMBER_CHARS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+def iter_array_items(file, key='response', chunk_size=64 * 1024):
+    """
+    Yield the items of the array stored under `key` in a top-level JSON object,
+    one at a time, while reading the file in chunks.
+
+    Only one item is decoded at a time, so memory use does not grow with the
+    length of the array. Other top-level values are decoded and skipped.
+
+    :param file: Text file object positioned at the start of the JSON document.
+    :param key: Top-level key holding the array.
+    :param chunk_size: Characters read from the file at a time.
+    """
+    reader = _Reader(file, chunk_size)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+
+    while True:
+        name = reader.value()
+        reader.expect(':')
+        if name == key and reader.peek() == '[':
+            reader.expect('[')
+            if reader.peek() == ']':
+                return
+            while True:
+                yield reader.value()
+                if reader.peek() == ']':
+                    return
+                reader.expect(',')
+        reader.value()
+        if reader.peek() == '}':
+            return
+        reader.expect(',')
+
+def read_envelope(file, key='response', chunk_size=64 * 1024):
+    """
+    Decode the top-level values of a JSON object that come before the array
+    stored under `key`, and tell whether that array has any items, without
+    decoding them. Values after the array are not read.
+
+    :param file: Text file object positioned at the start of the JSON document.
+    :param key: Top-level key holding the array.
+    :param chunk_size: Characters read from the file at a time.
+    :return: (dictionary of the values before the array, True/False whether the
+             array has items or None if there is no such array)
+    """
+    reader = _Reader(file, chunk_size)
+    reader.expect('{')
+    envelope = {}
+    if reader.peek() == '}':
+        return envelope, None
+
+    while True:
+        name = reader.value()
+        reader.expect(':')
+        if name == key and reader.peek() == '[':
+            reader.expect('[')
+            return envelope, reader.peek() != ']'
+        envelope[name] = reader.value()
+        if reader.peek() == '}':
+            return envelope, None
+        reader.expect(',')
@@ -14,7 +14,8 @@ def find_latest_rated_fixtures(directory):
     
 def find_latest_file(directory):
     # Get all files in the directory
-    files = [f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))]
+    # Temporary files of an atomic write in progress are not candidates
+    files = [f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f)) and not f.endswith('.tmp')]
     
     # Filter out any files that do not match a specific pattern if needed
     if not files:
@@ -0,0 +1,130 @@
+import gzip
+import io
+import json
+import os
+import threading
+
+from helpers.settings import CACHE_SERIALIZER, CACHE_COMPRESSION
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+def _resolve_serializer(name):
+    if name == 'auto':
+        return 'orjson' if orjson is not None else 'json'
+    if name == 'orjson' and orjson is None:
+        print("CACHE_SERIALIZER is 'orjson' but orjson is not installed. Using json.")
+        return 'json'
+    return name
+
+def _resolve_compression(name):
+    if name == 'zstd' and zstandard is None:
+        print("CACHE_COMPRESSION is 'zstd' but zstandard is not installed. Using gzip.")
+        return 'gzip'
+    return name
+
+SERIALIZER = _resolve_serializer(CACHE_SERIALIZER)
+COMPRESSION = _resolve_compression(CACHE_COMPRESSION)
+
+def encode(data):
+    """Serialize data to compact JSON bytes with the configured library, without framing."""
+    if SERIALIZER == 'orjson':
+        # Integer dictionary keys (e.g. fixture ids) become strings like with json
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+def decode(raw):
+    """Parse JSON from bytes or text with the configured library."""
+    if SERIALIZER == 'orjson':
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def compress(raw):
+    """Apply the configured compression framing to serialized bytes."""
+    if COMPRESSION == 'gzip':
+        return gzip.compress(raw, compresslevel=6)
+    if COMPRESSION == 'zstd':
+        return zstandard.ZstdCompressor().compress(raw)
+    return raw
+
+def decompress(raw):
+    """
+    Remove any compression framing, recognised by its magic bytes, so files
+    written with other settings (or plain, pretty-printed JSON from older
+    versions) keep loading.
+    """
+    if raw[:2] == GZIP_MAGIC:
+        return gzip.decompress(raw)
+    if raw[:4] == ZSTD_MAGIC:
+        if zstandard is None:
+            raise ValueError("zstd-compressed data found but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(raw)
+    return raw
+
+def dumps(data):
+    """Serialize data with the configured library and compression."""
+    return compress(encode(data))
+
+def loads(raw):
+    """Load data written by dumps with any settings, or plain JSON text."""
+    if isinstance(raw, str):
+        return decode(raw)
+    return decode(decompress(raw))
+
+def dump_file(file_path, data):
+    with open(file_path, 'wb') as file:
+        file.write(dumps(data))
+
+def write_file_atomic(file_path, raw):
+    """
+    Write bytes to a temporary file next to file_path and move it into place,
+    so readers in any process see either the old or the new file, never a
+    partial one. The temporary name is unique per process and thread.
+    """
+    temp_path = f'{file_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(temp_path, 'wb') as file:
+            file.write(raw)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def dump_file_atomic(file_path, data):
+    write_file_atomic(file_path, dumps(data))
+
+def load_file(file_path):
+    with open(file_path, 'rb') as file:
+        return loads(file.read())
+
+def open_text(file_path):
+    """
+    Open a file written by dump_file (or plain JSON) as a text stream,
+    decompressing on the fly, for incremental readers.
+    """
+    with open(file_path, 'rb') as file:
+        magic = file.read(4)
+    if magic[:2] == GZIP_MAGIC:
+        return gzip.open(file_path, 'rt', encoding='utf-8')
+    if magic == ZSTD_MAGIC:
+        if zstandard is None:
+            raise ValueError("zstd-compressed data found but zstandard is not installed")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), closefd=True), encoding='utf-8')
+    return open(file_path, 'r', encoding='utf-8')
+
+def text_stream(raw):
+    """Text stream over serialized data held in memory (e.g. a SQLite value)."""
+    if isinstance(raw, str):
+        return io.StringIO(raw)
+    return io.TextIOWrapper(io.BytesIO(decompress(raw)), encoding='utf-8')
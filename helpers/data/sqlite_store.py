@@ -0,0 +1,84 @@
+import os
+import sqlite3
+import threading
+
+from contextlib import contextmanager
+
+from helpers.data.serializer import dumps, loads
+from helpers.settings import SQLITE_PATH
+
+class SqliteStore:
+    """
+    Single-file SQLite storage for cached API payloads.
+
+    Every resource gets its own table keyed by its natural id (fixture, league
+    or team id, or the date for the day's fixtures) with an index on the time it
+    was stored. Each thread uses its own connection. Writes made inside batch()
+    are committed together in one transaction.
+
+    :param path: Database file path.
+    """
+
+    def __init__(self, path=SQLITE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._tables = set()
+        self._tables_lock = threading.Lock()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.batch_depth = 0
+        return conn
+
+    def _table(self, name):
+        conn = self._connection()
+        if name not in self._tables:
+            with self._tables_lock:
+                conn.execute(f'CREATE TABLE IF NOT EXISTS "{name}" (key TEXT PRIMARY KEY, stored_at REAL NOT NULL, data TEXT NOT NULL)')
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "{name}_stored_at" ON "{name}" (stored_at)')
+                conn.commit()
+                self._tables.add(name)
+        return conn
+
+    def read(self, name, key):
+        """Return (stored_at, data) for key, or None if nothing is stored."""
+        conn = self._table(name)
+        row = conn.execute(f'SELECT stored_at, data FROM "{name}" WHERE key = ?', (str(key),)).fetchone()
+        if row is None:
+            return None
+        return row[0], loads(row[1])
+
+    def read_raw(self, name, key):
+        """Return (stored_at, serialized data) for key without parsing it, or None."""
+        conn = self._table(name)
+        return conn.execute(f'SELECT stored_at, data FROM "{name}" WHERE key = ?', (str(key),)).fetchone()
+
+    def write(self, name, key, stored_at, data):
+        self.write_raw(name, key, stored_at, dumps(data))
+
+    def write_raw(self, name, key, stored_at, raw):
+        conn = self._table(name)
+        conn.execute(
+            f'INSERT OR REPLACE INTO "{name}" (key, stored_at, data) VALUES (?, ?, ?)',
+            (str(key), stored_at, raw)
+        )
+        if not self._local.batch_depth:
+            conn.commit()
+
+    @contextmanager
+    def batch(self):
+        """Group every write made by this thread inside the block into one transaction."""
+        conn = self._connection()
+        self._local.batch_depth += 1
+        try:
+            yield
+        finally:
+            self._local.batch_depth -= 1
+            if not self._local.batch_depth:
+                conn.commit()
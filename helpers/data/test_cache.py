@@ -0,0 +1,58 @@
+import os
+import threading
+import time
+
+from helpers.data.cache import MemoryLRU, LOCK_STRIPES, get_cache
+
+def test_concurrent_misses_share_one_fetch():
+    cache = get_cache('injuries')
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return {'response': [{'player': {'id': 1}}]}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch('single-flight', fetch))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{'response': [{'player': {'id': 1}}]}] * 8
+
+def test_invalid_payloads_are_not_cached():
+    cache = get_cache('standings')
+    assert cache.set('invalid', {'response': []}) is False
+    assert cache.get('invalid') is None
+
+def test_stored_payload_is_read_back_from_disk():
+    cache = get_cache('players')
+    cache.set('round-trip', {'response': [{'team': {'id': 7}}]})
+    # A fresh process has nothing in memory; drop the entry to read the file
+    from helpers.data.cache import _memory
+    _memory.discard(('players', 'round-trip'))
+    assert cache.get('round-trip') == {'response': [{'team': {'id': 7}}]}
+
+def test_memory_lru_keeps_the_most_recent_entries():
+    lru = MemoryLRU(max_entries=2)
+    lru.put('a', 1, 'A')
+    lru.put('b', 2, 'B')
+    lru.get('a')
+    lru.put('c', 3, 'C')
+    assert lru.get('b') is None
+    assert lru.get('a') == (1, 'A')
+    assert lru.get('c') == (3, 'C')
+
+def test_lock_files_are_bounded():
+    cache = get_cache('predictions')
+    paths = {cache.lock_path(fixture_id) for fixture_id in range(10000)}
+    assert len(paths) == LOCK_STRIPES
+    assert cache.lock_path(1208021) == cache.lock_path(1208021)
+    for fixture_id in range(200):
+        with cache.single_flight(fixture_id):
+            pass
+    lock_directory = os.path.dirname(cache.lock_path(0))
+    assert len([name for name in os.listdir(lock_directory) if name.startswith('predictions_')]) <= LOCK_STRIPES
@@ -0,0 +1,35 @@
+import io
+import json
+
+import pytest
+
+from helpers.data.json_stream import iter_array_items, read_envelope
+
+DOCUMENTS = [
+    '{"response": [1.0]}',
+    '{"response": [1.5e3, 2]}',
+    '{"get": "fixtures", "errors": [], "response": [-0.25E-2, 1e+10, true, null, "x", {"k": [1.25]}], "paging": {}}',
+    '{"response": []}',
+    '{"response": [{"fixture": {"id": 1}}, {"fixture": {"id": 2}}]}',
+]
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+@pytest.mark.parametrize('chunk_size', range(1, 12))
+def test_items_survive_any_chunk_boundary(document, chunk_size):
+    expected = json.loads(document)['response']
+    assert list(iter_array_items(io.StringIO(document), chunk_size=chunk_size)) == expected
+
+def test_truncated_number_is_an_error():
+    with pytest.raises(ValueError):
+        list(iter_array_items(io.StringIO('{"response": [1.x]}'), chunk_size=2))
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 64 * 1024])
+def test_read_envelope_stops_at_the_array(chunk_size):
+    document = '{"errors": {"requests": "limit"}, "results": 0, "response": [{"a": 1}]}'
+    envelope, has_items = read_envelope(io.StringIO(document), chunk_size=chunk_size)
+    assert envelope == {'errors': {'requests': 'limit'}, 'results': 0}
+    assert has_items is True
+
+def test_read_envelope_empty_and_missing_array():
+    assert read_envelope(io.StringIO('{"errors": [], "response": []}')) == ({'errors': []}, False)
+    assert read_envelope(io.StringIO('{"message": "Not found"}')) == ({'message': 'Not found'}, None)
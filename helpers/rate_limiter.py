@@ -0,0 +1,100 @@
+import threading
+import time
+
+from datetime import datetime, timedelta, timezone
+
+from helpers.settings import RATE_LIMIT_PER_MINUTE
+
+class DailyQuotaExceeded(Exception):
+    """Raised when the API reports that no requests are left for today."""
+
+class TokenBucket:
+    """
+    Token-bucket limiter driven by the API's own rate-limit headers.
+
+    The bucket starts at the configured per-minute rate and is corrected after
+    every response: 'X-RateLimit-Limit' sets the refill rate, 'X-RateLimit-Remaining'
+    caps the available tokens and 'x-ratelimit-requests-remaining' tracks the
+    daily quota. acquire() returns immediately while tokens are left, so a run
+    only waits when it is actually close to the allowance. The daily quota
+    resets at midnight UTC; after that requests are let through again so the
+    next response can report the new allowance.
+
+    :param per_minute: Requests allowed per minute until the headers say otherwise.
+    """
+
+    def __init__(self, per_minute=RATE_LIMIT_PER_MINUTE):
+        self.per_minute = per_minute
+        self.tokens = float(per_minute)
+        self.daily_remaining = None
+        self.daily_reset_at = None
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self.tokens = min(self.per_minute, self.tokens + elapsed * self.per_minute / 60.0)
+        self._updated = now
+
+    def acquire(self):
+        """Block until a request may be sent, then consume one token."""
+        while True:
+            with self._lock:
+                if self.daily_remaining is not None and self.daily_remaining <= 0:
+                    if self.daily_reset_at is None or time.time() < self.daily_reset_at:
+                        raise DailyQuotaExceeded("Daily API request quota exhausted.")
+                    # A new day: the allowance is unknown until the next response
+                    self.daily_remaining = None
+                    self.daily_reset_at = None
+
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    if self.daily_remaining is not None:
+                        self.daily_remaining -= 1
+                    return
+
+                wait = max(self.blocked_until - now, (1 - self.tokens) * 60.0 / self.per_minute)
+            time.sleep(wait)
+
+    def update_from_headers(self, headers):
+        """Adjust the bucket to the allowance reported by the API."""
+        minute_limit = _header_int(headers, 'X-RateLimit-Limit')
+        minute_remaining = _header_int(headers, 'X-RateLimit-Remaining')
+        daily_remaining = _header_int(headers, 'x-ratelimit-requests-remaining')
+
+        with self._lock:
+            self._refill(time.monotonic())
+            if minute_limit:
+                self.per_minute = minute_limit
+            if minute_remaining is not None:
+                self.tokens = min(self.tokens, minute_remaining)
+            if daily_remaining is not None:
+                self.daily_remaining = daily_remaining
+                self.daily_reset_at = next_quota_reset(time.time())
+
+    def throttle(self, retry_after=None):
+        """Hold back all requests after a 429, until the window has reset."""
+        with self._lock:
+            self.tokens = 0
+            self.blocked_until = time.monotonic() + (retry_after if retry_after else 60.0)
+
+def next_quota_reset(now):
+    """Timestamp of the next midnight UTC, when api-football resets the daily quota."""
+    today = datetime.fromtimestamp(now, timezone.utc).date()
+    return datetime.combine(today + timedelta(days=1), datetime.min.time(), timezone.utc).timestamp()
+
+def _header_int(headers, name):
+    value = headers.get(name) if headers is not None else None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+_limiter = TokenBucket()
+
+def get_rate_limiter():
+    """Return the process-wide limiter shared by all API requests."""
+    return _limiter
@@ -0,0 +1,95 @@
+import os
+
+import config
+
+# Optional tuning values. Each one can be overridden by defining a constant with
+# the same name in config.py; older config files without them keep working.
+
+# Requests per minute allowed before the API sends its own rate-limit headers.
+RATE_LIMIT_PER_MINUTE = getattr(config, 'RATE_LIMIT_PER_MINUTE', 10)
+
+# Idle keep-alive connections kept open by the API client.
+API_POOL_SIZE = getattr(config, 'API_POOL_SIZE', 8)
+
+# How many times a failed request is retried before giving up.
+FETCH_MAX_RETRIES = getattr(config, 'FETCH_MAX_RETRIES', 5)
+
+# Maximum number of API fetches running at the same time (e.g. prediction prefetch).
+FETCH_CONCURRENCY = getattr(config, 'FETCH_CONCURRENCY', 8)
+
+# Most prediction requests one run may spend; None means no limit. Candidates
+# are fetched in order of how promising their standings look.
+PREDICTION_BUDGET = getattr(config, 'PREDICTION_BUDGET', None)
+
+# Requests of the daily quota left unspent by the prediction prefetch, for
+# injuries, players and bet settlement later in the session.
+PREDICTION_QUOTA_RESERVE = getattr(config, 'PREDICTION_QUOTA_RESERVE', 10)
+
+# Most prediction requests a run may spend before the API has reported the daily
+# quota left (no request made yet in this process, e.g. everything else was
+# cached). The default is the free plan's 100 requests less the reserve.
+PREDICTION_COLD_START_BUDGET = getattr(config, 'PREDICTION_COLD_START_BUDGET', 90)
+
+# Seconds a cached resource stays fresh; None means it never expires.
+CACHE_TTLS = {
+    'standings': 24 * 3600,
+    'standings_index': 24 * 3600,
+    'predictions': None,
+    'players': 24 * 3600,
+    'injuries': 24 * 3600,
+    'team_stats': 24 * 3600,
+    'fixtures': 24 * 3600,
+    'fixture': 24 * 3600,
+    'leagues': 7 * 24 * 3600,
+}
+CACHE_TTLS.update(getattr(config, 'CACHE_TTLS', {}))
+
+# Entries kept in the in-memory LRU in front of the disk cache.
+CACHE_MEMORY_ENTRIES = getattr(config, 'CACHE_MEMORY_ENTRIES', 512)
+
+# Where cached API payloads live: 'files' (one JSON file per entity) or 'sqlite'.
+CACHE_BACKEND = getattr(config, 'CACHE_BACKEND', 'files')
+
+# JSON library for cache files: 'auto' (orjson when installed), 'orjson' or 'json'.
+# Files are written compactly; older pretty-printed files are still read.
+CACHE_SERIALIZER = getattr(config, 'CACHE_SERIALIZER', 'auto')
+
+# Compression of cache files and SQLite values: None, 'gzip' or 'zstd' (needs the
+# zstandard package). Data written with any setting stays readable after a change.
+CACHE_COMPRESSION = getattr(config, 'CACHE_COMPRESSION', None)
+
+# Database file used when CACHE_BACKEND is 'sqlite'.
+SQLITE_PATH = getattr(config, 'SQLITE_PATH', os.path.join(config.BASE_DIR, 'cache.sqlite3'))
+
+# How the day's fixtures are requested: 'date' downloads every fixture in the
+# world with one call, 'leagues' asks only for the trusted leagues (one call per
+# league, so fewer bytes but more of the request quota).
+FIXTURES_FETCH_MODE = getattr(config, 'FIXTURES_FETCH_MODE', 'date')
+
+# Local HTTP API of the service mode (`python program.py serve`). Keep the host on
+# the loopback address; the API has no authentication.
+DAEMON_HOST = getattr(config, 'DAEMON_HOST', '127.0.0.1')
+DAEMON_PORT = getattr(config, 'DAEMON_PORT', 8765)
+
+# Seconds between the service mode's background rating and bet settlement runs.
+DAEMON_REFRESH_SECONDS = getattr(config, 'DAEMON_REFRESH_SECONDS', 15 * 60)
+
+# Thresholds of the rating model. Override single values in config.py, e.g. with
+# the best configuration found by `python -m services.sweep`.
+RATING_PARAMETERS = {
+    'percent_high': 70,
+    'percent_low': 60,
+    'ratio_high': 3,
+    'ratio_low': 2,
+    'goal_ratio_high': 3,
+    'goal_ratio_low': 2,
+    'rank_high': 10,
+    'rank_low': 5,
+    'points_difference_high': 30,
+    'points_difference_low': 20,
+    'three_star': 6,
+    'two_star': 4,
+    'one_star': 2,
+    'min_rank_difference': 4,
+}
+RATING_PARAMETERS.update(getattr(config, 'RATING_PARAMETERS', {}))
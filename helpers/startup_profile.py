@@ -0,0 +1,74 @@
+import sys
+import time
+
+from contextlib import contextmanager
+
+# (name, total seconds, seconds excluding nested imports) per module or init step
+_timings = []
+_stack = []
+_started_at = time.perf_counter()
+
+class _TimingLoader:
+    """Wraps a module loader and records how long executing the module takes."""
+
+    def __init__(self, loader):
+        self._loader = loader
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with profile_step(module.__name__):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+class _TimingFinder:
+    """Meta path finder that hands every other finder's spec a _TimingLoader."""
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimingLoader(spec.loader)
+                return spec
+        return None
+
+def enable():
+    """Start timing every module imported from now on."""
+    if not any(isinstance(finder, _TimingFinder) for finder in sys.meta_path):
+        sys.meta_path.insert(0, _TimingFinder())
+
+def is_enabled():
+    return any(isinstance(finder, _TimingFinder) for finder in sys.meta_path)
+
+@contextmanager
+def profile_step(name):
+    """Time a block (an import or an init step); nested steps are subtracted from its own time."""
+    _stack.append(0.0)
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started_at
+        nested = _stack.pop()
+        if _stack:
+            _stack[-1] += elapsed
+        _timings.append((name, elapsed, elapsed - nested))
+
+def print_report(file=None, top=25):
+    """
+    Print the slowest imports and init steps by their own time, then the total
+    time since this module was loaded.
+    """
+    file = file or sys.stderr
+    total_own = sum(own for _, _, own in _timings)
+    print(f"{'own ms':>9} {'total ms':>9}  module or step", file=file)
+    for name, elapsed, own in sorted(_timings, key=lambda timing: timing[2], reverse=True)[:top]:
+        print(f"{own * 1000:9.1f} {elapsed * 1000:9.1f}  {name}", file=file)
+    print(f"{len(_timings)} modules and steps, {total_own * 1000:.1f} ms in total; "
+          f"{(time.perf_counter() - _started_at) * 1000:.1f} ms since startup", file=file)
@@ -0,0 +1,18 @@
+import email.utils
+import time
+
+from helpers.api_client import parse_retry_after
+
+def test_retry_after_seconds():
+    assert parse_retry_after('30') == 30.0
+    assert parse_retry_after('-5') == 0.0
+
+def test_retry_after_http_date():
+    header = email.utils.formatdate(time.time() + 45, usegmt=True)
+    assert 40 <= parse_retry_after(header) <= 45
+
+def test_retry_after_in_the_past_or_unreadable():
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('') is None
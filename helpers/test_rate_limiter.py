@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from helpers import rate_limiter
+from helpers.rate_limiter import TokenBucket, DailyQuotaExceeded, next_quota_reset
+
+def test_next_quota_reset_is_the_following_utc_midnight():
+    now = datetime(2024, 10, 5, 23, 59, tzinfo=timezone.utc).timestamp()
+    assert next_quota_reset(now) == datetime(2024, 10, 6, tzinfo=timezone.utc).timestamp()
+
+def test_exhausted_quota_blocks_until_the_reset(monkeypatch):
+    clock = [datetime(2024, 10, 5, 18, 0, tzinfo=timezone.utc).timestamp()]
+    monkeypatch.setattr(rate_limiter.time, 'time', lambda: clock[0])
+
+    limiter = TokenBucket(per_minute=1000)
+    limiter.update_from_headers({'x-ratelimit-requests-remaining': '1'})
+    limiter.acquire()
+    with pytest.raises(DailyQuotaExceeded):
+        limiter.acquire()
+
+    # Past midnight UTC requests go through again and the headers set the new quota
+    clock[0] = datetime(2024, 10, 6, 0, 1, tzinfo=timezone.utc).timestamp()
+    limiter.acquire()
+    assert limiter.daily_remaining is None
+    limiter.update_from_headers({'x-ratelimit-requests-remaining': '100'})
+    assert limiter.daily_remaining == 100
+
+def test_minute_headers_cap_the_tokens():
+    limiter = TokenBucket(per_minute=10)
+    limiter.update_from_headers({'X-RateLimit-Limit': '300', 'X-RateLimit-Remaining': '2'})
+    assert limiter.per_minute == 300
+    assert limiter.tokens <= 2
@@ -1,213 +1,49 @@
+import atexit
+import sys
+
+from helpers import startup_profile
+
+# Has to be enabled before the project modules are imported to time them
+if __name__ == "__main__" and '--startup-profile' in sys.argv:
+    sys.argv.remove('--startup-profile')
+    startup_profile.enable()
+    atexit.register(startup_profile.print_report)
+
+import argparse
+import contextlib
+import csv
+import json
 import os
 
-from services.fixtures import filter_fixtures, get_fixtures_data, load_rated_fixtures, save_rated_fixtures
-from services.standings import get_standings_data, extract_team_info, get_team_rank
-from services.predictions import rate_fixture, get_fixture_prediction, determine_rating
-from services.bets import save_bets, load_saved_bets, check_bets_success_rate
-from services.players import get_key_players_by_team, get_player_data
-from services.injuries import filter_injuries_by_player_ids, get_injury_data
-from helpers.data.find_team_data import find_team_data_by_name
-from helpers.data.standings_data import save_standings_data, load_standings_data
+from datetime import datetime, timedelta
+
+from helpers.settings import DAEMON_HOST, DAEMON_PORT, DAEMON_REFRESH_SECONDS
 
 from config import PREDICTIONS_DIR, INJURIES_DIR, PLAYERS_DIR, STANDINGS_DIR, RATINGS_DIR, TEAMS_DIR, BETS_DIR
 
+# The service modules are imported inside the functions that use them, so each
+# command only loads what it needs (see `--startup-profile`)
+
 # Create directories if they do not exist
-os.makedirs(PREDICTIONS_DIR, exist_ok=True)
-os.makedirs(INJURIES_DIR, exist_ok=True)
-os.makedirs(PLAYERS_DIR, exist_ok=True)
-os.makedirs(STANDINGS_DIR, exist_ok=True)
-os.makedirs(RATINGS_DIR, exist_ok=True)
-os.makedirs(TEAMS_DIR, exist_ok=True)
-os.makedirs(BETS_DIR, exist_ok=True)
+with startup_profile.profile_step('create data directories'):
+    os.makedirs(PREDICTIONS_DIR, exist_ok=True)
+    os.makedirs(INJURIES_DIR, exist_ok=True)
+    os.makedirs(PLAYERS_DIR, exist_ok=True)
+    os.makedirs(STANDINGS_DIR, exist_ok=True)
+    os.makedirs(RATINGS_DIR, exist_ok=True)
+    os.makedirs(TEAMS_DIR, exist_ok=True)
+    os.makedirs(BETS_DIR, exist_ok=True)
 
 def main():
-    print("Loading...")
-
-    statuses_to_search = ['NS', 'TBD']
-    trusted_leagues = {
-        'Allsvenskan', 'Ettan - Norra', 'Ettan - S\u00f6dra', 'Superettan', 'Primera B', 'Primeira Liga', 'Eliteserien',  'Eredivisie',
-        'Primera Divisi\u00f3n RFEF - Group 1', 'Primera Divisi\u00f3n RFEF - Group 2', 'Ligue 1', '2. Bundesliga', 'Bundesliga', 'Serie A', 'Serie B',
-        'La Liga', 'Segunda Divisi\u00f3n', 'Championship', 'Premier League'
-    }
-
-    trusted_countries = {
-        'England', 'Spain', 'Italy', 'Germany', 'France', 'Portugal', 'Netherlands', 'Sweden', 'Norway'
-    }
-
-    rated_fixtures = load_rated_fixtures()
-    processed_fixture_ids = {
-        fixture['fixture_data']['fixture']['id']
-        for rating in rated_fixtures.values()
-        for fixture in rating 
-    }
-
-    one_star_games = []
-    two_star_games = []
-    three_star_games = []
-    no_star_games = []
-    league_standings_cache = {}
-    failed_league_ids = set()
-
-    total_games_processed = 0
-    games_rated = 0
-    games_skipped = 0
-
-    all_fixtures_data = get_fixtures_data()
-    filtered_fixtures = filter_fixtures(all_fixtures_data, statuses_to_search, trusted_countries)
-
-    for fixture_data in filtered_fixtures:
-        total_games_processed += 1
-        fixture_id = fixture_data['fixture']['id']
-        if fixture_id in processed_fixture_ids:
-            games_skipped += 1
-            
-            continue
-        
-        fixture_id = fixture_data['fixture']['id']
-        league_name = fixture_data['league']['name']
-        league_id = fixture_data['league']['id']
-        home_team_name = fixture_data['teams']['home']['name']
-        away_team_name = fixture_data['teams']['away']['name']
-        away_team_points = 0
-        home_team_points = 0
-        warning = ""
-        winner_name = ""
-        points_winner_name = ""
-
-        # Skip fetching standings data if league_id is in the failed set
-        if league_id in failed_league_ids:
-            print(f"League ID {league_id} has previously failed. Skipping fixture {fixture_id}.")
-
-            fixture_info = {
-                'fixture_data': fixture_data,
-                'winning_team': None,
-                'comment': "Previously failed league",
-                'league_name': league_name,
-                'warning': warning
-            }
-            no_star_games.append(fixture_info)
-            games_skipped += 1  
-
-            continue
-
-        # Check if standings data is already cached or in files
-        if league_id not in league_standings_cache:
-            standings_data = load_standings_data(league_id)
-            if not standings_data:
-                standings_data = get_standings_data(league_id)
-                if not standings_data or not standings_data.get('response'):
-                    print(f"Standings data is empty or invalid for league {league_id}. Skipping fixture {fixture_id}.")
-                    failed_league_ids.add(league_id)
-
-                    fixture_info = {
-                        'fixture_data': fixture_data,
-                        'winning_team': None,
-                        'comment': "No standings data available",
-                        'league_name': league_name,
-                        'warning': warning
-                    }
-                    no_star_games.append(fixture_info)
-                    games_skipped += 1
+    from services.fixtures import load_rated_fixtures
+    from services.rating import rate_fixtures
+    from services.bets import save_bets, load_saved_bets, check_bets_success_rate
+    from services.injuries import get_key_player_injuries
+    from helpers.data.cache import print_cache_stats
 
-                    continue
-                save_standings_data(league_id, standings_data)
-            league_standings_cache[league_id] = extract_team_info(standings_data)
-        
-        team_info = league_standings_cache.get(league_id)
-
-        if not team_info:
-            print(f"No team info extracted for league {league_id}. Skipping fixture {fixture_id}.")
-
-            fixture_info = {
-                'fixture_data': fixture_data,
-                'winning_team': None,
-                'comment': "No team info extracted",
-                'league_name': league_name,
-                'warning': warning
-            }
-            no_star_games.append(fixture_info)
-            games_skipped += 1
-
-            continue
-
-        home_team_rank = get_team_rank(team_info, home_team_name)
-        away_team_rank = get_team_rank(team_info, away_team_name)
-
-        if home_team_rank is None or away_team_rank is None:
-            print(f"Rank data missing for fixture {fixture_id}. Skipping fixture {fixture_id}.")
-
-            fixture_info = {
-                'fixture_data': fixture_data,
-                'winning_team': None,
-                'comment': "Rank data missing",
-                'league_name': league_name,
-                'warning': warning
-            }
-            no_star_games.append(fixture_info)
-            games_skipped += 1
-
-            continue
-
-        if abs(home_team_rank - away_team_rank) >= 4:
-            predictions = get_fixture_prediction(fixture_id)
-            if not predictions:
-                print(f"No predictions available for fixture {fixture_id}. Skipping fixture {fixture_id}.")
-
-                fixture_info = {
-                    'fixture_data': fixture_data,
-                    'winning_team': None,
-                    'comment': "No predictions available",
-                    'league_name': league_name,
-                    'warning': warning
-                }
-                no_star_games.append(fixture_info)
-                games_skipped += 1
-
-                continue
-
-            home_team_data = find_team_data_by_name(home_team_name, team_info)
-            away_team_data = find_team_data_by_name(away_team_name, team_info)
-            home_team_points, away_team_points, rating, winner_name, points_winner_name, comment = rate_fixture(predictions, home_team_data, away_team_data)
-
-            # Recalculate the rating after adjusting for injuries (TODO)
-            rating = determine_rating(home_team_points, away_team_points)
-            
-            fixture_info = {
-                'fixture_data': fixture_data,
-                'home_team_points': home_team_points,
-                'away_team_points': away_team_points,
-                'rating': rating,
-                'winning_team': winner_name,
-                'points_winner_name': points_winner_name,
-                'comment': comment,
-                'league_name': league_name,
-                'warning': warning
-            }
-
-            if rating == 'three_star':
-                three_star_games.append(fixture_info)
-            elif rating == 'two_star':
-                two_star_games.append(fixture_info)
-            elif rating == 'one_star':
-                one_star_games.append(fixture_info)
-            games_rated += 1
-            
-        else:
-            print(f"Rank difference between {home_team_name} and {away_team_name} is 4 or less. Skipping fixture {fixture_id}.")
-            fixture_info = {
-                'fixture_data': fixture_data,
-                'home_team_points': 0,
-                'away_team_points': 0,
-                'winning_team': None,
-                'comment': "Rank difference too small to predict",
-                'league_name': league_name,
-                'warning': warning
-            }
-            no_star_games.append(fixture_info)
-            games_skipped += 1
-
-        save_rated_fixtures(one_star_games, two_star_games, three_star_games, no_star_games)
+    print("Loading...")
 
+    totals = rate_fixtures()
     rated_fixtures = load_rated_fixtures()
 
     # all_games = {
@@ -221,43 +57,44 @@ def main():
 
     print("\nThree Star Games:")
     for game in rated_fixtures['three_star_games']:
-        print(f"{index_counter}: {game['fixture_data']['teams']['home']['name']} vs {game['fixture_data']['teams']['away']['name']}, "
-            f"Home Team Points: {game['home_team_points']}, "
-            f"Away Team Points: {game['away_team_points']}, "
-            f"Predicted Winner: {game['winning_team']}, "
-            f"Comment: {game['comment']}, "
-            f"League: {game['league_name']}, "
-            f"Warning: {game['warning']}")
+        print(f"{index_counter}: {game.fixture.home_name} vs {game.fixture.away_name}, "
+            f"Home Team Points: {game.home_team_points}, "
+            f"Away Team Points: {game.away_team_points}, "
+            f"Predicted Winner: {game.winning_team}, "
+            f"Comment: {game.comment}, "
+            f"League: {game.league_name}, "
+            f"Warning: {game.warning}")
         indexed_games.append(game)
         index_counter += 1
 
     print("\nTwo Star Games:")
     for game in rated_fixtures['two_star_games']:
-        print(f"{index_counter}: {game['fixture_data']['teams']['home']['name']} vs {game['fixture_data']['teams']['away']['name']}, "
-            f"Home Team Points: {game['home_team_points']}, "
-            f"Away Team Points: {game['away_team_points']}, "
-            f"Predicted Winner: {game['winning_team']}, "
-            f"Comment: {game['comment']}, "
-            f"League: {game['league_name']}, "
-            f"Warning: {game['warning']}")
+        print(f"{index_counter}: {game.fixture.home_name} vs {game.fixture.away_name}, "
+            f"Home Team Points: {game.home_team_points}, "
+            f"Away Team Points: {game.away_team_points}, "
+            f"Predicted Winner: {game.winning_team}, "
+            f"Comment: {game.comment}, "
+            f"League: {game.league_name}, "
+            f"Warning: {game.warning}")
         indexed_games.append(game)
         index_counter += 1
 
     print("\nOne Star Games:")
     for game in rated_fixtures['one_star_games']:
-        print(f"{index_counter}: {game['fixture_data']['teams']['home']['name']} vs {game['fixture_data']['teams']['away']['name']}, "
-            f"Home Team Points: {game['home_team_points']}, "
-            f"Away Team Points: {game['away_team_points']}, "
-            f"Predicted Winner: {game['winning_team']}, "
-            f"Comment: {game['comment']}, "
-            f"League: {game['league_name']}, "
-            f"Warning: {game['warning']}")
+        print(f"{index_counter}: {game.fixture.home_name} vs {game.fixture.away_name}, "
+            f"Home Team Points: {game.home_team_points}, "
+            f"Away Team Points: {game.away_team_points}, "
+            f"Predicted Winner: {game.winning_team}, "
+            f"Comment: {game.comment}, "
+            f"League: {game.league_name}, "
+            f"Warning: {game.warning}")
         indexed_games.append(game)
         index_counter += 1
 
-    print(f"Total games processed: {total_games_processed}")
-    print(f"Total games rated: {games_rated}")
-    print(f"Total games skipped: {games_skipped}")
+    print(f"Total games processed: {totals['processed']}")
+    print(f"Total games rated: {totals['rated']}")
+    print(f"Total games skipped: {totals['skipped']}")
+    print_cache_stats()
 
     # This loop handles retrieving injury data for selected matches
     while True:
@@ -269,36 +106,22 @@ def main():
                 game_number = int(input("Enter the game number: ").strip())
                 if 1 <= game_number < index_counter:
                     selected_fixture = indexed_games[game_number - 1]
-                    fixture_id = selected_fixture['fixture_data']['fixture']['id']
-
-                    # Fetch the player data for the home and away teams
-                    players_home, players_away = get_player_data(fixture_id)
-
-                    # Determine the key players for both teams
-                    key_players_home, key_players_away = get_key_players_by_team(players_home, players_away)
+                    fixture_id = selected_fixture.fixture_id
 
-                    # Extract the player IDs from the key players for filtering injuries
-                    key_player_ids_home = {player['id'] for player in key_players_home}
-                    key_player_ids_away = {player['id'] for player in key_players_away}
-
-                    # Fetch injury data for the fixture
-                    home_injuries, away_injuries = get_injury_data(fixture_id)
-
-                    # Filter injuries to include only key players' injuries
-                    key_home_injuries = filter_injuries_by_player_ids({'response': home_injuries}, key_player_ids_home)
-                    key_away_injuries = filter_injuries_by_player_ids({'response': away_injuries}, key_player_ids_away)
+                    # Fetch the injuries of both teams' key players
+                    key_home_injuries, key_away_injuries = get_key_player_injuries(fixture_id)
 
                     # Print injury information for the home team
-                    print(f"Injuries for {selected_fixture['fixture_data']['teams']['home']['name']}:")
+                    print(f"Injuries for {selected_fixture.fixture.home_name}:")
                     for injury in key_home_injuries:  # key_home_injuries now contains full injury data
                         player = injury['player']
-                        print(f"- {player['name']} ({player['position']}) - {injury['type']} - {injury['status']}")
+                        print(f"- {player['name']} - {player.get('type')} - {player.get('reason')}")
 
                     # Print injury information for the away team
-                    print(f"Injuries for {selected_fixture['fixture_data']['teams']['away']['name']}:")
+                    print(f"Injuries for {selected_fixture.fixture.away_name}:")
                     for injury in key_away_injuries:  # key_away_injuries now contains full injury data
                         player = injury['player']
-                        print(f"- {player['name']} ({player['position']}) - {injury['type']} - {injury['status']}")
+                        print(f"- {player['name']} - {player.get('type')} - {player.get('reason')}")
                 else:
                     print("Invalid game number.")
             except ValueError:
@@ -320,12 +143,12 @@ def main():
                     multiplier = float(input("Enter the multiplier: ").strip())
 
                     bet = {
-                        'fixture_id': selected_fixture['fixture_data']['fixture']['id'],
-                        'team_name': f"{selected_fixture['fixture_data']['teams']['home']['name']} vs {selected_fixture['fixture_data']['teams']['away']['name']}",
+                        'fixture_id': selected_fixture.fixture_id,
+                        'team_name': f"{selected_fixture.fixture.home_name} vs {selected_fixture.fixture.away_name}",
                         'multiplier': multiplier,
-                        'home_team_points': selected_fixture['home_team_points'],
-                        'away_team_points': selected_fixture['away_team_points'],
-                        'predicted_winner': f"Predicted winner: {selected_fixture['winning_team']}"
+                        'home_team_points': selected_fixture.home_team_points,
+                        'away_team_points': selected_fixture.away_team_points,
+                        'predicted_winner': f"Predicted winner: {selected_fixture.winning_team}"
                     }
                     bets.append(bet)
                 else:
@@ -350,5 +173,182 @@ def main():
         else:
             print("Invalid input. Please enter 'yes' or 'no'.")
 
+# Exit codes of the batch commands; argparse itself exits with 2 on bad usage
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_NO_DATA = 3
+
+RATED_TIERS = ['three_star_games', 'two_star_games', 'one_star_games']
+
+RATING_FIELDS = [
+    'date', 'tier', 'fixture_id', 'kickoff', 'league_id', 'league', 'country', 'home', 'away',
+    'home_team_points', 'away_team_points', 'rating', 'predicted_winner', 'points_winner', 'comment', 'warning'
+]
+BET_FIELDS = [
+    'fixture_id', 'team_name', 'multiplier', 'home_team_points', 'away_team_points',
+    'predicted_winner', 'home_team_goals', 'away_team_goals', 'correct'
+]
+INJURY_FIELDS = ['fixture_id', 'side', 'team', 'player_id', 'player', 'type', 'reason']
+
+def parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}', expected YYYY-MM-DD")
+
+def date_range(start, end):
+    """Days from start to end inclusive, as 'YYYY-MM-DD' strings."""
+    day = start
+    while day <= end:
+        yield day.strftime('%Y-%m-%d')
+        day += timedelta(days=1)
+
+def rating_row(date_str, tier, game):
+    return dict({'date': date_str, 'tier': tier}, **game.to_dict())
+
+def injury_rows(fixture_id, side, injuries):
+    for injury in injuries:
+        player = injury['player']
+        yield {
+            'fixture_id': fixture_id,
+            'side': side,
+            'team': injury.get('team', {}).get('name'),
+            'player_id': player.get('id'),
+            'player': player.get('name'),
+            'type': player.get('type'),
+            'reason': player.get('reason')
+        }
+
+def write_output(result, rows, fields, args):
+    """
+    Write a command's result to args.output or stdout: the whole result as
+    JSON, or its rows as CSV with a header line.
+    """
+    file = open(args.output, 'w', encoding='utf-8', newline='') if args.output else args.stdout
+    try:
+        if args.format == 'csv':
+            writer = csv.DictWriter(file, fieldnames=fields, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            json.dump(result, file, indent=2, default=str)
+            file.write('\n')
+    finally:
+        if args.output:
+            file.close()
+
+def run_rate(args):
+    from services.fixtures import load_rated_fixtures
+    from services.rating import rate_fixtures
+
+    if args.end and args.end < args.date:
+        print("--end must not be before --date.", file=sys.stderr)
+        return EXIT_USAGE
+
+    league_ids = set(args.league) if args.league else None
+    tiers = RATED_TIERS + ['no_star_games'] if args.all else RATED_TIERS
+
+    days = []
+    rows = []
+    for date_str in date_range(args.date, args.end or args.date):
+        totals = rate_fixtures(date_str, league_ids)
+        rated_fixtures = load_rated_fixtures(date_str)
+        for tier in tiers:
+            for game in rated_fixtures[tier]:
+                if league_ids and game.fixture.league_id not in league_ids:
+                    continue
+                rows.append(rating_row(date_str, tier, game))
+        days.append(dict(totals, date=date_str))
+
+    write_output({'days': days, 'fixtures': rows}, rows, RATING_FIELDS, args)
+    return EXIT_OK if any(day['processed'] for day in days) else EXIT_NO_DATA
+
+def run_settle(args):
+    from services.bets import load_saved_bets, check_bets_success_rate
+
+    bets = load_saved_bets()
+    if not bets:
+        print("No saved bets to settle.", file=sys.stderr)
+        return EXIT_NO_DATA
+
+    summary = check_bets_success_rate(bets)
+    write_output(summary, summary['bets'], BET_FIELDS, args)
+    return EXIT_OK
+
+def run_injuries(args):
+    from services.injuries import get_key_player_injuries
+
+    fixtures = []
+    rows = []
+    for fixture_id in args.fixture_ids:
+        key_home_injuries, key_away_injuries = get_key_player_injuries(fixture_id)
+        fixtures.append({
+            'fixture_id': fixture_id,
+            'home_injuries': key_home_injuries,
+            'away_injuries': key_away_injuries
+        })
+        rows.extend(injury_rows(fixture_id, 'home', key_home_injuries))
+        rows.extend(injury_rows(fixture_id, 'away', key_away_injuries))
+
+    write_output({'fixtures': fixtures}, rows, INJURY_FIELDS, args)
+    return EXIT_OK
+
+def run_serve(args):
+    from services.daemon import serve
+
+    serve(args.host, args.port, args.refresh)
+    return EXIT_OK
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Rate football fixtures, settle saved bets and look up injuries without prompts. "
+                    "Run without arguments for the interactive mode. Add --startup-profile to any "
+                    "command to print the import and init time per module when it exits."
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    output_options = argparse.ArgumentParser(add_help=False)
+    output_options.add_argument('--format', choices=['json', 'csv'], default='json', help="Output format (default: json).")
+    output_options.add_argument('--output', '-o', metavar='FILE', help="Write the output to FILE instead of stdout.")
+
+    rate_parser = subparsers.add_parser('rate', parents=[output_options], help="Rate the fixtures of a day or a range of days.")
+    rate_parser.add_argument('--date', type=parse_date, default=datetime.now().date(), help="Day to rate, YYYY-MM-DD (default: today).")
+    rate_parser.add_argument('--end', type=parse_date, help="Last day of a range starting at --date, inclusive.")
+    rate_parser.add_argument('--league', type=int, action='append', metavar='ID', help="Only rate this league; repeat for several.")
+    rate_parser.add_argument('--all', action='store_true', help="Also output the fixtures rated no star or skipped.")
+    rate_parser.set_defaults(handler=run_rate)
+
+    settle_parser = subparsers.add_parser('settle', parents=[output_options], help="Settle the saved bets and report the success rate.")
+    settle_parser.set_defaults(handler=run_settle)
+
+    injuries_parser = subparsers.add_parser('injuries', parents=[output_options], help="Injuries of the key players of fixtures.")
+    injuries_parser.add_argument('fixture_ids', type=int, nargs='+', metavar='FIXTURE_ID')
+    injuries_parser.set_defaults(handler=run_injuries)
+
+    serve_parser = subparsers.add_parser('serve', help="Keep the data warm in memory and serve it over a local HTTP/JSON API.")
+    serve_parser.add_argument('--host', default=DAEMON_HOST, help=f"Address to bind (default: {DAEMON_HOST}).")
+    serve_parser.add_argument('--port', type=int, default=DAEMON_PORT, help=f"Port to listen on (default: {DAEMON_PORT}).")
+    serve_parser.add_argument('--refresh', type=int, default=DAEMON_REFRESH_SECONDS, help="Seconds between background refreshes.")
+    serve_parser.set_defaults(handler=run_serve)
+
+    return parser
+
+def run_batch(argv):
+    """
+    Run one batch command and return its exit code. Progress messages go to
+    stderr so stdout only carries the requested output.
+    """
+    args = build_parser().parse_args(argv)
+    args.stdout = sys.stdout
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            return args.handler(args)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return EXIT_ERROR
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_batch(sys.argv[1:]))
     main()
@@ -1,34 +1,39 @@
 # -*- mode: python ; coding: utf-8 -*-
+#
+# pyinstaller program.spec                      -> dist/program.exe (one file)
+# set PROGRAM_BUILD=onedir && pyinstaller program.spec -> dist/program/program.exe
+#
+# The one-file build unpacks itself into a temporary folder on every launch; the
+# one-folder build starts faster because nothing has to be extracted. Neither
+# bundles the cache: point BASE_DIR in config.py at a folder next to the
+# executable so cached data survives between runs and is never unpacked.
+import os
 
+onedir = os.environ.get('PROGRAM_BUILD', 'onefile').strip() == 'onedir'
 
 a = Analysis(
     ['program.py'],
     pathex=[],
     binaries=[],
-    datas=[('data', 'data'), ('helpers', 'helpers'), ('services', 'services')],
+    datas=[],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # numpy is only used by the analysis modules, which are run from source
+    excludes=['tkinter', 'numpy'],
     noarchive=False,
     optimize=0,
 )
 pyz = PYZ(a.pure)
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.datas,
-    [],
+exe_options = dict(
     name='program',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
     upx=True,
     upx_exclude=[],
-    runtime_tmpdir=None,
     console=True,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -37,3 +42,31 @@ exe = EXE(
     entitlements_file=None,
     icon=['coin.ico'],
 )
+
+if onedir:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        **exe_options,
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=True,
+        upx_exclude=[],
+        name='program',
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.datas,
+        [],
+        runtime_tmpdir=None,
+        **exe_options,
+    )
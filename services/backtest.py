@@ -0,0 +1,205 @@
+import os
+import re
+
+import numpy as np
+
+from services.fixtures import load_rated_fixtures, get_rated_fixture_id
+from services.bets import load_saved_bets, get_bet_side
+from helpers.data.cache import get_cache
+from helpers.data.json_stream import iter_array_items
+
+from config import RATINGS_DIR, BETS_DIR
+
+TIERS = ('one_star_games', 'two_star_games', 'three_star_games')
+
+FINISHED_STATUSES = {'FT', 'AET', 'PEN'}
+
+def list_rated_dates(start_date=None, end_date=None):
+    """Dates (YYYY-MM-DD) of every archived rated_fixtures file, optionally limited to a range."""
+    pattern = re.compile(r'^rated_fixtures_(\d{4}-\d{2}-\d{2})\.jsonl?$')
+    dates = set()
+    if os.path.isdir(RATINGS_DIR):
+        for filename in os.listdir(RATINGS_DIR):
+            match = pattern.match(filename)
+            if match:
+                dates.add(match.group(1))
+    return sorted(date_str for date_str in dates
+                  if (start_date is None or date_str >= start_date) and (end_date is None or date_str <= end_date))
+
+def get_final_score(fixture):
+    """Return (home_goals, away_goals) of a finished fixture payload, otherwise None."""
+    if not fixture or fixture.get('fixture', {}).get('status', {}).get('short') not in FINISHED_STATUSES:
+        return None
+    fulltime = fixture.get('score', {}).get('fulltime', {})
+    if fulltime.get('home') is None or fulltime.get('away') is None:
+        return None
+    return fulltime['home'], fulltime['away']
+
+def load_cached_results(fixture_ids, dates):
+    """
+    Collect final scores from local data only: the cached day lists of the
+    rated dates, overridden by the per-fixture score cache where present.
+
+    The day lists are read one fixture at a time straight from the cache files,
+    so multi-megabyte days are neither held whole nor kept in the memory cache.
+    """
+    wanted_ids = set(fixture_ids)
+    results = {}
+    fixtures_cache = get_cache('fixtures')
+    for date_str in dates:
+        stream = fixtures_cache.open_stream(date_str, ignore_ttl=True)
+        if stream is None:
+            continue
+        with stream:
+            try:
+                for fixture in iter_array_items(stream):
+                    fixture_id = fixture.get('fixture', {}).get('id')
+                    if fixture_id in wanted_ids:
+                        score = get_final_score(fixture)
+                        if score is not None:
+                            results[fixture_id] = score
+            except ValueError as e:
+                print(f"Error parsing fixtures data for {date_str}: {e}")
+
+    fixture_cache = get_cache('fixture')
+    for fixture_id in wanted_ids:
+        score = get_final_score(fixture_cache.get(fixture_id, ignore_ttl=True))
+        if score is not None:
+            results[fixture_id] = score
+    return results
+
+def report_missing_results(fixture_ids, results):
+    """Print how many rated fixtures have no final score locally, and return that count."""
+    missing = sum(1 for fixture_id in fixture_ids if fixture_id not in results)
+    if missing:
+        # The day lists are usually cached before kickoff, so most scores come from the per-fixture cache
+        print(f"{missing} rated fixtures have no final score in the local data and are left out.")
+    return missing
+
+def get_pick(fixture_info):
+    """Side picked by the rating points: 1 home, -1 away, 0 draw, 2 unknown."""
+    home_team_points, away_team_points = fixture_info.home_team_points, fixture_info.away_team_points
+    if home_team_points is None or away_team_points is None:
+        return 2
+    return int(np.sign(home_team_points - away_team_points))
+
+def build_backtest_arrays(start_date=None, end_date=None):
+    """
+    Flatten every rated fixture in the date range into NumPy columns.
+
+    :return: Dictionary of arrays plus the 'leagues' lookup list for 'league_code'.
+    """
+    dates = list_rated_dates(start_date, end_date)
+    rows = []
+    for date_str in dates:
+        rated_fixtures = load_rated_fixtures(date_str)
+        for tier_code, tier in enumerate(TIERS):
+            for fixture_info in rated_fixtures.get(tier, []):
+                rows.append((tier_code, fixture_info))
+
+    fixture_ids = [get_rated_fixture_id(fixture_info) for _, fixture_info in rows]
+    results = load_cached_results(fixture_ids, dates)
+    report_missing_results(fixture_ids, results)
+    bets = load_saved_bets() if os.path.isdir(BETS_DIR) else []
+    # The multiplier is the price of the side that was bet on, so it only applies to that pick
+    odds = {bet['fixture_id']: (get_bet_side(bet), bet.get('multiplier')) for bet in bets}
+
+    leagues = sorted({fixture_info.league_name or 'Unknown' for _, fixture_info in rows})
+    league_codes = {league: code for code, league in enumerate(leagues)}
+
+    count = len(rows)
+    columns = {
+        'tier': np.empty(count, dtype=np.int8),
+        'league_code': np.empty(count, dtype=np.int32),
+        'pick': np.empty(count, dtype=np.int8),          # 1 home, -1 away, 0 draw, 2 unknown
+        'home_goals': np.full(count, -1, dtype=np.int16),
+        'away_goals': np.full(count, -1, dtype=np.int16),
+        'odds': np.full(count, np.nan)
+    }
+    for i, (tier_code, fixture_info) in enumerate(rows):
+        fixture_id = fixture_ids[i]
+        pick = get_pick(fixture_info)
+
+        columns['tier'][i] = tier_code
+        columns['league_code'][i] = league_codes[fixture_info.league_name or 'Unknown']
+        columns['pick'][i] = pick
+        if fixture_id in results:
+            columns['home_goals'][i], columns['away_goals'][i] = results[fixture_id]
+        bet_side, multiplier = odds.get(fixture_id, (None, None))
+        if multiplier and bet_side == pick:
+            columns['odds'][i] = multiplier
+
+    columns['leagues'] = leagues
+    return columns
+
+def evaluate(columns):
+    """
+    Vectorized hit/ROI evaluation of the backtest columns.
+
+    :return: Dictionary with boolean 'settled' and 'hit' arrays and a float
+             'profit' array (NaN where no odds are known), per unit stake.
+    """
+    settled = columns['home_goals'] >= 0
+    outcome = np.sign(columns['home_goals'].astype(int) - columns['away_goals'].astype(int))
+    hit = settled & (outcome == columns['pick'])
+    profit = np.where(hit, columns['odds'] - 1, -1.0)
+    profit = np.where(np.isnan(columns['odds']) | ~settled, np.nan, profit)
+    return {'settled': settled, 'hit': hit, 'profit': profit}
+
+def summarize_by(group_codes, group_count, evaluation):
+    """Aggregate settled fixtures, hits, hit rate and ROI per group code with bincount."""
+    settled = evaluation['settled']
+    has_odds = ~np.isnan(evaluation['profit'])
+
+    fixtures = np.bincount(group_codes, minlength=group_count)
+    settled_count = np.bincount(group_codes, weights=settled, minlength=group_count)
+    hits = np.bincount(group_codes, weights=evaluation['hit'], minlength=group_count)
+    staked = np.bincount(group_codes, weights=has_odds, minlength=group_count)
+    profit = np.bincount(group_codes, weights=np.nan_to_num(evaluation['profit']), minlength=group_count)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        hit_rate = np.where(settled_count > 0, hits / settled_count * 100, np.nan)
+        roi = np.where(staked > 0, profit / staked * 100, np.nan)
+    return fixtures, settled_count.astype(int), hits.astype(int), hit_rate, roi
+
+def run_backtest(start_date=None, end_date=None):
+    """Replay archived ratings against final scores and print per-tier and per-league results."""
+    columns = build_backtest_arrays(start_date, end_date)
+    if len(columns['tier']) == 0:
+        print("No rated fixtures found for the given date range.")
+        return None
+
+    evaluation = evaluate(columns)
+    print(f"Rated fixtures: {len(columns['tier'])}, settled from local data: {int(evaluation['settled'].sum())}")
+
+    sections = [
+        ("Star tier", columns['tier'].astype(np.int64), list(TIERS)),
+        ("League", columns['league_code'].astype(np.int64), columns['leagues'])
+    ]
+    report = {}
+    for title, codes, labels in sections:
+        fixtures, settled, hits, hit_rate, roi = summarize_by(codes, len(labels), evaluation)
+        print(f"\n{title:<40} {'Rated':>6} {'Settled':>8} {'Hits':>6} {'Hit %':>7} {'ROI %':>7}")
+        report[title] = {}
+        for i, label in enumerate(labels):
+            if not fixtures[i]:
+                continue
+            hit_rate_text = f"{hit_rate[i]:.1f}" if not np.isnan(hit_rate[i]) else "-"
+            roi_text = f"{roi[i]:.1f}" if not np.isnan(roi[i]) else "-"
+            print(f"{label:<40} {fixtures[i]:>6} {settled[i]:>8} {hits[i]:>6} {hit_rate_text:>7} {roi_text:>7}")
+            report[title][label] = {
+                'rated': int(fixtures[i]), 'settled': int(settled[i]), 'hits': int(hits[i]),
+                'hit_rate': None if np.isnan(hit_rate[i]) else float(hit_rate[i]),
+                'roi': None if np.isnan(roi[i]) else float(roi[i])
+            }
+    return report
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backtest archived ratings against final scores from local data.")
+    parser.add_argument('--start', default=None, help="First date to include (YYYY-MM-DD)")
+    parser.add_argument('--end', default=None, help="Last date to include (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    run_backtest(args.start, args.end)
@@ -0,0 +1,158 @@
+import numpy as np
+
+from services.predictions import extract_rating_features
+from helpers.settings import RATING_PARAMETERS
+
+RATINGS = np.array(['no_star', 'one_star', 'two_star', 'three_star'])
+
+FEATURE_COLUMNS = (
+    'percent_home', 'percent_draw', 'percent_away', 'win_ratio_difference', 'goal_ratio_difference',
+    'rank_difference', 'home_points', 'away_points', 'home_goals_diff', 'away_goals_diff', 'home_form_code'
+)
+
+def form_code(form):
+    """Encode the form streak the same way adjust_points_based_on_form reads it."""
+    if form.endswith('WWWWW'):
+        return 2
+    elif form.endswith('WWW'):
+        return 1
+    elif form.endswith('LLLLL'):
+        return -2
+    elif form.endswith('LLL'):
+        return -1
+    return 0
+
+def features_to_columns(feature_rows):
+    """
+    Turn a list of extract_rating_features dictionaries into NumPy columns.
+
+    :param feature_rows: Feature dictionaries, one per fixture.
+    :return: Dictionary mapping each name in FEATURE_COLUMNS to a float array.
+    """
+    columns = {name: np.empty(len(feature_rows), dtype=float) for name in FEATURE_COLUMNS}
+    for i, features in enumerate(feature_rows):
+        for name in FEATURE_COLUMNS[:-1]:
+            columns[name][i] = features[name] if features[name] is not None else 0
+        columns['home_form_code'][i] = form_code(features['home_form'])
+    return columns
+
+def build_feature_columns(fixtures):
+    """
+    Extract features for many fixtures at once.
+
+    :param fixtures: Iterable of (predictions, home_team_data, away_team_data) tuples.
+    :return: (columns, rated_mask) where rated_mask is False for fixtures the
+             scalar path would skip for missing form or bad data.
+    """
+    feature_rows = []
+    rated_mask = []
+    for predictions, home_team_data, away_team_data in fixtures:
+        try:
+            features = extract_rating_features(predictions, home_team_data, away_team_data)
+        except (KeyError, IndexError, ValueError):
+            features = None
+        rated_mask.append(features is not None)
+        if features is not None:
+            feature_rows.append(features)
+
+    columns = features_to_columns(feature_rows)
+    rated_mask = np.array(rated_mask, dtype=bool)
+    expanded = {name: np.zeros(len(rated_mask)) for name in FEATURE_COLUMNS}
+    for name in FEATURE_COLUMNS:
+        expanded[name][rated_mask] = columns[name]
+    return expanded, rated_mask
+
+def _percentage_points(percent, params):
+    return np.select([percent >= params['percent_high'], percent >= params['percent_low']], [2, 1], 0)
+
+def _ratio_points(ratio_difference, is_home, params):
+    # Mirrors adjust_points_based_on_ratio branch for branch
+    conditions = [
+        ratio_difference >= params['ratio_high'], ratio_difference >= params['ratio_low'], ratio_difference >= 1,
+        ratio_difference <= -params['ratio_high'], ratio_difference <= -params['ratio_low']
+    ]
+    choices = [2, 1, 0, 0, 0] if is_home else [0, 0, 0, 2, 1]
+    return np.select(conditions, choices, 0)
+
+def _goal_ratio_points(goal_ratio_difference, is_home, params):
+    # Mirrors adjust_points_based_on_goal_ratio branch for branch
+    conditions = [
+        goal_ratio_difference >= params['goal_ratio_high'], goal_ratio_difference >= params['goal_ratio_low'],
+        goal_ratio_difference >= 1, goal_ratio_difference <= -params['goal_ratio_low'],
+        goal_ratio_difference <= -params['goal_ratio_high']
+    ]
+    choices = [2, 1, 0, -1, -2] if is_home else [-1, -1, 0, 1, 2]
+    return np.select(conditions, choices, 0)
+
+def _rank_points(rank_difference, is_home, params):
+    # Mirrors adjust_points_based_on_rank branch for branch
+    conditions = [
+        rank_difference >= params['rank_high'], rank_difference >= params['rank_low'],
+        rank_difference <= -params['rank_high'], rank_difference <= -params['rank_low']
+    ]
+    choices = [2, 1, 0, 0] if is_home else [0, 0, 2, 1]
+    return np.select(conditions, choices, 0)
+
+def _points_difference_points(points_difference, params):
+    conditions = [points_difference >= params['points_difference_high'], points_difference >= params['points_difference_low']]
+    return np.select(conditions, [2, 1], 0)
+
+def _goals_diff_points(goals_diff, is_home):
+    choices = [3, 2, 1, -1] if is_home else [2, 1, 1, -1]
+    return np.select([goals_diff > 30, goals_diff > 15, goals_diff > 0, goals_diff < 0], choices, 0)
+
+def rating_from_points(home_team_points, away_team_points, params=None):
+    """Vectorized determine_rating: star tier index (0-3) for every fixture."""
+    params = params or RATING_PARAMETERS
+    points_difference = np.abs(home_team_points - away_team_points)
+    conditions = [
+        points_difference >= params['three_star'], points_difference >= params['two_star'],
+        points_difference >= params['one_star']
+    ]
+    return np.select(conditions, [3, 2, 1], 0)
+
+def rate_fixtures_batch(columns, rated_mask=None, params=None):
+    """
+    Score many fixtures at once with the same rules as rate_fixture.
+
+    :param columns: Dictionary of NumPy feature columns (see FEATURE_COLUMNS).
+    :param rated_mask: Optional boolean array; fixtures marked False score 0 - 0 'no_star'.
+    :param params: Rating parameters, RATING_PARAMETERS by default.
+    :return: (home_team_points, away_team_points, ratings) arrays, with ratings
+             holding the tier names used by determine_rating.
+    """
+    params = params or RATING_PARAMETERS
+    home_team_points, away_team_points = calculate_points_batch(columns, rated_mask, params)
+    ratings = RATINGS[rating_from_points(home_team_points, away_team_points, params)]
+    return home_team_points, away_team_points, ratings
+
+def calculate_points_batch(columns, rated_mask=None, params=None):
+    """Vectorized calculate_fixture_points: (home_team_points, away_team_points) arrays."""
+    params = params or RATING_PARAMETERS
+    win_ratio_difference = columns['win_ratio_difference']
+    goal_ratio_difference = columns['goal_ratio_difference']
+    rank_difference = columns['rank_difference']
+
+    with np.errstate(invalid='ignore'):
+        home_team_points = (
+            _percentage_points(columns['percent_home'], params)
+            + _ratio_points(win_ratio_difference, True, params)
+            + _goal_ratio_points(goal_ratio_difference, True, params)
+            + _rank_points(rank_difference, True, params)
+            + _points_difference_points(columns['home_points'] - columns['away_points'], params)
+            + _goals_diff_points(columns['home_goals_diff'], is_home=True)
+            + columns['home_form_code'].astype(int)
+        )
+        away_team_points = (
+            _percentage_points(columns['percent_away'], params)
+            + _ratio_points(-win_ratio_difference, False, params)
+            + _goal_ratio_points(-goal_ratio_difference, False, params)
+            + _rank_points(-rank_difference, False, params)
+            + _points_difference_points(columns['away_points'] - columns['home_points'], params)
+            + _goals_diff_points(columns['away_goals_diff'], is_home=False)
+        )
+
+    if rated_mask is not None:
+        home_team_points = np.where(rated_mask, home_team_points, 0)
+        away_team_points = np.where(rated_mask, away_team_points, 0)
+    return home_team_points, away_team_points
@@ -1,40 +1,70 @@
 import os
-import json
 
-from services.fixtures import get_fixture_score
+from services.fixtures import get_fixtures_by_ids
 from helpers.data.latest_file import find_latest_file
+from helpers.data.serializer import dump_file_atomic, load_file
+from helpers.data.file_lock import file_lock
 
 from config import BETS_DIR
 
+def _bets_lock():
+    """Lock held by every process reading bets to change and write them back."""
+    return file_lock(os.path.join(BETS_DIR, '.locks', 'bets.lock'))
+
 def save_bets(bets):
     file_path = os.path.join(BETS_DIR, 'bets.json')
     os.makedirs(BETS_DIR, exist_ok=True)
 
     try:
-        if os.path.exists(file_path):
-            with open(file_path, 'r') as file:
-                existing_bets = json.load(file)
-        else:
-            existing_bets = []
+        with _bets_lock():
+            if os.path.exists(file_path):
+                existing_bets = load_file(file_path)
+            else:
+                existing_bets = []
 
-        existing_bets.extend(bets)
-        with open(file_path, 'w') as file:
-            json.dump(existing_bets, file, indent=4)
+            existing_bets.extend(bets)
+            dump_file_atomic(file_path, existing_bets)
 
     except Exception as e:
         print(f"Error saving bets: {e}")
 
 def load_saved_bets():
-    latest_file = find_latest_file(BETS_DIR)
+    latest_file = find_latest_file(BETS_DIR) if os.path.isdir(BETS_DIR) else None
     if latest_file is None:
         return []
     
     file_path = os.path.join(BETS_DIR, latest_file)
-    with open(file_path, 'r') as file:
-        bets_data = json.load(file)
-        return bets_data 
+    return load_file(file_path)
+
+def get_bet_fixture_score(fixture_data):
+    """Return the (home, away) fulltime score of a fixture, (None, None) while it is unknown."""
+    if fixture_data is None:
+        return None, None
+    return fixture_data['score']['fulltime']['home'], fixture_data['score']['fulltime']['away']
+
+def get_bet_side(bet):
+    """Side a bet was placed on: 1 home, -1 away, 0 draw, None when it cannot be told."""
+    predicted_winner = bet.get('predicted_winner', '').split(": ", 1)[-1]
+    home_name, _, away_name = bet.get('team_name', '').partition(" vs ")
+    return {home_name: 1, away_name: -1, 'Draw': 0}.get(predicted_winner)
+
+def summarize_bets(bets):
+    """Success rate of the settled bets, without fetching anything."""
+    settled_bets = [bet for bet in bets if 'correct' in bet]
+    successful_bets = sum(1 for bet in settled_bets if bet['correct'])
+    return {
+        'total_bets': len(settled_bets),
+        'successful_bets': successful_bets,
+        'success_rate': (successful_bets / len(settled_bets)) * 100 if settled_bets else 0,
+        'pending_bets': len(bets) - len(settled_bets)
+    }
 
 def check_bets_success_rate(new_bets):
+    # Another run may settle or save bets at the same time; keep its changes
+    with _bets_lock():
+        return _check_bets_success_rate(new_bets)
+
+def _check_bets_success_rate(new_bets):
     successful_bets = 0
     total_bets = 0
 
@@ -54,6 +84,9 @@ def check_bets_success_rate(new_bets):
             # Add new bet
             unique_bets[fixture_id] = bet
 
+    # Fetch the fixtures of all unsettled bets up front, many ids per request
+    pending_fixtures = get_fixtures_by_ids([bet['fixture_id'] for bet in unique_bets.values() if 'correct' not in bet])
+
     for bet in unique_bets.values():
         if 'correct' in bet:
             total_bets += 1
@@ -64,7 +97,7 @@ def check_bets_success_rate(new_bets):
             predicted_winner = bet['predicted_winner'].split(": ")[1]
             print(f"Checking bet for fixture {bet['fixture_id']}: predicted winner - {predicted_winner}")
 
-            actual_home_score, actual_away_score = get_fixture_score(bet['fixture_id'])
+            actual_home_score, actual_away_score = get_bet_fixture_score(pending_fixtures.get(bet['fixture_id']))
             print(f"Actual score for {bet['team_name']}: {actual_home_score} - {actual_away_score}")
 
             if actual_home_score is None or actual_away_score is None:
@@ -101,9 +134,16 @@ def check_bets_success_rate(new_bets):
     # Save updated bets back to bets.json
     save_updated_bets(list(unique_bets.values()))
 
+    return {
+        'total_bets': total_bets,
+        'successful_bets': successful_bets,
+        'success_rate': success_rate,
+        'bets': list(unique_bets.values())
+    }
+
 def save_updated_bets(bets):
-    latest_file = find_latest_file(BETS_DIR)
+    os.makedirs(BETS_DIR, exist_ok=True)
+    latest_file = find_latest_file(BETS_DIR) or 'bets.json'
     file_path = os.path.join(BETS_DIR, latest_file)
 
-    with open(file_path, 'w') as file:
-        json.dump(bets, file, indent=4)
+    dump_file_atomic(file_path, bets)
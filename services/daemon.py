@@ -0,0 +1,182 @@
+import threading
+import time
+
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from services.fixtures import RATING_TIERS, load_rated_fixtures, rated_fixtures_version, forget_rated_fixture_index
+from services.rating import rate_fixtures
+from services.bets import load_saved_bets, summarize_bets, check_bets_success_rate
+from services.injuries import get_key_player_injuries
+from helpers.data.serializer import encode
+from helpers.settings import DAEMON_HOST, DAEMON_PORT, DAEMON_REFRESH_SECONDS
+
+# Days of ratings kept in memory besides today
+MAX_WARM_DAYS = 31
+
+class WarmState:
+    """
+    Ratings and bet stats held in memory between requests.
+
+    A day's ratings are loaded once and served from memory until its rated
+    fixtures files change, so ratings written by the batch CLI or another
+    process are picked up on the next request. Standings, predictions and
+    injuries are kept warm by the in-memory LRU of their caches.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ratings = {}
+        self.bet_stats = summarize_bets(load_saved_bets())
+        self.started_at = time.time()
+        self.last_refresh = None
+        self.last_totals = None
+
+    def ratings(self, date_str):
+        """Return a day's rated fixtures per tier, reloading them only when their files changed."""
+        version = rated_fixtures_version(date_str)
+        with self._lock:
+            entry = self._ratings.get(date_str)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        forget_rated_fixture_index(date_str)
+        rated_fixtures = load_rated_fixtures(date_str)
+        with self._lock:
+            if len(self._ratings) > MAX_WARM_DAYS:
+                self._ratings.clear()
+            self._ratings[date_str] = (version, rated_fixtures)
+        return rated_fixtures
+
+    def refresh(self):
+        """Rate today's new fixtures and settle pending bets."""
+        today = datetime.now().strftime('%Y-%m-%d')
+        totals = rate_fixtures(today)
+        self.ratings(today)
+
+        bets = load_saved_bets()
+        if any('correct' not in bet for bet in bets):
+            bets = check_bets_success_rate(bets)['bets']
+
+        with self._lock:
+            self.bet_stats = summarize_bets(bets)
+            self.last_refresh = time.time()
+            self.last_totals = dict(totals, date=today)
+
+def refresh_periodically(state, interval, stop_event):
+    """Refresh the state now and then every interval seconds until stop_event is set."""
+    while True:
+        try:
+            state.refresh()
+        except Exception as e:
+            print(f"Background refresh failed: {e}")
+        if stop_event.wait(interval):
+            break
+
+def parse_date_param(query):
+    date_str = query.get('date', [datetime.now().strftime('%Y-%m-%d')])[0]
+    datetime.strptime(date_str, '%Y-%m-%d')
+    return date_str
+
+def get_health(state, query):
+    return {
+        'status': 'ok',
+        'started_at': state.started_at,
+        'last_refresh': state.last_refresh,
+        'last_totals': state.last_totals
+    }
+
+def get_ratings(state, query):
+    date_str = parse_date_param(query)
+    tiers = query.get('tier') or ['three_star_games', 'two_star_games', 'one_star_games']
+    unknown_tiers = set(tiers) - set(RATING_TIERS)
+    if unknown_tiers:
+        raise ValueError(f"unknown tier {', '.join(sorted(unknown_tiers))}")
+    league_ids = {int(league_id) for league_id in query.get('league', [])}
+
+    rated_fixtures = state.ratings(date_str)
+    fixtures = [
+        dict({'tier': tier}, **game.to_dict())
+        for tier in tiers
+        for game in rated_fixtures[tier]
+        if not league_ids or game.fixture.league_id in league_ids
+    ]
+    return {'date': date_str, 'fixtures': fixtures}
+
+def get_injuries(state, query):
+    if 'fixture' not in query:
+        raise ValueError("missing fixture parameter")
+    fixture_id = int(query['fixture'][0])
+    home_injuries, away_injuries = get_key_player_injuries(fixture_id)
+    return {'fixture_id': fixture_id, 'home_injuries': home_injuries, 'away_injuries': away_injuries}
+
+def get_bet_stats(state, query):
+    return dict(state.bet_stats, last_refresh=state.last_refresh)
+
+ROUTES = {
+    '/health': get_health,
+    '/ratings': get_ratings,
+    '/injuries': get_injuries,
+    '/bets/stats': get_bet_stats,
+}
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Serves the JSON routes in ROUTES from the WarmState of its server."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        route = ROUTES.get(url.path.rstrip('/') or '/')
+        if route is None:
+            self.send_json(404, {'error': f"unknown path {url.path}", 'paths': sorted(ROUTES)})
+            return
+
+        try:
+            self.send_json(200, route(self.server.state, parse_qs(url.query)))
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+        except Exception as e:
+            self.send_json(500, {'error': str(e)})
+
+    def send_json(self, status, body):
+        raw = encode(body)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+def serve(host=DAEMON_HOST, port=DAEMON_PORT, refresh_seconds=DAEMON_REFRESH_SECONDS):
+    """
+    Run the HTTP/JSON API until interrupted, refreshing today's ratings and the
+    bet stats in a background thread every refresh_seconds.
+    """
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    server.state = WarmState()
+
+    stop_event = threading.Event()
+    refresher = threading.Thread(
+        target=refresh_periodically, args=(server.state, refresh_seconds, stop_event), daemon=True
+    )
+    refresher.start()
+
+    print(f"Serving on http://{host}:{server.server_address[1]} (refresh every {refresh_seconds}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopping...")
+    finally:
+        stop_event.set()
+        server.server_close()
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve ratings, injuries and bet stats over a local HTTP/JSON API.")
+    parser.add_argument('--host', default=DAEMON_HOST, help=f"Address to bind (default: {DAEMON_HOST})")
+    parser.add_argument('--port', type=int, default=DAEMON_PORT, help=f"Port to listen on (default: {DAEMON_PORT})")
+    parser.add_argument('--refresh', type=int, default=DAEMON_REFRESH_SECONDS, help="Seconds between background refreshes")
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.refresh)
@@ -1,97 +1,172 @@
-import json
+import io
 import os
 
 from datetime import datetime
-from fetchers import fetch_fixtures_for_day, fetch_fixture
-from helpers.data.latest_file import find_latest_rated_fixtures, find_latest_file
+from fetchers import (
+    fetch_fixtures_for_day, fetch_fixture, fetch_fixtures_by_ids, MAX_FIXTURE_IDS_PER_REQUEST,
+    fetch_current_leagues, fetch_league_fixtures_for_day
+)
+from helpers.data.latest_file import find_latest_rated_fixtures
 from helpers.data.fetch_data import fetch_data_with_rate_limit
+from helpers.data.cache import get_cache, batch_writes
+from helpers.data.json_stream import iter_array_items, read_envelope
+from helpers.data.serializer import encode, decode, dump_file_atomic, write_file_atomic, load_file
+from helpers.data.async_fetch import fetch_concurrently
+from helpers.data.file_lock import file_lock
+from helpers.settings import FIXTURES_FETCH_MODE
+from services.records import RatingRecord
 
-from config import FIXTURES_DIR, RATINGS_DIR, BETS_DIR
+from config import RATINGS_DIR
 
-def get_fixtures_data():
-    filename = os.path.join(FIXTURES_DIR, 'fixtures_data.json')
-    metadata_file = os.path.join(FIXTURES_DIR, 'metadata.json')
-    
-    # Ensure the directory exists
-    os.makedirs(FIXTURES_DIR, exist_ok=True)
-    
-    # Fetch the current date in 'YYYY-MM-DD' format
-    current_date = datetime.now().strftime('%Y-%m-%d')
-    
-    # Function to check if the data is up to date and not empty
-    def is_data_valid():
-        if not os.path.isfile(filename) or not os.path.isfile(metadata_file):
-            return False
-        
-        # Check if fixtures_data.json is empty
-        if os.path.getsize(filename) == 0:
-            return False
-        
-        with open(metadata_file, 'r') as f:
-            metadata = json.load(f)
-        stored_date = metadata.get('date')
-        return stored_date == current_date
-    
-    if is_data_valid():
-        with open(filename, 'r') as f:
-            all_fixtures_data = json.load(f)
-    else:
-        all_fixtures_data = fetch_data_with_rate_limit(fetch_fixtures_for_day)
-        
-        # Save the new fixtures data
-        with open(filename, 'w') as f:
-            json.dump(all_fixtures_data, f, indent=4)
-        
-        # Update metadata file with the current date
-        with open(metadata_file, 'w') as f:
-            json.dump({'date': current_date}, f, indent=4)
-        
-        print("Fixtures data fetched and stored successfully")
+STATUSES_TO_SEARCH = ['NS', 'TBD']
+
+TRUSTED_LEAGUES = {
+    'Allsvenskan', 'Ettan - Norra', 'Ettan - S\u00f6dra', 'Superettan', 'Primera B', 'Primeira Liga', 'Eliteserien',  'Eredivisie',
+    'Primera Divisi\u00f3n RFEF - Group 1', 'Primera Divisi\u00f3n RFEF - Group 2', 'Ligue 1', '2. Bundesliga', 'Bundesliga', 'Serie A', 'Serie B',
+    'La Liga', 'Segunda Divisi\u00f3n', 'Championship', 'Premier League'
+}
+
+TRUSTED_COUNTRIES = {
+    'England', 'Spain', 'Italy', 'Germany', 'France', 'Portugal', 'Netherlands', 'Sweden', 'Norway'
+}
+
+def get_fixtures_data(date_str=None):
+    # Fetch the current date in 'YYYY-MM-DD' format unless a day is given
+    current_date = date_str or datetime.now().strftime('%Y-%m-%d')
+    fixtures_cache = get_cache('fixtures')
+
+    all_fixtures_data = fixtures_cache.get(current_date)
+    if all_fixtures_data is None:
+        with fixtures_cache.single_flight(current_date) as all_fixtures_data:
+            if all_fixtures_data is None:
+                if FIXTURES_FETCH_MODE == 'leagues':
+                    all_fixtures_data = fetch_trusted_league_fixtures(current_date)
+                else:
+                    all_fixtures_data = fetch_data_with_rate_limit(fetch_fixtures_for_day, False, current_date)
+                # A day with failed league requests is used for this run but not cached
+                if all_fixtures_data and all_fixtures_data.get('errors'):
+                    return all_fixtures_data
+                if fixtures_cache.set(current_date, all_fixtures_data):
+                    print("Fixtures data fetched and stored successfully")
     
     return all_fixtures_data
 
+def get_trusted_leagues(leagues=TRUSTED_LEAGUES, countries=TRUSTED_COUNTRIES):
+    """
+    Resolve the trusted league names to (league_id, season) pairs using the
+    cached list of current leagues. A name only counts in a trusted country,
+    since names like 'Serie A' or 'Premier League' exist in several.
+    """
+    leagues_cache = get_cache('leagues')
+    current_leagues = leagues_cache.get('current')
+    if current_leagues is None:
+        with leagues_cache.single_flight('current') as current_leagues:
+            if current_leagues is None:
+                current_leagues = fetch_data_with_rate_limit(fetch_current_leagues)
+                if leagues_cache.set('current', current_leagues):
+                    print("League list fetched and stored successfully")
+    if not current_leagues:
+        return []
+
+    trusted = []
+    for entry in current_leagues.get('response', []):
+        if entry['league']['name'] not in leagues or entry['country']['name'] not in countries:
+            continue
+        seasons = [season['year'] for season in entry.get('seasons', []) if season.get('current')]
+        if seasons:
+            trusted.append((entry['league']['id'], seasons[0]))
+    return trusted
+
+def fetch_trusted_league_fixtures(date_str):
+    """
+    Fetch a day's fixtures of the trusted leagues only, one league+season+date
+    request per league, and merge them into the shape of a /fixtures?date= response.
+
+    :return: Merged payload; leagues that could not be fetched are listed in 'errors'.
+    """
+    trusted_leagues = get_trusted_leagues()
+    if not trusted_leagues:
+        print("No trusted leagues found in the league list.")
+        return None
+
+    def fetch_league(league):
+        league_id, season = league
+        return fetch_data_with_rate_limit(fetch_league_fixtures_for_day, league_id, season, date_str)
+
+    fixtures = []
+    errors = []
+    for (league_id, season), league_fixtures in fetch_concurrently(fetch_league, trusted_leagues):
+        if league_fixtures is None:
+            print(f"Could not fetch fixtures of league {league_id} for {date_str}.")
+            errors.append(f"league {league_id}")
+            continue
+        fixtures.extend(league_fixtures['response'])
+
+    print(f"Fetched {len(fixtures)} fixtures from {len(trusted_leagues)} trusted leagues")
+    return {'response': fixtures, 'errors': errors}
+
 def get_fixture(fixture_id):
     """
     Fetch the fixture score for a specific fixture ID.
     Fetches from local storage or an external API if data is missing or outdated.
     """
-    filename = os.path.join(FIXTURES_DIR, f'fixture_{fixture_id}_score.json')
-    metadata_file = os.path.join(FIXTURES_DIR, f'metadata_{fixture_id}.json')
-    
-    os.makedirs(FIXTURES_DIR, exist_ok=True)
-    
-    current_date = datetime.now().strftime('%Y-%m-%d')
-    
-    def is_data_valid():
-        if not os.path.isfile(filename) or not os.path.isfile(metadata_file):
-            return False
-        
-        # Check if the score file is empty
-        if os.path.getsize(filename) == 0:
-            return False
-        
-        with open(metadata_file, 'r') as f:
-            metadata = json.load(f)
-        stored_date = metadata.get('date')
-        return stored_date == current_date
-    
-    if is_data_valid():
-        with open(filename, 'r') as f:
-            fixture_score_data = json.load(f)
-    else:
-        fixture_score_data = fetch_data_with_rate_limit(fetch_fixture, fixture_id)
-        
-        with open(filename, 'w') as f:
-            json.dump(fixture_score_data, f, indent=4)
-        
-        # Update metadata file with the current date
-        with open(metadata_file, 'w') as f:
-            json.dump({'date': current_date}, f, indent=4)
-        
-        print(f"Fixture score data for fixture {fixture_id} fetched and stored successfully")
+    fixture_cache = get_cache('fixture')
+
+    fixture_score_data = fixture_cache.get(fixture_id)
+    if fixture_score_data is None:
+        with fixture_cache.single_flight(fixture_id) as fixture_score_data:
+            if fixture_score_data is None:
+                fixture_score_data = fetch_data_with_rate_limit(fetch_fixture, fixture_id)
+                if fixture_cache.set(fixture_id, fixture_score_data):
+                    print(f"Fixture score data for fixture {fixture_id} fetched and stored successfully")
     
     return fixture_score_data
 
+def get_fixture_team_ids(fixture_id):
+    """Return the (home, away) team ids of a fixture, (None, None) when it cannot be fetched."""
+    fixture_data = get_fixture(fixture_id)
+    if not fixture_data:
+        return None, None
+    return fixture_data['teams']['home']['id'], fixture_data['teams']['away']['id']
+
+def get_fixtures_by_ids(fixture_ids, refetch_unfinished=True):
+    """
+    Fetch many fixtures with as few API calls as possible.
+
+    Fixtures are served from the per-fixture cache where present; the rest are
+    requested MAX_FIXTURE_IDS_PER_REQUEST at a time and each fixture of a
+    response is stored in the per-fixture cache.
+
+    :param fixture_ids: Fixture IDs to look up.
+    :param refetch_unfinished: Fetch cached fixtures again when they have no final score yet.
+    :return: Dictionary of fixture ID -> fixture data for every fixture found.
+    """
+    fixture_cache = get_cache('fixture')
+    fixtures = {}
+    missing_ids = []
+    for fixture_id in dict.fromkeys(fixture_ids):
+        fixture_data = fixture_cache.get(fixture_id)
+        if fixture_data is None or (refetch_unfinished and fixture_data['score']['fulltime']['home'] is None):
+            missing_ids.append(fixture_id)
+        else:
+            fixtures[fixture_id] = fixture_data
+
+    for start in range(0, len(missing_ids), MAX_FIXTURE_IDS_PER_REQUEST):
+        chunk = missing_ids[start:start + MAX_FIXTURE_IDS_PER_REQUEST]
+        fetched_fixtures = fetch_data_with_rate_limit(fetch_fixtures_by_ids, chunk)
+        if fetched_fixtures is None:
+            print(f"Could not fetch fixtures {', '.join(str(fixture_id) for fixture_id in chunk)}.")
+            continue
+
+        with batch_writes():
+            for fixture_data in fetched_fixtures:
+                fixture_id = fixture_data['fixture']['id']
+                fixture_cache.set(fixture_id, fixture_data)
+                fixtures[fixture_id] = fixture_data
+        print(f"Fetched {len(fetched_fixtures)} of {len(chunk)} fixtures in one request")
+
+    return fixtures
+
 def filter_fixtures(all_fixtures, statuses, countries):
     """
     Filters fixtures based on provided statuses and countries.
@@ -114,73 +189,254 @@ def filter_fixtures(all_fixtures, statuses, countries):
         return filtered_fixtures
 
     for fixture in all_fixtures:
-        if 'league' not in fixture or 'fixture' not in fixture:
-            print(f"Fixture missing league or fixture data: {fixture}")
-            continue
-        
-        league_country = fixture['league'].get('country', '')
-
-        if league_country not in countries:
-            continue
-        
-        if 'status' not in fixture['fixture']:
-            print(f"Fixture missing status data: {fixture}")
-            continue
-        
-        status_short = fixture['fixture']['status']['short']
-        if status_short in statuses:
+        if fixture_matches(fixture, statuses, countries):
             filtered_fixtures.append(fixture)
 
     return filtered_fixtures
 
+def fixture_matches(fixture, statuses, countries):
+    """Whether a single fixture passes the status and country filter of filter_fixtures."""
+    if 'league' not in fixture or 'fixture' not in fixture:
+        print(f"Fixture missing league or fixture data: {fixture}")
+        return False
+
+    league_country = fixture['league'].get('country', '')
+
+    if league_country not in countries:
+        return False
+
+    if 'status' not in fixture['fixture']:
+        print(f"Fixture missing status data: {fixture}")
+        return False
+
+    return fixture['fixture']['status']['short'] in statuses
+
+def stream_fixtures(statuses, countries, date_str=None, offline=False):
+    """
+    Yield the fixtures of a day that pass the status/country filter, parsing the
+    cached /fixtures?date= payload incrementally so only one fixture is held in
+    memory at a time. The day's payload is fetched and stored undecoded on a miss.
+
+    :param statuses: Statuses to include (e.g., ['NS', 'TBD']).
+    :param countries: Countries to include.
+    :param date_str: Day in 'YYYY-MM-DD' format, today by default.
+    :param offline: Only read cached data, however old it is; never fetch.
+    """
+    date_str = date_str or datetime.now().strftime('%Y-%m-%d')
+    fixtures_cache = get_cache('fixtures')
+
+    stream = fixtures_cache.open_stream(date_str, ignore_ttl=offline)
+    if stream is None:
+        if offline:
+            return
+        if FIXTURES_FETCH_MODE == 'leagues':
+            # Already limited to the trusted leagues, so there is little to stream
+            yield from filter_fixtures(get_fixtures_data(date_str), statuses, countries)
+            return
+        with fixtures_cache.single_flight(date_str, recheck=False):
+            # Another run may have stored the day while this one waited
+            stream = fixtures_cache.open_stream(date_str)
+            if stream is None:
+                body = fetch_data_with_rate_limit(fetch_fixtures_for_day, True, date_str)
+                if body is None:
+                    return
+                try:
+                    envelope, has_fixtures = read_envelope(io.StringIO(body))
+                except ValueError as e:
+                    print(f"Error parsing fixtures data for {date_str}: {e}")
+                    return
+                # A failed or empty day is used for this run but not cached
+                if envelope.get('errors') or not has_fixtures:
+                    print(f"Fixtures data for {date_str} not cached: {envelope.get('errors') or 'no fixtures returned'}")
+                    stream = io.StringIO(body)
+                else:
+                    fixtures_cache.set_raw(date_str, body)
+                    print("Fixtures data fetched and stored successfully")
+                    # Read it back from the cache so the raw body can be released
+                    del body
+                    stream = fixtures_cache.open_stream(date_str, ignore_ttl=True)
+        if stream is None:
+            return
+
+    with stream:
+        try:
+            for fixture in iter_array_items(stream):
+                if fixture_matches(fixture, statuses, countries):
+                    yield fixture
+        except ValueError as e:
+            print(f"Error parsing fixtures data for {date_str}: {e}")
+
+def get_rated_fixture_id(fixture_info):
+    return fixture_info.fixture_id
+
 def remove_duplicates(game_list):
-    seen = set()
-    unique_games = []
+    """Keep one entry per fixture id; a later rating of the same fixture replaces the earlier one."""
+    unique_games = {}
     for game in game_list:
-        game_str = json.dumps(game, sort_keys=True)
-        if game_str not in seen:
-            seen.add(game_str)
-            unique_games.append(game)
-    return unique_games
-
-def load_rated_fixtures():
-    latest_file = find_latest_rated_fixtures(RATINGS_DIR)
-    if latest_file is None:
-        return {
-            'one_star_games': [],
-            'two_star_games': [],
-            'three_star_games': [],
-            'no_star_games': []
-        }
+        unique_games[get_rated_fixture_id(game)] = game
+    return list(unique_games.values())
 
-    file_path = os.path.join(RATINGS_DIR, latest_file)
-    with open(file_path, 'r') as file:
-        data = json.load(file)
-        return {
-            'one_star_games': remove_duplicates(data.get('one_star_games', [])),
-            'two_star_games': remove_duplicates(data.get('two_star_games', [])),
-            'three_star_games': remove_duplicates(data.get('three_star_games', [])),
-            'no_star_games': remove_duplicates(data.get('no_star_games', []))
-        }
+RATING_TIERS = ('one_star_games', 'two_star_games', 'three_star_games', 'no_star_games')
 
-def save_rated_fixtures(one_star_games, two_star_games, three_star_games, no_star_games):
-    date_str = datetime.now().strftime('%Y-%m-%d')
-    file_path = os.path.join(RATINGS_DIR, f'rated_fixtures_{date_str}.json')
-    
-    rated_fixtures = load_rated_fixtures()
+def rated_fixtures_paths(date_str=None):
+    """Return the (snapshot, journal, index) paths of the rated fixtures for a day."""
+    date_str = date_str or datetime.now().strftime('%Y-%m-%d')
+    snapshot_path = os.path.join(RATINGS_DIR, f'rated_fixtures_{date_str}.json')
+    journal_path = os.path.join(RATINGS_DIR, f'rated_fixtures_{date_str}.jsonl')
+    index_path = os.path.join(RATINGS_DIR, f'rated_fixtures_{date_str}.index.json')
+    return snapshot_path, journal_path, index_path
+
+def read_rated_fixtures_journal(journal_path):
+    """Yield journal entries ({'fixture_id', 'tier', 'rated_at', 'fixture'}), ignoring a torn last line."""
+    if not os.path.isfile(journal_path):
+        return
+    with open(journal_path, 'r') as file:
+        for line in file:
+            try:
+                yield decode(line)
+            except ValueError:
+                continue
+
+# Rated-fixture indexes by date: fixture id -> {'tier': ..., 'rated_at': ...}
+_rated_indexes = {}
+
+def load_rated_fixture_index(date_str=None):
+    """
+    Return the rated-fixture index of a day (today by default) keyed by fixture id.
+
+    The index is read from disk once per day and kept up to date in memory by
+    append_rated_fixture, so "already rated?" checks and tier lookups are plain
+    dictionary lookups.
+    """
+    date_str = date_str or datetime.now().strftime('%Y-%m-%d')
+    if date_str in _rated_indexes:
+        return _rated_indexes[date_str]
+
+    snapshot_path, journal_path, index_path = rated_fixtures_paths(date_str)
+    # Read the journal before the index: a compaction in between then only repeats entries
+    journal = list(read_rated_fixtures_journal(journal_path))
+    entries = {}
+    if os.path.isfile(index_path):
+        entries = {int(fixture_id): entry for fixture_id, entry in load_file(index_path).items()}
+    elif os.path.isfile(snapshot_path):
+        # Snapshot written before the index existed
+        data = load_file(snapshot_path)
+        for tier in RATING_TIERS:
+            for value in data.get(tier, []):
+                entries[RatingRecord.from_json(value).fixture_id] = {'tier': tier, 'rated_at': None}
+
+    for entry in journal:
+        entries[entry['fixture_id']] = {'tier': entry['tier'], 'rated_at': entry['rated_at']}
 
-    rated_fixtures['one_star_games'] = remove_duplicates(rated_fixtures.get('one_star_games', []) + one_star_games)
-    rated_fixtures['two_star_games'] = remove_duplicates(rated_fixtures.get('two_star_games', []) + two_star_games)
-    rated_fixtures['three_star_games'] = remove_duplicates(rated_fixtures.get('three_star_games', []) + three_star_games)
-    rated_fixtures['no_star_games'] = remove_duplicates(rated_fixtures.get('no_star_games', []) + no_star_games)
+    _rated_indexes[date_str] = entries
+    return entries
 
-    rated_fixtures['one_star_games'].sort(key=lambda x: str(x))
-    rated_fixtures['two_star_games'].sort(key=lambda x: str(x))
-    rated_fixtures['three_star_games'].sort(key=lambda x: str(x))
-    rated_fixtures['no_star_games'].sort(key=lambda x: str(x))
+def forget_rated_fixture_index(date_str=None):
+    """Drop a day's in-memory index so the next lookup reads what other processes wrote."""
+    _rated_indexes.pop(date_str or datetime.now().strftime('%Y-%m-%d'), None)
+
+def rated_fixtures_version(date_str=None):
+    """
+    Modification times of a day's snapshot and journal. The value changes
+    whenever any process rates a fixture of that day or compacts its journal.
+    """
+    snapshot_path, journal_path, _ = rated_fixtures_paths(date_str)
+    return tuple(os.stat(path).st_mtime_ns if os.path.isfile(path) else None for path in (snapshot_path, journal_path))
 
-    with open(file_path, 'w') as file:
-        json.dump(rated_fixtures, file, indent=4)
+def is_fixture_rated(fixture_id, date_str=None):
+    return fixture_id in load_rated_fixture_index(date_str)
+
+def get_fixture_rating_tier(fixture_id, date_str=None):
+    entry = load_rated_fixture_index(date_str).get(fixture_id)
+    return entry['tier'] if entry else None
+
+def load_rated_fixtures(date_str=None):
+    """Return a day's (the latest by default) rated fixtures as lists of RatingRecord per tier."""
+    rated_fixtures = {tier: [] for tier in RATING_TIERS}
+    snapshot_path, journal_path, _ = rated_fixtures_paths(date_str)
+    # Read the journal before the snapshot: a compaction in between then only repeats entries
+    journal = list(read_rated_fixtures_journal(journal_path))
+
+    if date_str is None:
+        latest_file = find_latest_rated_fixtures(RATINGS_DIR)
+        file_path = os.path.join(RATINGS_DIR, latest_file) if latest_file else None
+    else:
+        file_path = snapshot_path if os.path.isfile(snapshot_path) else None
+
+    if file_path is not None:
+        data = load_file(file_path)
+        for tier in RATING_TIERS:
+            rated_fixtures[tier] = [RatingRecord.from_json(value) for value in data.get(tier, [])]
+
+    # Ratings appended since the last compaction
+    for entry in journal:
+        rated_fixtures[entry['tier']].append(RatingRecord.from_json(entry['fixture']))
+
+    # A fixture only belongs to the tier the index holds for it
+    index = load_rated_fixture_index(date_str)
+    return {
+        tier: remove_duplicates([
+            game for game in games
+            if index.get(get_rated_fixture_id(game), {}).get('tier', tier) == tier
+        ])
+        for tier, games in rated_fixtures.items()
+    }
+
+def append_rated_fixture(tier, fixture_info, date_str=None):
+    """
+    Record one rated fixture by appending a line to the day's journal (today by default).
+
+    The journal is merged into the daily snapshot by compact_rated_fixtures,
+    which callers run once when they have finished rating.
+    """
+    index = load_rated_fixture_index(date_str)
+    fixture_id = get_rated_fixture_id(fixture_info)
+    rated_at = datetime.now().isoformat(timespec='seconds')
+
+    _, journal_path, _ = rated_fixtures_paths(date_str)
+    os.makedirs(RATINGS_DIR, exist_ok=True)
+    with _journal_lock(journal_path), open(journal_path, 'a') as file:
+        entry = {'fixture_id': fixture_id, 'tier': tier, 'rated_at': rated_at, 'fixture': fixture_info.to_json()}
+        # Journal lines stay uncompressed so appends need no rewrite
+        file.write(encode(entry).decode('utf-8') + '\n')
+    index[fixture_id] = {'tier': tier, 'rated_at': rated_at}
+
+def _journal_lock(journal_path):
+    """Lock shared by every process appending to or compacting a day's journal."""
+    return file_lock(os.path.join(RATINGS_DIR, '.locks', f'{os.path.basename(journal_path)}.lock'))
+
+def compact_rated_fixtures(date_str=None):
+    """
+    Merge a day's journal into its snapshot and index files atomically and empty the journal.
+
+    The journal is swapped for an empty file rather than deleted, so a process
+    reading it at the same time sees either every entry or none.
+    """
+    date_str = date_str or datetime.now().strftime('%Y-%m-%d')
+    snapshot_path, journal_path, index_path = rated_fixtures_paths(date_str)
+
+    with _journal_lock(journal_path):
+        if not os.path.isfile(journal_path) or os.path.getsize(journal_path) == 0:
+            return
+
+        # Other processes may have appended too; rebuild the index from disk
+        _rated_indexes.pop(date_str, None)
+        rated_fixtures = load_rated_fixtures(date_str)
+        snapshot = {
+            tier: [fixture_info.to_json() for fixture_info in sorted(rated_fixtures[tier], key=get_rated_fixture_id)]
+            for tier in RATING_TIERS
+        }
+
+        dump_file_atomic(snapshot_path, snapshot)
+        dump_file_atomic(index_path, load_rated_fixture_index(date_str))
+        write_file_atomic(journal_path, b'')
+
+def save_rated_fixtures(one_star_games, two_star_games, three_star_games, no_star_games):
+    """Add whole lists of rated fixtures to today's ratings and compact straight away."""
+    for tier, games in zip(RATING_TIERS, (one_star_games, two_star_games, three_star_games, no_star_games)):
+        for fixture_info in games:
+            append_rated_fixture(tier, fixture_info)
+    compact_rated_fixtures()
 
 def get_fixture_score(fixture_id):
     fixture_data = get_fixture(fixture_id)
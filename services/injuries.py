@@ -1,29 +1,48 @@
-import json
-import os 
-
-from helpers.date_helper import is_data_up_to_date
 from fetchers import fetch_injuries_for_fixture
-
-from config import INJURIES_DIR
+from services.players import get_key_players_by_team, get_player_data, split_by_team
+from services.fixtures import get_fixture_team_ids
+from helpers.data.cache import get_cache
+from helpers.data.fetch_data import fetch_data_with_rate_limit
 
 def get_injury_data(fixture_id):
-    filename = os.path.join(INJURIES_DIR, f'injuries_data_{fixture_id}.json')
-
-    if is_data_up_to_date(filename):
-        with open(filename, 'r') as f:
-            injuries = json.load(f)
-    else:
-        injuries = fetch_injuries_for_fixture(fixture_id)
-        with open(filename, 'w') as f:
-            json.dump(injuries, f, indent=4)
-        print("Injury data fetched and stored successfully.")
-    
-    # Extract home and away team injuries
-    home_team_injuries = injuries.get('home_team_injuries', [])
-    away_team_injuries = injuries.get('away_team_injuries', [])
+    injuries_cache = get_cache('injuries')
+
+    injuries = injuries_cache.get(fixture_id)
+    if injuries is None:
+        with injuries_cache.single_flight(fixture_id) as injuries:
+            if injuries is None:
+                injuries = fetch_data_with_rate_limit(fetch_injuries_for_fixture, fixture_id)
+                injuries_cache.set(fixture_id, injuries)
+                print("Injury data fetched and stored successfully.")
+
+    injuries = injuries or {}
+
+    # Injuries of both teams come in one list, each with its team
+    home_team_id, away_team_id = get_fixture_team_ids(fixture_id)
+    home_team_injuries, away_team_injuries = split_by_team(injuries.get('response', []), home_team_id, away_team_id)
 
     return home_team_injuries, away_team_injuries
 
+def get_key_player_injuries(fixture_id):
+    """
+    Injuries of the key players of both teams in a fixture.
+
+    :return: (home_injuries, away_injuries) lists of full injury entries.
+    """
+    # Fetch the player data for the home and away teams and determine the key players
+    players_home, players_away = get_player_data(fixture_id)
+    key_players_home, key_players_away = get_key_players_by_team(players_home, players_away)
+
+    # Extract the player IDs from the key players for filtering injuries
+    key_player_ids_home = {player['id'] for player in key_players_home}
+    key_player_ids_away = {player['id'] for player in key_players_away}
+
+    # Filter injuries to include only key players' injuries
+    home_injuries, away_injuries = get_injury_data(fixture_id)
+    key_home_injuries = filter_injuries_by_player_ids({'response': home_injuries}, key_player_ids_home)
+    key_away_injuries = filter_injuries_by_player_ids({'response': away_injuries}, key_player_ids_away)
+    return key_home_injuries, key_away_injuries
+
 def filter_injuries_by_player_ids(injury_data, player_ids):
     # Filter and return injury data for players whose IDs are in player_ids
     injured_players = []
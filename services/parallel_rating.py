@@ -0,0 +1,133 @@
+import os
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from services.fixtures import (
+    STATUSES_TO_SEARCH, TRUSTED_COUNTRIES, stream_fixtures, load_rated_fixture_index,
+    append_rated_fixture, compact_rated_fixtures
+)
+from services.standings import StandingsIndex, extract_team_info
+from services.rating import screen_fixture, rate_candidate, skipped_fixture_info
+from helpers.data.cache import get_cache
+
+def load_cached_standings_index(league_id):
+    """Build a league's StandingsIndex from cached data only, however old it is."""
+    index_data = get_cache('standings_index').get(league_id, ignore_ttl=True)
+    if index_data is not None:
+        return StandingsIndex(index_data['teams'])
+
+    standings_data = get_cache('standings').get(league_id, ignore_ttl=True)
+    if standings_data is None:
+        return None
+    return extract_team_info(standings_data)
+
+def load_cached_prediction(fixture_id):
+    predictions = get_cache('predictions').get(fixture_id, ignore_ttl=True)
+    if predictions and predictions.get('response'):
+        return predictions['response'][0]
+    return {}
+
+def rate_partition(partition):
+    """
+    Rate one partition of fixtures from cached standings and predictions.
+
+    Runs in a worker process and never calls the API.
+
+    :param partition: (date_str, league_id, fixtures) tuple.
+    :return: (date_str, [(games_list, fixture_info), ...]) for the rated-fixtures store.
+    """
+    date_str, league_id, fixtures = partition
+    results = []
+
+    team_info = load_cached_standings_index(league_id)
+    for fixture_data in fixtures:
+        if not team_info:
+            results.append(('no_star_games', skipped_fixture_info(fixture_data, "No standings data available")))
+            continue
+
+        skipped_info = screen_fixture(fixture_data, team_info)
+        if skipped_info is not None:
+            results.append(('no_star_games', skipped_info))
+            continue
+
+        predictions = load_cached_prediction(fixture_data['fixture']['id'])
+        games_list, fixture_info = rate_candidate(fixture_data, team_info, predictions)
+        if games_list:
+            results.append((games_list, fixture_info))
+
+    return date_str, results
+
+def partition_fixtures(fixtures_by_date, skip_rated=True):
+    """
+    Split the fixtures of each date into one partition per league.
+
+    :param fixtures_by_date: Dictionary of date string -> list of fixtures.
+    :param skip_rated: Leave out fixtures already in that day's rated-fixture index.
+    :return: List of (date_str, league_id, fixtures) partitions.
+    """
+    partitions = {}
+    for date_str, fixtures in fixtures_by_date.items():
+        rated_index = load_rated_fixture_index(date_str) if skip_rated else {}
+        for fixture_data in fixtures:
+            if fixture_data['fixture']['id'] in rated_index:
+                continue
+            key = (date_str, fixture_data['league']['id'])
+            partitions.setdefault(key, []).append(fixture_data)
+    return [(date_str, league_id, fixtures) for (date_str, league_id), fixtures in partitions.items()]
+
+def rate_fixtures_in_parallel(fixtures_by_date, workers=None, skip_rated=True):
+    """
+    Rate fixtures for one or more days in a process pool and merge the results
+    into the rated-fixtures store.
+
+    Work is partitioned by date and league so each worker loads a league's
+    standings once. Only the parent process writes to the store.
+
+    :param fixtures_by_date: Dictionary of date string -> list of fixtures.
+    :param workers: Number of worker processes (defaults to the CPU count).
+    :param skip_rated: Leave out fixtures that were already rated.
+    :return: Number of fixtures stored per date.
+    """
+    partitions = partition_fixtures(fixtures_by_date, skip_rated)
+    stored = {date_str: 0 for date_str in fixtures_by_date}
+    if not partitions:
+        return stored
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=min(workers, len(partitions))) as executor:
+        futures = [executor.submit(rate_partition, partition) for partition in partitions]
+        for future in as_completed(futures):
+            date_str, results = future.result()
+            for games_list, fixture_info in results:
+                append_rated_fixture(games_list, fixture_info, date_str)
+            stored[date_str] += len(results)
+
+    for date_str in fixtures_by_date:
+        compact_rated_fixtures(date_str)
+    return stored
+
+def load_cached_fixtures_for_dates(dates, statuses=STATUSES_TO_SEARCH, countries=TRUSTED_COUNTRIES):
+    """Read the cached fixtures of each date and apply the usual status/country filter."""
+    fixtures_by_date = {}
+    for date_str in dates:
+        fixtures = list(stream_fixtures(statuses, countries, date_str, offline=True))
+        if not fixtures:
+            print(f"No cached fixtures to rate for {date_str}. Skipping that date.")
+            continue
+        fixtures_by_date[date_str] = fixtures
+    return fixtures_by_date
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Re-rate cached fixtures for one or more dates in parallel.")
+    parser.add_argument('dates', nargs='+', help="Dates in YYYY-MM-DD format")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--rerate', action='store_true', help="Rate fixtures again that were already rated")
+    args = parser.parse_args()
+
+    stored = rate_fixtures_in_parallel(
+        load_cached_fixtures_for_dates(args.dates), workers=args.workers, skip_rated=not args.rerate
+    )
+    for date_str, count in stored.items():
+        print(f"{date_str}: {count} fixtures stored")
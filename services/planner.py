@@ -0,0 +1,105 @@
+from services.predictions import (
+    adjust_points_based_on_rank, adjust_points_based_on_points_difference, adjust_points_based_on_goals_diff,
+    adjust_points_based_on_form
+)
+from helpers.data.cache import get_cache
+from helpers.data.find_team_data import find_team_data_by_name
+from helpers.rate_limiter import get_rate_limiter
+from helpers.settings import (
+    RATING_PARAMETERS, PREDICTION_BUDGET, PREDICTION_QUOTA_RESERVE, PREDICTION_COLD_START_BUDGET
+)
+
+def standings_points(home_team_data, away_team_data, params=None):
+    """
+    The part of calculate_fixture_points that only needs the standings: rank,
+    points and goal difference, and form. The rest needs the predictions call.
+
+    :return: (home_team_points, away_team_points)
+    """
+    rank_difference = away_team_data.get('rank', 0) - home_team_data.get('rank', 0)
+    home_points = home_team_data.get('points') or 0
+    away_points = away_team_data.get('points') or 0
+    home_form = home_team_data.get('form') or ''
+    away_form = away_team_data.get('form') or ''
+
+    home_team_points = (
+        adjust_points_based_on_rank(rank_difference, is_home=True, params=params)
+        + adjust_points_based_on_points_difference(home_points, away_points, params=params)
+        + adjust_points_based_on_goals_diff(home_team_data.get('goalsDiff') or 0)
+        + adjust_points_based_on_form(home_form, is_home=True)
+    )
+    away_team_points = (
+        adjust_points_based_on_rank(-rank_difference, is_home=False, params=params)
+        + adjust_points_based_on_points_difference(away_points, home_points, params=params)
+        + adjust_points_based_on_goals_diff(away_team_data.get('goalsDiff') or 0, is_home=False)
+        + adjust_points_based_on_form(away_form, is_home=False)
+    )
+    return home_team_points, away_team_points
+
+def score_candidate(fixture_data, team_info, params=None):
+    """
+    Estimate how promising a fixture is before paying for its predictions.
+
+    The points gap from the standings alone is the share of the final rating
+    that is already known, so a bigger gap means a better chance of a high
+    star rating. The rank gap breaks ties.
+
+    :return: (points_gap, rank_gap) tuple; larger sorts first.
+    """
+    home_team = fixture_data['teams']['home']
+    away_team = fixture_data['teams']['away']
+    home_team_data = find_team_data_by_name(home_team['name'], team_info, home_team.get('id'))
+    away_team_data = find_team_data_by_name(away_team['name'], team_info, away_team.get('id'))
+    if home_team_data is None or away_team_data is None:
+        return 0, 0
+
+    home_team_points, away_team_points = standings_points(home_team_data, away_team_data, params)
+    rank_gap = abs((home_team_data.get('rank') or 0) - (away_team_data.get('rank') or 0))
+    return abs(home_team_points - away_team_points), rank_gap
+
+def prediction_budget(budget=PREDICTION_BUDGET, reserve=PREDICTION_QUOTA_RESERVE,
+                      cold_start_budget=PREDICTION_COLD_START_BUDGET):
+    """
+    Number of prediction requests this run may spend: the configured budget,
+    further limited by the daily quota the API last reported minus a reserve
+    kept for injuries, players and bet settlement. Until the API has reported
+    the quota, cold_start_budget stands in for it. None means unlimited.
+    """
+    daily_remaining = get_rate_limiter().daily_remaining
+    if daily_remaining is not None:
+        quota_left = max(0, daily_remaining - reserve)
+    else:
+        quota_left = cold_start_budget
+    if quota_left is not None:
+        budget = quota_left if budget is None else min(budget, quota_left)
+    return budget
+
+def plan_prediction_fetches(candidates, budget=None, params=None):
+    """
+    Order prediction fetches by expected value and cut them off at the budget.
+
+    Fixtures whose predictions are already cached cost nothing and always come
+    first. The others are ranked with score_candidate and only as many as the
+    budget allows are planned.
+
+    :param candidates: Dictionary of fixture ID -> (fixture_data, team_info).
+    :param budget: Maximum number of uncached predictions to fetch (None for no limit).
+    :param params: Rating parameters, RATING_PARAMETERS by default.
+    :return: (planned, deferred) lists of fixture IDs, planned in fetch order.
+    """
+    params = params or RATING_PARAMETERS
+    predictions_cache = get_cache('predictions')
+
+    cached = []
+    scored = []
+    for fixture_id, (fixture_data, team_info) in candidates.items():
+        if predictions_cache.get(fixture_id) is not None:
+            cached.append(fixture_id)
+        else:
+            scored.append((score_candidate(fixture_data, team_info, params), fixture_id))
+
+    scored.sort(key=lambda item: item[0], reverse=True)
+    ranked = [fixture_id for _, fixture_id in scored]
+    if budget is None:
+        return cached + ranked, []
+    return cached + ranked[:budget], ranked[budget:]
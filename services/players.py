@@ -1,26 +1,37 @@
-import json
-import os
-
-from helpers.date_helper import is_data_up_to_date
 from fetchers import fetch_players_for_fixture
+from services.fixtures import get_fixture_team_ids
+from helpers.data.cache import get_cache
+from helpers.data.fetch_data import fetch_data_with_rate_limit
 
-from config import PLAYERS_DIR
+def split_by_team(entries, home_team_id, away_team_id):
+    """Split the entries of a players or injuries response into (home, away) lists by their team id."""
+    home_entries, away_entries = [], []
+    for entry in entries:
+        team_id = entry.get('team', {}).get('id')
+        if team_id == home_team_id:
+            home_entries.append(entry)
+        elif team_id == away_team_id:
+            away_entries.append(entry)
+    return home_entries, away_entries
 
 def get_player_data(fixture_id):
-    filename = os.path.join(PLAYERS_DIR, f'players_data_{fixture_id}.json')
-
-    if is_data_up_to_date(filename):
-        with open(filename, 'r') as f:
-            players = json.load(f)
-    else:
-        print(f"Fetching new player data for fixture {fixture_id}...")
-        players = fetch_players_for_fixture(fixture_id)
-        with open(filename, 'w') as f:
-            json.dump(players, f, indent=4)
-    
-    # Extract home and away team players
-    home_team_players = players.get('home_team_players', [])
-    away_team_players = players.get('away_team_players', [])
+    players_cache = get_cache('players')
+
+    players = players_cache.get(fixture_id)
+    if players is None:
+        with players_cache.single_flight(fixture_id) as players:
+            if players is None:
+                print(f"Fetching new player data for fixture {fixture_id}...")
+                players = fetch_data_with_rate_limit(fetch_players_for_fixture, fixture_id)
+                players_cache.set(fixture_id, players)
+
+    players = players or {}
+
+    # The response holds one entry per team with its players
+    home_team_id, away_team_id = get_fixture_team_ids(fixture_id)
+    home_teams, away_teams = split_by_team(players.get('response', []), home_team_id, away_team_id)
+    home_team_players = [player for team in home_teams for player in team.get('players', [])]
+    away_team_players = [player for team in away_teams for player in team.get('players', [])]
 
     return home_team_players, away_team_players
 
@@ -33,7 +44,10 @@ def get_key_players_by_team(home_team_players, away_team_players, rating_thresho
         for player in players:
             player_id = player['player']['id']
             player_name = player['player']['name']
-            player_rating = float(player['statistics'][0]['games']['rating']) if 'rating' in player['statistics'][0]['games'] else 0.0
+            statistics = player.get('statistics') or [{}]
+            # The rating is a string, or null for players who did not play
+            rating = statistics[0].get('games', {}).get('rating')
+            player_rating = float(rating) if rating else 0.0
             
             if player_rating >= rating_threshold:
                 player_info = {
@@ -1,45 +1,26 @@
-import json
-import os
 import logging
 
 from fetchers import fetch_match_predictions
+from helpers.data.cache import get_cache
 from helpers.data.fetch_data import fetch_data_with_rate_limit
-
-from config import PREDICTIONS_DIR
+from helpers.settings import RATING_PARAMETERS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
-def is_data_up_to_date(filename):
-    """
-    Check if the data in the file is valid and not empty.
-    
-    :param filename: Path to the JSON file.
-    :return: True if data is valid and not empty, False otherwise.
-    """
-    if os.path.exists(filename):
-        try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
-                return bool(data and 'response' in data and isinstance(data['response'], list) and len(data['response']) > 0)
-        except (FileNotFoundError, KeyError, IndexError, ValueError, json.JSONDecodeError) as e:
-            logging.error(f"Error reading data from {filename}: {e}")
-            return False
-    return False
-
 def get_fixture_prediction(fixture_id):
-    filename = os.path.join(PREDICTIONS_DIR, f'predictions_data_{fixture_id}.json')
+    predictions_cache = get_cache('predictions')
 
-    if is_data_up_to_date(filename):
-        logging.info(f"Predictions data for fixture {fixture_id} is up to date, loading from file.")
-        with open(filename, 'r') as f:
-            predictions = json.load(f)
+    predictions = predictions_cache.get(fixture_id)
+    if predictions is not None:
+        logging.info(f"Predictions data for fixture {fixture_id} is up to date, loading from cache.")
     else:
-        logging.info(f"Fetching new predictions data for fixture {fixture_id}...")
-        predictions = fetch_data_with_rate_limit(fetch_match_predictions, fixture_id)
-        with open(filename, 'w') as f:
-            json.dump(predictions, f, indent=4)
-        logging.info("Predictions data fetched and stored successfully.")
+        with predictions_cache.single_flight(fixture_id) as predictions:
+            if predictions is None:
+                logging.info(f"Fetching new predictions data for fixture {fixture_id}...")
+                predictions = fetch_data_with_rate_limit(fetch_match_predictions, fixture_id)
+                if predictions_cache.set(fixture_id, predictions):
+                    logging.info("Predictions data fetched and stored successfully.")
     
     if predictions and 'response' in predictions and isinstance(predictions['response'], list) and len(predictions['response']) > 0:
         return predictions['response'][0]
@@ -47,7 +28,84 @@ def get_fixture_prediction(fixture_id):
         logging.warning(f"No predictions available or incorrect format for fixture {fixture_id}.")
         return {}
 
-def rate_fixture(predictions, home_team_data, away_team_data):
+def extract_rating_features(predictions, home_team_data, away_team_data):
+    """
+    Extract the numeric inputs of the rating model for one fixture.
+
+    :return: Dictionary of features, or None when either team has fewer than
+             five recent matches in its form.
+    """
+    predictions_item = predictions.get('predictions', {})
+    teams_item = predictions.get('teams', {})
+    home_team_item = teams_item.get('home', {})
+    away_team_item = teams_item.get('away', {})
+
+    # Convert percentage values to integers
+    percent_home = int(predictions_item.get('percent', {}).get('home', '0').strip('%'))
+    percent_draw = int(predictions_item.get('percent', {}).get('draw', '0').strip('%'))
+    percent_away = int(predictions_item.get('percent', {}).get('away', '0').strip('%'))
+
+    home_form = home_team_item.get('league').get('form', '')
+    away_form = away_team_item.get('league').get('form', '')
+
+    # Ensure form has at least five characters
+    if not home_form or not away_form or len(home_form) < 5 or len(away_form) < 5:
+        return None
+
+    # Calculate win/lose ratios and goal ratios
+    home_team_win_ratio, away_team_win_ratio = get_team_win_lose_ratios(home_team_item, away_team_item)
+    home_team_goal_ratio, away_team_goal_ratio = get_team_goals_ratios(home_team_item, away_team_item)
+
+    return {
+        'percent_home': percent_home,
+        'percent_draw': percent_draw,
+        'percent_away': percent_away,
+        'win_ratio_difference': home_team_win_ratio - away_team_win_ratio,
+        'goal_ratio_difference': home_team_goal_ratio - away_team_goal_ratio,
+        'rank_difference': get_team_rank_difference(home_team_data, away_team_data),
+        'home_points': home_team_data.get('points', 0),
+        'away_points': away_team_data.get('points', 0),
+        'home_goals_diff': home_team_data.get('goalsDiff', 0),
+        'away_goals_diff': away_team_data.get('goalsDiff', 0),
+        'home_form': home_form,
+        'away_form': away_form
+    }
+
+def calculate_fixture_points(features, params=None):
+    """Score one fixture's features and return (home_team_points, away_team_points)."""
+    home_team_points = 0
+    away_team_points = 0
+
+    # Add points based on percentage values
+    home_team_points += calculate_percentage_points(features['percent_home'], features['percent_draw'], params=params)
+    away_team_points += calculate_percentage_points(features['percent_away'], features['percent_draw'], params=params)
+
+    # Adjust points based on the win/lose ratio difference
+    home_team_points += adjust_points_based_on_ratio(features['win_ratio_difference'], is_home=True, params=params)
+    away_team_points += adjust_points_based_on_ratio(-features['win_ratio_difference'], is_home=False, params=params)
+
+    # Adjust points based on the goal ratio difference
+    home_team_points += adjust_points_based_on_goal_ratio(features['goal_ratio_difference'], is_home=True, params=params)
+    away_team_points += adjust_points_based_on_goal_ratio(-features['goal_ratio_difference'], is_home=False, params=params)
+
+    # Adjust points based on rank difference
+    home_team_points += adjust_points_based_on_rank(features['rank_difference'], is_home=True, params=params)
+    away_team_points += adjust_points_based_on_rank(-features['rank_difference'], is_home=False, params=params)
+
+    # Adjust points based on total goals and goals difference
+    home_team_points += adjust_points_based_on_points_difference(features['home_points'], features['away_points'], params=params)
+    away_team_points += adjust_points_based_on_points_difference(features['away_points'], features['home_points'], params=params)
+    
+    home_team_points += adjust_points_based_on_goals_diff(features['home_goals_diff'])
+    away_team_points += adjust_points_based_on_goals_diff(features['away_goals_diff'], is_home=False)
+
+    # Adjust points based on recent form
+    home_team_points += adjust_points_based_on_form(features['home_form'], is_home=True)
+    away_team_points += adjust_points_based_on_form(features['away_form'], is_home=False)
+
+    return home_team_points, away_team_points
+
+def rate_fixture(predictions, home_team_data, away_team_data, params=None):
     """
     Rate a fixture based on its prediction and return the points and rating for home and away teams,
     along with the winning team and comment.
@@ -55,84 +113,30 @@ def rate_fixture(predictions, home_team_data, away_team_data):
     default_comment = "No comments"
     
     try:
-        # Initialize points for the home and away teams
-        home_team_points = 0
-        away_team_points = 0
-
         # Extract prediction data
         predictions_item = predictions.get('predictions', {})
-        teams_item = predictions.get('teams', {})
-        home_team_item = teams_item.get('home', {})
-        away_team_item = teams_item.get('away', {})
-        league_item = predictions.get('league', {})
-
-        # Convert percentage values to integers
-        percent_home = int(predictions_item.get('percent', {}).get('home', '0').strip('%'))
-        percent_draw = int(predictions_item.get('percent', {}).get('draw', '0').strip('%'))
-        percent_away = int(predictions_item.get('percent', {}).get('away', '0').strip('%'))
-
-        home_team_id = int(home_team_item.get('id', 0))
-        away_team_id = int(away_team_item.get('id', 0))
-        league_id = int(league_item.get('id', 0))
 
         predicted_winner_name = predictions_item.get('winner', {}).get('name', 'Unknown')
         home_team_name = home_team_data.get('team_name', 'Unknown')
         away_team_name = away_team_data.get('team_name', 'Unknown')
 
-        home_team_item.get('league').get('form')
-
-        home_form = home_team_item.get('league').get('form', '')
-        away_form = away_team_item.get('league').get('form', '')
-
-        # Ensure form has at least five characters
-        if not home_form or not away_form or len(home_form) < 5 or len(away_form) < 5:
+        features = extract_rating_features(predictions, home_team_data, away_team_data)
+        if features is None:
             return 0, 0, 'no_star', "None", "None", "Not enough recent matches, skipping"
 
-        # Calculate win/lose ratios and goal ratios
-        home_team_win_ratio, away_team_win_ratio = get_team_win_lose_ratios(home_team_item, away_team_item)
-        home_team_goal_ratio, away_team_goal_ratio = get_team_goals_ratios(home_team_item, away_team_item)
-        rank_difference = get_team_rank_difference(home_team_data, away_team_data)
-        win_ratio_difference = home_team_win_ratio - away_team_win_ratio
-        goal_ratio_difference = home_team_goal_ratio - away_team_goal_ratio
-
         # Extract comment and advice
         winner_data = predictions_item.get('winner', {})
         comment = winner_data.get('comment', default_comment)
         advice = predictions.get('advice', default_comment)
         comment = f"{comment} {'| ' if comment and advice else ''}{advice}".strip() or default_comment
 
-        # Add points based on percentage values
-        home_team_points += calculate_percentage_points(percent_home, percent_draw)
-        away_team_points += calculate_percentage_points(percent_away, percent_draw)
-
-        # Adjust points based on the win/lose ratio difference
-        home_team_points += adjust_points_based_on_ratio(win_ratio_difference, is_home=True)
-        away_team_points += adjust_points_based_on_ratio(-win_ratio_difference, is_home=False)
-
-        # Adjust points based on the goal ratio difference
-        home_team_points += adjust_points_based_on_goal_ratio(goal_ratio_difference, is_home=True)
-        away_team_points += adjust_points_based_on_goal_ratio(-goal_ratio_difference, is_home=False)
-
-        # Adjust points based on rank difference
-        home_team_points += adjust_points_based_on_rank(rank_difference, is_home=True)
-        away_team_points += adjust_points_based_on_rank(-rank_difference, is_home=False)
-
-        # Adjust points based on total goals and goals difference
-        home_team_points += adjust_points_based_on_points_difference(home_team_data.get('points', 0), away_team_data.get('points', 0))
-        away_team_points += adjust_points_based_on_points_difference(away_team_data.get('points', 0), home_team_data.get('points', 0))
-        
-        home_team_points += adjust_points_based_on_goals_diff(home_team_data.get('goalsDiff', 0))
-        away_team_points += adjust_points_based_on_goals_diff(away_team_data.get('goalsDiff', 0), is_home=False)
-
-        # Adjust points based on recent form
-        home_team_points += adjust_points_based_on_form(home_form, is_home=True)
-        away_team_points += adjust_points_based_on_form(away_form, is_home=False)
+        home_team_points, away_team_points = calculate_fixture_points(features, params)
 
         # Determine the winning team based on points
         points_winner_name = determine_winner(home_team_points, away_team_points, home_team_name, away_team_name)
 
         # Determine rating
-        rating = determine_rating(home_team_points, away_team_points)
+        rating = determine_rating(home_team_points, away_team_points, params)
 
         logging.info(f"Fixture: {home_team_name} vs {away_team_name}, Home Team Points: {home_team_points}, Away Team Points: {away_team_points}, Comment: {comment}")
         logging.info(f"Predicted Winner: {predicted_winner_name}, Winner in points: {points_winner_name}")
@@ -143,57 +147,62 @@ def rate_fixture(predictions, home_team_data, away_team_data):
         logging.error(f"Error processing predictions: {e}")
         return 0, 0, 'no_star', "None", "None", "Error retrieving comment"
 
-def calculate_percentage_points(percent, percent_draw):
-    if percent >= 70:
+def calculate_percentage_points(percent, percent_draw, params=None):
+    params = params or RATING_PARAMETERS
+    if percent >= params['percent_high']:
         return 2
-    elif percent >= 60:
+    elif percent >= params['percent_low']:
         return 1
     elif percent >= 45 and percent_draw >= 45:
         return 0
     return 0
 
-def adjust_points_based_on_ratio(ratio_difference, is_home):
-    if ratio_difference >= 3:
+def adjust_points_based_on_ratio(ratio_difference, is_home, params=None):
+    params = params or RATING_PARAMETERS
+    if ratio_difference >= params['ratio_high']:
         return 2 if is_home else 0
-    elif ratio_difference >= 2:
+    elif ratio_difference >= params['ratio_low']:
         return 1 if is_home else 0
     elif ratio_difference >= 1:
         return 0 if is_home else 0
-    elif ratio_difference <= -3:
+    elif ratio_difference <= -params['ratio_high']:
         return 0 if is_home else 2
-    elif ratio_difference <= -2:
+    elif ratio_difference <= -params['ratio_low']:
         return 0 if is_home else 1
     return 0
 
-def adjust_points_based_on_goal_ratio(goal_ratio_difference, is_home):
-    if goal_ratio_difference >= 3:
+def adjust_points_based_on_goal_ratio(goal_ratio_difference, is_home, params=None):
+    params = params or RATING_PARAMETERS
+    if goal_ratio_difference >= params['goal_ratio_high']:
         return 2 if is_home else -1
-    elif goal_ratio_difference >= 2:
+    elif goal_ratio_difference >= params['goal_ratio_low']:
         return 1 if is_home else -1
     elif goal_ratio_difference >= 1:
         return 0
-    elif goal_ratio_difference <= -2:
+    elif goal_ratio_difference <= -params['goal_ratio_low']:
         return -1 if is_home else 1
-    elif goal_ratio_difference <= -3:
+    elif goal_ratio_difference <= -params['goal_ratio_high']:
         return -2 if is_home else 2
     return 0
 
-def adjust_points_based_on_rank(rank_difference, is_home):
-    if rank_difference >= 10:
+def adjust_points_based_on_rank(rank_difference, is_home, params=None):
+    params = params or RATING_PARAMETERS
+    if rank_difference >= params['rank_high']:
         return 2 if is_home else 0
-    elif rank_difference >= 5:
+    elif rank_difference >= params['rank_low']:
         return 1 if is_home else 0
-    elif rank_difference <= -10:
+    elif rank_difference <= -params['rank_high']:
         return 0 if is_home else 2
-    elif rank_difference <= -5:
+    elif rank_difference <= -params['rank_low']:
         return 0 if is_home else 1
     return 0
 
-def adjust_points_based_on_points_difference(home_points, away_points):
+def adjust_points_based_on_points_difference(home_points, away_points, params=None):
+    params = params or RATING_PARAMETERS
     points_difference = home_points - away_points
-    if points_difference >= 30:
+    if points_difference >= params['points_difference_high']:
         return 2
-    elif points_difference >= 20:
+    elif points_difference >= params['points_difference_low']:
         return 1
     elif points_difference >= 10:
         return 0
@@ -229,27 +238,17 @@ def determine_winner(home_team_points, away_team_points, home_team_name, away_te
     else:
         return "Draw"
 
-def determine_rating(home_team_points, away_team_points):
-    if away_team_points > home_team_points:
-        points_difference = abs(away_team_points - home_team_points)
-        if points_difference >= 6:
-            return 'three_star'
-        elif points_difference >= 4:
-            return 'two_star'
-        elif points_difference >= 2:
-            return 'one_star'
-        else:
-            return 'no_star'
+def determine_rating(home_team_points, away_team_points, params=None):
+    params = params or RATING_PARAMETERS
+    points_difference = abs(home_team_points - away_team_points)
+    if points_difference >= params['three_star']:
+        return 'three_star'
+    elif points_difference >= params['two_star']:
+        return 'two_star'
+    elif points_difference >= params['one_star']:
+        return 'one_star'
     else:
-        points_difference = abs(home_team_points - away_team_points)
-        if points_difference >= 6:
-            return 'three_star'
-        elif points_difference >= 4:
-            return 'two_star'
-        elif points_difference >= 2:
-            return 'one_star'
-        else:
-            return 'no_star'
+        return 'no_star'
 
 def calculate_win_lose_ratio(wins, losses):
     wins = int(wins)
@@ -0,0 +1,183 @@
+from services.fixtures import (
+    STATUSES_TO_SEARCH, TRUSTED_COUNTRIES, stream_fixtures, load_rated_fixture_index, append_rated_fixture,
+    compact_rated_fixtures
+)
+from services.standings import get_team_rank, prefetch_league_standings
+from services.predictions import rate_fixture, determine_rating, get_fixture_prediction, extract_rating_features
+from services.planner import plan_prediction_fetches, prediction_budget
+from services.records import FixtureRecord, RatingRecord
+from helpers.data.find_team_data import find_team_data_by_name
+from helpers.data.async_fetch import fetch_concurrently
+from helpers.settings import RATING_PARAMETERS, FETCH_CONCURRENCY
+
+# Rated-fixtures list each determine_rating result is stored in
+RATING_TIER_GAMES = {
+    'three_star': 'three_star_games',
+    'two_star': 'two_star_games',
+    'one_star': 'one_star_games'
+}
+
+def skipped_fixture_info(fixture_data, comment, warning="", **extra):
+    """Build the no-star RatingRecord stored for a fixture that could not be rated."""
+    return RatingRecord(FixtureRecord.from_api(fixture_data), comment=comment, warning=warning, **extra)
+
+def screen_fixture(fixture_data, team_info, params=None):
+    """
+    Decide from the standings alone whether a fixture is worth rating. Teams
+    closer than params['min_rank_difference'] in the table are not worth a
+    prediction call.
+
+    :param fixture_data: Fixture from the API.
+    :param team_info: StandingsIndex of the fixture's league.
+    :param params: Rating parameters, RATING_PARAMETERS by default.
+    :return: None if the fixture is a candidate, otherwise its no-star RatingRecord.
+    """
+    params = params or RATING_PARAMETERS
+    fixture_id = fixture_data['fixture']['id']
+    home_team = fixture_data['teams']['home']
+    away_team = fixture_data['teams']['away']
+
+    home_team_rank = get_team_rank(team_info, home_team['name'], home_team.get('id'))
+    away_team_rank = get_team_rank(team_info, away_team['name'], away_team.get('id'))
+
+    if home_team_rank is None or away_team_rank is None:
+        print(f"Rank data missing for fixture {fixture_id}. Skipping fixture {fixture_id}.")
+        return skipped_fixture_info(fixture_data, "Rank data missing")
+
+    if abs(home_team_rank - away_team_rank) < params['min_rank_difference']:
+        print(f"Rank difference between {home_team['name']} and {away_team['name']} is less than {params['min_rank_difference']}. Skipping fixture {fixture_id}.")
+        return skipped_fixture_info(fixture_data, "Rank difference too small to predict", home_team_points=0, away_team_points=0)
+
+    return None
+
+def rate_candidate(fixture_data, team_info, predictions, params=None):
+    """
+    Rate a fixture that passed screen_fixture.
+
+    :return: (games_list_name, RatingRecord). The list name is None when the
+             fixture rated below one star and is not stored.
+    """
+    fixture_id = fixture_data['fixture']['id']
+    home_team = fixture_data['teams']['home']
+    away_team = fixture_data['teams']['away']
+
+    if not predictions:
+        print(f"No predictions available for fixture {fixture_id}. Skipping fixture {fixture_id}.")
+        return 'no_star_games', skipped_fixture_info(fixture_data, "No predictions available")
+
+    home_team_data = find_team_data_by_name(home_team['name'], team_info, home_team.get('id'))
+    away_team_data = find_team_data_by_name(away_team['name'], team_info, away_team.get('id'))
+    home_team_points, away_team_points, rating, winner_name, points_winner_name, comment = rate_fixture(predictions, home_team_data, away_team_data, params)
+
+    # Recalculate the rating after adjusting for injuries (TODO)
+    rating = determine_rating(home_team_points, away_team_points, params)
+
+    # Keep the inputs as they are now; the standings will have moved on by the time of a backtest
+    try:
+        features = extract_rating_features(predictions, home_team_data, away_team_data)
+    except (KeyError, IndexError, ValueError, AttributeError, TypeError):
+        features = None
+
+    fixture_info = RatingRecord(
+        FixtureRecord.from_api(fixture_data), home_team_points, away_team_points, rating,
+        winner_name, points_winner_name, comment, features=features
+    )
+    return RATING_TIER_GAMES.get(rating), fixture_info
+
+def rate_fixtures(date_str=None, league_ids=None):
+    """
+    Rate the fixtures of a day that have not been rated yet and store the
+    results in the day's rated fixtures file.
+
+    :param date_str: Day as 'YYYY-MM-DD', today by default.
+    :param league_ids: Optional collection of league ids to restrict rating to.
+    :return: Dictionary with the processed, rated, skipped and deferred counts.
+    """
+    processed_fixture_ids = load_rated_fixture_index(date_str)
+
+    prediction_candidates = {}
+
+    total_games_processed = 0
+    games_rated = 0
+    games_skipped = 0
+
+    # Only the fixtures that pass the status/country filter are kept in memory
+    filtered_fixtures = [fixture_data for fixture_data in stream_fixtures(STATUSES_TO_SEARCH, TRUSTED_COUNTRIES, date_str)
+                         if not league_ids or fixture_data['league']['id'] in league_ids]
+
+    # Load or fetch the standings of every league concurrently before rating, so
+    # the loop below never waits on I/O
+    fixture_league_ids = {fixture_data['league']['id'] for fixture_data in filtered_fixtures
+                          if fixture_data['fixture']['id'] not in processed_fixture_ids}
+    league_standings_cache = prefetch_league_standings(fixture_league_ids, FETCH_CONCURRENCY)
+    failed_league_ids = {league_id for league_id, team_info in league_standings_cache.items() if team_info is None}
+    if failed_league_ids:
+        print(f"Standings data is empty or invalid for leagues {', '.join(str(league_id) for league_id in sorted(failed_league_ids))}.")
+
+    for fixture_data in filtered_fixtures:
+        total_games_processed += 1
+        fixture_id = fixture_data['fixture']['id']
+        if fixture_id in processed_fixture_ids:
+            games_skipped += 1
+        
+            continue
+
+        league_id = fixture_data['league']['id']
+
+        # Skip fixtures of leagues whose standings could not be loaded
+        if league_id in failed_league_ids:
+            print(f"No standings data for league {league_id}. Skipping fixture {fixture_id}.")
+
+            append_rated_fixture('no_star_games', skipped_fixture_info(fixture_data, "No standings data available"), date_str)
+            games_skipped += 1
+
+            continue
+
+        team_info = league_standings_cache.get(league_id)
+
+        if not team_info:
+            print(f"No team info extracted for league {league_id}. Skipping fixture {fixture_id}.")
+
+            append_rated_fixture('no_star_games', skipped_fixture_info(fixture_data, "No team info extracted"), date_str)
+            games_skipped += 1
+
+            continue
+
+        skipped_info = screen_fixture(fixture_data, team_info)
+        if skipped_info is not None:
+            append_rated_fixture('no_star_games', skipped_info, date_str)
+            games_skipped += 1
+
+            continue
+
+        # Predictions for the remaining candidates are fetched concurrently below
+        prediction_candidates[fixture_id] = (fixture_data, team_info)
+
+    # Spend the request budget on the most promising candidates first; deferred
+    # fixtures stay unrated so a later run can pick them up
+    planned_fixture_ids, deferred_fixture_ids = plan_prediction_fetches(prediction_candidates, prediction_budget())
+    if deferred_fixture_ids:
+        print(f"Prediction budget reached. Deferring {len(deferred_fixture_ids)} fixtures to a later run.")
+
+    for fixture_id, predictions in fetch_concurrently(get_fixture_prediction, planned_fixture_ids, FETCH_CONCURRENCY):
+        fixture_data, team_info = prediction_candidates[fixture_id]
+        games_list, fixture_info = rate_candidate(fixture_data, team_info, predictions)
+
+        if not predictions:
+            append_rated_fixture(games_list, fixture_info, date_str)
+            games_skipped += 1
+
+            continue
+
+        if games_list:
+            append_rated_fixture(games_list, fixture_info, date_str)
+        games_rated += 1
+
+    compact_rated_fixtures(date_str)
+
+    return {
+        'processed': total_games_processed,
+        'rated': games_rated,
+        'skipped': games_skipped,
+        'deferred': len(deferred_fixture_ids)
+    }
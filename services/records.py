@@ -0,0 +1,128 @@
+# Inputs of the rating model kept with each rating (see extract_rating_features),
+# stored as a list in this order
+RATING_FEATURES = (
+    'percent_home', 'percent_draw', 'percent_away', 'win_ratio_difference', 'goal_ratio_difference',
+    'rank_difference', 'home_points', 'away_points', 'home_goals_diff', 'away_goals_diff', 'home_form', 'away_form'
+)
+
+class FixtureRecord:
+    """
+    The few fields of an API fixture that ratings, bets and backtests use.
+    The full payload stays in the fixtures cache.
+
+    Stored on disk as a plain list in __slots__ order.
+    """
+
+    __slots__ = ('fixture_id', 'date', 'league_id', 'league_name', 'country', 'home_id', 'home_name', 'away_id', 'away_name')
+
+    def __init__(self, fixture_id, date, league_id, league_name, country, home_id, home_name, away_id, away_name):
+        self.fixture_id = fixture_id
+        self.date = date
+        self.league_id = league_id
+        self.league_name = league_name
+        self.country = country
+        self.home_id = home_id
+        self.home_name = home_name
+        self.away_id = away_id
+        self.away_name = away_name
+
+    @classmethod
+    def from_api(cls, fixture_data):
+        """Build a record from a fixture of a /fixtures response."""
+        league = fixture_data['league']
+        home_team = fixture_data['teams']['home']
+        away_team = fixture_data['teams']['away']
+        return cls(
+            fixture_data['fixture']['id'], fixture_data['fixture'].get('date'),
+            league.get('id'), league.get('name'), league.get('country'),
+            home_team.get('id'), home_team['name'], away_team.get('id'), away_team['name']
+        )
+
+    def to_list(self):
+        return [getattr(self, name) for name in self.__slots__]
+
+    @classmethod
+    def from_list(cls, values):
+        return cls(*values)
+
+    def __repr__(self):
+        return f"FixtureRecord({self.fixture_id}, {self.home_name!r} vs {self.away_name!r})"
+
+class RatingRecord:
+    """
+    Rating of one fixture as stored in rated_fixtures_<date>.json.
+
+    Stored on disk as a plain list in __slots__ order with the fixture as a
+    nested list. Entries written before this format (dictionaries embedding the
+    whole API fixture) are converted on load by from_json.
+
+    features holds the model inputs as they were when the fixture was rated,
+    so backtests and sweeps do not see standings from after kickoff. It is None
+    for fixtures that were not rated and for ratings stored before it existed.
+    """
+
+    __slots__ = ('fixture', 'home_team_points', 'away_team_points', 'rating', 'winning_team', 'points_winner_name', 'comment', 'warning',
+                 'features')
+
+    def __init__(self, fixture, home_team_points=None, away_team_points=None, rating=None, winning_team=None,
+                 points_winner_name=None, comment="", warning="", features=None):
+        self.fixture = fixture
+        self.home_team_points = home_team_points
+        self.away_team_points = away_team_points
+        self.rating = rating
+        self.winning_team = winning_team
+        self.points_winner_name = points_winner_name
+        self.comment = comment
+        self.warning = warning
+        self.features = features
+
+    @property
+    def fixture_id(self):
+        return self.fixture.fixture_id
+
+    @property
+    def league_name(self):
+        return self.fixture.league_name
+
+    def to_dict(self):
+        """Flat dictionary for JSON and CSV output."""
+        fixture = self.fixture
+        return {
+            'fixture_id': fixture.fixture_id,
+            'kickoff': fixture.date,
+            'league_id': fixture.league_id,
+            'league': fixture.league_name,
+            'country': fixture.country,
+            'home': fixture.home_name,
+            'away': fixture.away_name,
+            'home_team_points': self.home_team_points,
+            'away_team_points': self.away_team_points,
+            'rating': self.rating,
+            'predicted_winner': self.winning_team,
+            'points_winner': self.points_winner_name,
+            'comment': self.comment,
+            'warning': self.warning
+        }
+
+    def to_json(self):
+        features = [self.features.get(name) for name in RATING_FEATURES] if self.features else None
+        return [self.fixture.to_list()] + [getattr(self, name) for name in self.__slots__[1:-1]] + [features]
+
+    @classmethod
+    def from_json(cls, value):
+        if isinstance(value, list):
+            record = cls(FixtureRecord.from_list(value[0]), *value[1:8])
+            if len(value) > 8 and value[8]:
+                record.features = dict(zip(RATING_FEATURES, value[8]))
+            return record
+
+        # Older entries: a dictionary with the full API fixture under 'fixture_data'
+        return cls(
+            FixtureRecord.from_api(value['fixture_data']),
+            value.get('home_team_points'), value.get('away_team_points'), value.get('rating'),
+            value.get('winning_team'), value.get('points_winner_name'), value.get('comment', ""),
+            value.get('warning', "")
+        )
+
+    def __repr__(self):
+        return f"RatingRecord({self.fixture!r}, {self.home_team_points} - {self.away_team_points}, {self.rating!r})"
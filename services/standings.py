@@ -1,69 +1,116 @@
-import os
-import json
+import re
+import unicodedata
 
-from datetime import datetime, timedelta
 from fetchers import fetch_league_standings
+from helpers.data.cache import get_cache
 from helpers.data.fetch_data import fetch_data_with_rate_limit
+from helpers.data.async_fetch import fetch_concurrently
+from helpers.settings import FETCH_CONCURRENCY
 
-from config import STANDINGS_DIR
+def get_standings_data(league_id):
+    standings_cache = get_cache('standings')
+
+    standings = standings_cache.get(league_id)
+    if standings is not None:
+        print(f"Standings data for league {league_id} is up to date, loading from cache.")
+    else:
+        # Concurrent workers missing the same league wait here for one fetch
+        with standings_cache.single_flight(league_id) as standings:
+            if standings is None:
+                print(f"Fetching new standings data for league {league_id}...")
+                standings = fetch_data_with_rate_limit(fetch_league_standings, league_id)
+                if standings_cache.set(league_id, standings):
+                    # Keep the persisted index in step with the standings it was built from
+                    get_cache('standings_index').set(league_id, extract_team_info(standings).to_dict())
+                    print("Standings data fetched and stored successfully.")
+                else:
+                    # Handle the case where the response is empty or invalid
+                    print(f"Empty or invalid standings data received for league {league_id}. Skipping update.")
+                    standings = {'response': []}
+    
+    return standings
+
+def normalize_team_name(team_name):
+    """Lower-case a team name and strip accents, punctuation and spaces for loose matching."""
+    decomposed = unicodedata.normalize('NFKD', team_name or '')
+    ascii_name = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return re.sub(r'[^a-z0-9]', '', ascii_name.casefold())
 
-def is_data_up_to_date(filename, current_date):
+class StandingsIndex:
     """
-    Check if the data in the file is up-to-date based on the current date.
+    Teams of one league, indexed by team id with the normalized name as a
+    secondary key.
 
-    :param filename: Path to the JSON file.
-    :param current_date: The current date to compare against the file's last update.
-    :return: True if data is up-to-date, False otherwise.
+    Iterating yields the team dictionaries in standings order, so the index can
+    be used anywhere the plain team list was used before.
+
+    :param teams: List of team dictionaries as built by extract_team_info.
     """
-    try:
-        # Check if the file exists and get its last modified date
-        file_mod_time = datetime.fromtimestamp(os.path.getmtime(filename)).date()
-        
-        # Calculate the date range for checking
-        date_range_start = current_date - timedelta(days=1)  # Yesterday
-        date_range_end = current_date  # Today
-        
-        # Compare file modification date with the current date
-        return date_range_start <= file_mod_time <= date_range_end
-    except (OSError, ValueError):
-        return False
 
-def get_standings_data(league_id):
-    # Define the file path
-    filename = os.path.join(STANDINGS_DIR, f'standings_{league_id}.json')
-    
-    # Ensure the directory exists
-    os.makedirs(STANDINGS_DIR, exist_ok=True)
-    
-    # Use current date for checking
-    current_date = datetime.now().date()
-
-    # Check if the data file exists and is up-to-date
-    if os.path.exists(filename) and is_data_up_to_date(filename, current_date):
-        print(f"Standings data for league {league_id} is up to date, loading from file.")
-        with open(filename, 'r') as f:
-            standings = json.load(f)
-    else:
-        print(f"Fetching new standings data for league {league_id}...")
-        standings = fetch_data_with_rate_limit(fetch_league_standings, league_id)
-        if standings and 'response' in standings and isinstance(standings['response'], list) and len(standings['response']) > 0:
-            with open(filename, 'w') as f:
-                json.dump(standings, f, indent=4)
-            print("Standings data fetched and stored successfully.")
-        else:
-            # Handle the case where the response is empty or invalid
-            print(f"Empty or invalid standings data received for league {league_id}. Skipping update.")
-            # Optionally, set standings to an empty list or handle accordingly
-            standings = {'response': []}
-    
-    return standings
+    def __init__(self, teams):
+        self.teams = teams
+        self.by_id = {team['team_id']: team for team in teams if team.get('team_id') is not None}
+        self.by_name = {normalize_team_name(team['team_name']): team for team in teams}
+
+    def find(self, team_id=None, team_name=None):
+        """Look a team up by id first, falling back to its normalized name."""
+        if team_id is not None and team_id in self.by_id:
+            return self.by_id[team_id]
+        if team_name is not None:
+            return self.by_name.get(normalize_team_name(team_name))
+        return None
+
+    def to_dict(self):
+        return {'teams': self.teams}
+
+    def __iter__(self):
+        return iter(self.teams)
+
+    def __len__(self):
+        return len(self.teams)
+
+def get_league_standings_index(league_id):
+    """
+    Return the StandingsIndex for a league, building it from the standings only
+    when no fresh persisted index exists.
+
+    :param league_id: League id.
+    :return: StandingsIndex, or None when no standings data is available.
+    """
+    index_cache = get_cache('standings_index')
+
+    index_data = index_cache.get(league_id)
+    if index_data is not None:
+        return StandingsIndex(index_data['teams'])
+
+    standings_data = get_standings_data(league_id)
+    if not standings_data or not standings_data.get('response'):
+        return None
+
+    index = extract_team_info(standings_data)
+    index_cache.set(league_id, index.to_dict())
+    return index
+
+def prefetch_league_standings(league_ids, concurrency=FETCH_CONCURRENCY):
+    """
+    Load the StandingsIndex of every league before rating starts.
+
+    Each league is handled in its own worker thread: cached leagues are read
+    from disk in parallel and missing ones are fetched concurrently, paced by
+    the shared rate limiter.
+
+    :param league_ids: League ids of the day's fixtures.
+    :return: Dictionary of league id -> StandingsIndex, or None for leagues
+             without usable standings.
+    """
+    return dict(fetch_concurrently(get_league_standings_index, set(league_ids), concurrency))
 
 def extract_team_info(standings_data):
     """
     Extract and return the team rank from the standings data.
 
     :param standings_data: The JSON response containing league standings.
-    :return: A list of dictionaries with team rank and other details.
+    :return: A StandingsIndex over dictionaries with team rank and other details.
     """
     # Initialize an empty list to store team ranks
     team_ranks = []
@@ -72,24 +119,25 @@ def extract_team_info(standings_data):
     response_list = standings_data.get('response', [])
     if not response_list:
         print("No response data available.")
-        return team_ranks
+        return StandingsIndex(team_ranks)
     
     league_data = response_list[0].get('league', {})
     standings_list = league_data.get('standings', [])
     if not standings_list:
         print("No standings data available.")
-        return team_ranks
+        return StandingsIndex(team_ranks)
     
     standings = standings_list[0]  # Assuming standings_list contains one list of standings
     if not isinstance(standings, list):
         print("Standings data is not a list.")
-        return team_ranks
+        return StandingsIndex(team_ranks)
     
     # Iterate through each team in the standings
     for team in standings:
         # Extract relevant details including rank
         team_info = {
             'rank': team.get('rank'),
+            'team_id': team.get('team', {}).get('id'),
             'team_name': team.get('team', {}).get('name', 'Unknown'),
             'points': team.get('points'),
             'goalsDiff': team.get('goalsDiff'),
@@ -98,16 +146,21 @@ def extract_team_info(standings_data):
         }
         team_ranks.append(team_info)
     
-    return team_ranks
+    return StandingsIndex(team_ranks)
 
-def get_team_rank(team_ranks, team_name):
+def get_team_rank(team_ranks, team_name, team_id=None):
     """
     Get the rank of a specific team from the list of team ranks.
 
-    :param team_ranks: List of dictionaries containing team information.
+    :param team_ranks: StandingsIndex or list of dictionaries containing team information.
     :param team_name: Name of the team to find the rank for.
+    :param team_id: Optional team id, preferred over the name when given.
     :return: The rank of the team if found, otherwise None.
     """
+    if isinstance(team_ranks, StandingsIndex):
+        team = team_ranks.find(team_id, team_name)
+        return team['rank'] if team else None
+
     for team in team_ranks:
         if team['team_name'] == team_name:
             return team['rank']
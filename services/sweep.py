@@ -0,0 +1,211 @@
+import itertools
+import json
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from services.fixtures import load_rated_fixtures, RATING_TIERS
+from services.backtest import list_rated_dates, load_cached_results, report_missing_results
+from services.batch_rating import features_to_columns, calculate_points_batch, rating_from_points
+from services.bets import load_saved_bets, get_bet_side
+from helpers.settings import RATING_PARAMETERS
+
+from config import BETS_DIR
+
+# Values tried for each parameter; anything left out keeps its RATING_PARAMETERS value
+DEFAULT_GRID = {
+    'percent_high': [65, 70, 75],
+    'percent_low': [55, 60],
+    'ratio_high': [2.5, 3, 4],
+    'ratio_low': [1.5, 2],
+    'rank_high': [8, 10, 12],
+    'rank_low': [4, 5, 6],
+    'points_difference_high': [25, 30],
+    'points_difference_low': [15, 20],
+    'three_star': [5, 6, 7],
+    'two_star': [4],
+    'one_star': [2],
+    'min_rank_difference': [4, 6, 8],
+}
+
+def build_sweep_dataset(start_date=None, end_date=None):
+    """
+    Collect the saved rating inputs, rank gaps, final scores and odds of every
+    archived fixture that was rated from predictions and has a final score.
+
+    The inputs are the ones stored with each rating, so standings from after
+    kickoff never leak into the evaluation. Ratings stored before the inputs
+    were saved are left out. Fixtures the rank screen skipped were never rated
+    from predictions, so min_rank_difference can only be evaluated at or above
+    the value used when the data was collected.
+    """
+    dates = list_rated_dates(start_date, end_date)
+    rated = {}
+    for date_str in dates:
+        rated_fixtures = load_rated_fixtures(date_str)
+        for tier in RATING_TIERS:
+            for fixture_info in rated_fixtures.get(tier, []):
+                rated[fixture_info.fixture_id] = fixture_info
+
+    results = load_cached_results(list(rated), dates)
+    # Fixtures the rank screen skipped were never rated, so their scores do not matter
+    report_missing_results([fixture_id for fixture_id, fixture_info in rated.items() if fixture_info.rating], results)
+    bets = load_saved_bets() if os.path.isdir(BETS_DIR) else []
+    odds = {bet['fixture_id']: (get_bet_side(bet), bet.get('multiplier')) for bet in bets}
+
+    feature_rows, outcomes, fixture_odds, bet_sides = [], [], [], []
+    without_features = 0
+    for fixture_id, fixture_info in rated.items():
+        if fixture_id not in results:
+            continue
+        if not fixture_info.features:
+            # Skipped fixtures have no rating; the others were stored before their inputs were
+            if fixture_info.rating:
+                without_features += 1
+            continue
+
+        home_goals, away_goals = results[fixture_id]
+        feature_rows.append(fixture_info.features)
+        outcomes.append(np.sign(home_goals - away_goals))
+        bet_side, multiplier = odds.get(fixture_id, (None, None))
+        fixture_odds.append(multiplier or np.nan)
+        bet_sides.append(2 if bet_side is None or not multiplier else bet_side)
+
+    if without_features:
+        print(f"{without_features} settled fixtures were rated before their rating inputs were saved and are left out.")
+
+    columns = features_to_columns(feature_rows)
+    return {
+        'columns': columns,
+        'rated_mask': np.ones(len(feature_rows), dtype=bool),
+        'rank_gap': np.abs(columns['rank_difference']),
+        'outcome': np.array(outcomes, dtype=np.int8),
+        'odds': np.array(fixture_odds, dtype=float),
+        'bet_side': np.array(bet_sides, dtype=np.int8)    # 1 home, -1 away, 0 draw, 2 no bet
+    }
+
+def evaluate_parameters(dataset, params):
+    """Score one parameter set: fixtures picked, hits, hit rate and ROI overall and for three stars."""
+    home_team_points, away_team_points = calculate_points_batch(dataset['columns'], dataset['rated_mask'], params)
+    tiers = rating_from_points(home_team_points, away_team_points, params)
+    pick = np.sign(home_team_points - away_team_points)
+
+    selected = dataset['rated_mask'] & (dataset['rank_gap'] >= params['min_rank_difference']) & (tiers >= 1)
+    hit = selected & (pick == dataset['outcome'])
+    three_star = selected & (tiers == 3)
+
+    # A bet's odds are the price of the side that was bet on, so only picks of that side count
+    with_odds = selected & (pick == dataset['bet_side'])
+    profit = np.where(hit, dataset['odds'] - 1, -1.0)[with_odds].sum()
+
+    picked = int(selected.sum())
+    three_star_picked = int(three_star.sum())
+    return {
+        'params': params,
+        'picked': picked,
+        'hits': int(hit.sum()),
+        'hit_rate': float(hit.sum() / picked * 100) if picked else None,
+        'three_star_picked': three_star_picked,
+        'three_star_hit_rate': float((hit & three_star).sum() / three_star_picked * 100) if three_star_picked else None,
+        'roi': float(profit / with_odds.sum() * 100) if with_odds.any() else None
+    }
+
+def iter_parameter_grid(grid):
+    """Yield every consistent parameter combination of the grid, filled up from RATING_PARAMETERS."""
+    names = list(grid)
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(RATING_PARAMETERS, **dict(zip(names, values)))
+        if params['percent_low'] > params['percent_high'] or params['ratio_low'] > params['ratio_high']:
+            continue
+        if params['rank_low'] > params['rank_high'] or params['points_difference_low'] > params['points_difference_high']:
+            continue
+        if not params['one_star'] <= params['two_star'] <= params['three_star']:
+            continue
+        yield params
+
+_worker_dataset = None
+
+def _init_worker(dataset):
+    global _worker_dataset
+    _worker_dataset = dataset
+
+def _evaluate_chunk(chunk):
+    return [evaluate_parameters(_worker_dataset, params) for params in chunk]
+
+def _chunks(items, size):
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def run_sweep(grid=None, start_date=None, end_date=None, workers=None, min_picked=20, top=10):
+    """
+    Evaluate every parameter combination in the grid against cached history on
+    all cores and print the best configurations by hit rate and by ROI.
+
+    :param grid: Dictionary of parameter name -> list of values (DEFAULT_GRID by default).
+    :param min_picked: Ignore configurations that pick fewer fixtures than this.
+    :param top: Number of configurations listed per ranking.
+    :return: Dictionary with the 'by_hit_rate' and 'by_roi' rankings.
+    """
+    dataset = build_sweep_dataset(start_date, end_date)
+    fixture_count = len(dataset['outcome'])
+    if not fixture_count:
+        print("No settled fixtures with cached predictions found.")
+        return None
+
+    combinations = list(iter_parameter_grid(grid or DEFAULT_GRID))
+    print(f"Evaluating {len(combinations)} configurations on {fixture_count} settled fixtures...")
+
+    evaluations = []
+    chunk_size = max(1, len(combinations) // ((workers or os.cpu_count() or 1) * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(dataset,)) as executor:
+        for chunk_results in executor.map(_evaluate_chunk, _chunks(combinations, chunk_size)):
+            evaluations.extend(chunk_results)
+
+    eligible = [evaluation for evaluation in evaluations if evaluation['picked'] >= min_picked]
+    rankings = {
+        'by_hit_rate': sorted(
+            (evaluation for evaluation in eligible if evaluation['hit_rate'] is not None),
+            key=lambda evaluation: evaluation['hit_rate'], reverse=True
+        )[:top],
+        'by_roi': sorted(
+            (evaluation for evaluation in eligible if evaluation['roi'] is not None),
+            key=lambda evaluation: evaluation['roi'], reverse=True
+        )[:top]
+    }
+
+    for title, ranking in rankings.items():
+        print(f"\nBest configurations {title.replace('_', ' ')}:")
+        for evaluation in ranking:
+            changed = {name: value for name, value in evaluation['params'].items() if value != RATING_PARAMETERS[name]}
+            roi_text = f"{evaluation['roi']:.1f}%" if evaluation['roi'] is not None else "-"
+            print(f"hit rate {evaluation['hit_rate']:.1f}% over {evaluation['picked']} picks, ROI {roi_text}, changes: {changed or 'none'}")
+    return rankings
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Grid-search the rating thresholds against cached history.")
+    parser.add_argument('--grid', default=None, help="JSON file mapping parameter names to lists of values")
+    parser.add_argument('--start', default=None, help="First date to include (YYYY-MM-DD)")
+    parser.add_argument('--end', default=None, help="Last date to include (YYYY-MM-DD)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--min-picked', type=int, default=20, help="Minimum picks for a configuration to be ranked")
+    parser.add_argument('--top', type=int, default=10, help="Configurations listed per ranking")
+    parser.add_argument('--output', default=None, help="Write the rankings to this JSON file")
+    args = parser.parse_args()
+
+    grid = None
+    if args.grid:
+        with open(args.grid, 'r') as file:
+            grid = json.load(file)
+
+    rankings = run_sweep(grid, args.start, args.end, args.workers, args.min_picked, args.top)
+    if rankings and args.output:
+        with open(args.output, 'w') as file:
+            json.dump(rankings, file, indent=4)
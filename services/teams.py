@@ -1,10 +1,6 @@
-import json
-import os
-
-from helpers.date_helper import is_data_up_to_date
 from fetchers import fetch_team_stats
-
-from config import TEAMS_DIR
+from helpers.data.cache import get_cache
+from helpers.data.fetch_data import fetch_data_with_rate_limit
 
 # def get_player_data(fixture_id):
 #     filename = os.path.join(TEAMS_DIR, f'teams_data_{fixture_id}.json')
@@ -25,15 +21,14 @@ from config import TEAMS_DIR
 #     return home_team_players, away_team_players
 
 def get_teams_data(team_id, league_id): 
-    filename = os.path.join(TEAMS_DIR, f'teams_data_{team_id}.json')
+    teams_cache = get_cache('team_stats')
 
-    if is_data_up_to_date(filename):
-         with open(filename, 'r') as f:
-             team_stats = json.load(f)
-    else:
-         print(f"Fetching new player data for fixture {team_id}...")
-         team_stats = fetch_team_stats(team_id, league_id)
-         with open(filename, 'w') as f:
-             json.dump(team_stats, f, indent=4)
+    team_stats = teams_cache.get(team_id)
+    if team_stats is None:
+        with teams_cache.single_flight(team_id) as team_stats:
+            if team_stats is None:
+                print(f"Fetching new player data for fixture {team_id}...")
+                team_stats = fetch_data_with_rate_limit(fetch_team_stats, team_id, league_id)
+                teams_cache.set(team_id, team_stats)
 
-    return team_stats
\ No newline at end of file
+    return team_stats
@@ -0,0 +1,27 @@
+import json
+
+from helpers.data.cache import get_cache, _memory
+from services.backtest import load_cached_results, report_missing_results
+
+DATE = '2003-03-03'
+
+def fixture(fixture_id, status, home_goals=None, away_goals=None):
+    return {
+        'fixture': {'id': fixture_id, 'status': {'short': status}},
+        'score': {'fulltime': {'home': home_goals, 'away': away_goals}}
+    }
+
+def test_results_are_streamed_from_the_day_list_and_the_fixture_cache():
+    day = [fixture(7001, 'FT', 2, 1), fixture(7002, 'NS'), fixture(7003, 'NS'), fixture(7099, 'FT', 0, 0)]
+    get_cache('fixtures').set_raw(DATE, json.dumps({'errors': [], 'response': day}))
+    # The day list was taken before kickoff; the score was fetched by id later
+    get_cache('fixture').set(7002, fixture(7002, 'FT', 0, 3))
+
+    results = load_cached_results([7001, 7002, 7003], [DATE])
+    assert results == {7001: (2, 1), 7002: (0, 3)}
+    assert _memory.get(('fixtures', DATE)) is None
+
+def test_fixtures_without_a_final_score_are_reported(capsys):
+    assert report_missing_results([1, 2, 3], {1: (1, 0)}) == 2
+    assert "2 rated fixtures have no final score" in capsys.readouterr().out
+    assert report_missing_results([1], {1: (1, 0)}) == 0
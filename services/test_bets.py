@@ -0,0 +1,38 @@
+import os
+import threading
+
+import pytest
+
+from services.bets import save_bets, save_updated_bets, load_saved_bets, get_bet_side
+
+from config import BETS_DIR
+
+@pytest.fixture(autouse=True)
+def empty_bets_dir():
+    if os.path.isdir(BETS_DIR):
+        for filename in os.listdir(BETS_DIR):
+            if os.path.isfile(os.path.join(BETS_DIR, filename)):
+                os.remove(os.path.join(BETS_DIR, filename))
+
+def bet(fixture_id, predicted_winner='Home FC'):
+    return {'fixture_id': fixture_id, 'team_name': "Home FC vs Away FC", 'multiplier': 1.8,
+            'predicted_winner': f"Predicted winner: {predicted_winner}"}
+
+def test_concurrent_saves_keep_every_bet():
+    threads = [threading.Thread(target=save_bets, args=([bet(fixture_id)],)) for fixture_id in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(saved['fixture_id'] for saved in load_saved_bets()) == list(range(20))
+    assert not [filename for filename in os.listdir(BETS_DIR) if filename.endswith('.tmp')]
+
+def test_save_updated_bets_without_a_bets_file():
+    save_updated_bets([bet(1)])
+    assert load_saved_bets() == [bet(1)]
+
+def test_bet_side():
+    assert get_bet_side(bet(1)) == 1
+    assert get_bet_side(bet(1, 'Away FC')) == -1
+    assert get_bet_side(bet(1, 'Draw')) == 0
+    assert get_bet_side(bet(1, 'None')) is None
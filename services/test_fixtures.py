@@ -0,0 +1,61 @@
+import os
+
+from services.fixtures import (
+    append_rated_fixture, compact_rated_fixtures, load_rated_fixtures, load_rated_fixture_index,
+    forget_rated_fixture_index, rated_fixtures_paths, get_fixture_rating_tier
+)
+from services.records import FixtureRecord, RatingRecord
+
+def rating(fixture_id, home_team_points=6, away_team_points=1):
+    fixture = FixtureRecord(fixture_id, '2024-10-05T15:00:00+00:00', 39, 'Premier League', 'England',
+                            1, 'Home FC', 2, 'Away FC')
+    return RatingRecord(fixture, home_team_points, away_team_points, 'three_star', 'Home FC', 'Home FC', "comment")
+
+def test_journal_and_index_round_trip():
+    date_str = '2001-01-01'
+    append_rated_fixture('three_star_games', rating(1), date_str)
+    append_rated_fixture('one_star_games', rating(2, 3, 1), date_str)
+
+    # Another process reads the journal from disk
+    forget_rated_fixture_index(date_str)
+    assert load_rated_fixture_index(date_str).keys() == {1, 2}
+    rated = load_rated_fixtures(date_str)
+    assert [record.fixture_id for record in rated['three_star_games']] == [1]
+    assert rated['one_star_games'][0].home_team_points == 3
+
+    compact_rated_fixtures(date_str)
+    snapshot_path, journal_path, index_path = rated_fixtures_paths(date_str)
+    assert os.path.getsize(journal_path) == 0
+    assert os.path.exists(snapshot_path) and os.path.exists(index_path)
+
+    forget_rated_fixture_index(date_str)
+    assert get_fixture_rating_tier(1, date_str) == 'three_star_games'
+    assert [record.fixture_id for record in load_rated_fixtures(date_str)['one_star_games']] == [2]
+
+def test_rerating_moves_a_fixture_to_its_new_tier():
+    date_str = '2001-01-02'
+    append_rated_fixture('one_star_games', rating(5, 3, 1), date_str)
+    compact_rated_fixtures(date_str)
+    append_rated_fixture('three_star_games', rating(5, 9, 1), date_str)
+
+    forget_rated_fixture_index(date_str)
+    rated = load_rated_fixtures(date_str)
+    assert rated['one_star_games'] == []
+    assert [record.home_team_points for record in rated['three_star_games']] == [9]
+
+def test_appends_leave_the_snapshot_alone_until_compaction():
+    date_str = '2001-01-03'
+    snapshot_path, journal_path, _ = rated_fixtures_paths(date_str)
+    for fixture_id in range(100, 220):
+        append_rated_fixture('two_star_games', rating(fixture_id, 4, 1), date_str)
+    assert not os.path.exists(snapshot_path)
+
+    compact_rated_fixtures(date_str)
+    snapshot_version = os.stat(snapshot_path).st_mtime_ns
+    # Nothing new in the journal: nothing to rewrite
+    compact_rated_fixtures(date_str)
+    assert os.stat(snapshot_path).st_mtime_ns == snapshot_version
+    assert os.path.getsize(journal_path) == 0
+
+    forget_rated_fixture_index(date_str)
+    assert len(load_rated_fixtures(date_str)['two_star_games']) == 120
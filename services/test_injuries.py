@@ -0,0 +1,52 @@
+from helpers.data.cache import get_cache
+from services.injuries import get_key_player_injuries, get_injury_data
+from services.players import get_player_data
+
+FIXTURE_ID = 868001
+HOME = {'id': 40, 'name': 'Liverpool', 'logo': 'https://media.api-sports.io/football/teams/40.png'}
+AWAY = {'id': 50, 'name': 'Manchester City', 'logo': 'https://media.api-sports.io/football/teams/50.png'}
+
+def player(player_id, name, rating):
+    return {
+        'player': {'id': player_id, 'name': name, 'photo': f'https://media.api-sports.io/football/players/{player_id}.png'},
+        'statistics': [{'games': {'minutes': 90 if rating else None, 'number': 9, 'position': 'F', 'rating': rating,
+                                  'captain': False, 'substitute': not rating}}]
+    }
+
+def injury(player_id, name, team):
+    return {
+        'player': {'id': player_id, 'name': name, 'photo': '', 'type': 'Missing Fixture', 'reason': 'Knee Injury'},
+        'team': team,
+        'fixture': {'id': FIXTURE_ID, 'timezone': 'UTC', 'date': '2024-10-05T14:00:00+00:00', 'timestamp': 1728136800},
+        'league': {'id': 39, 'season': 2024, 'name': 'Premier League', 'country': 'England'}
+    }
+
+def setup_module():
+    # Shaped like /fixtures?id=, /fixtures/players?fixture= and /injuries?fixture=; the away team comes first
+    get_cache('fixture').set(FIXTURE_ID, {
+        'fixture': {'id': FIXTURE_ID, 'status': {'short': 'NS'}},
+        'teams': {'home': dict(HOME, winner=None), 'away': dict(AWAY, winner=None)},
+        'score': {'fulltime': {'home': None, 'away': None}}
+    })
+    get_cache('players').set(FIXTURE_ID, {'get': 'fixtures/players', 'errors': [], 'results': 2, 'response': [
+        {'team': AWAY, 'players': [player(501, 'E. Haaland', '8.1'), player(502, 'J. Doku', '6.4')]},
+        {'team': HOME, 'players': [player(401, 'M. Salah', '7.6'), player(402, 'D. Nunez', None)]},
+    ]})
+    get_cache('injuries').set(FIXTURE_ID, {'get': 'injuries', 'errors': [], 'results': 3, 'response': [
+        injury(401, 'M. Salah', HOME), injury(402, 'D. Nunez', HOME), injury(501, 'E. Haaland', AWAY),
+    ]})
+
+def test_players_are_split_by_team_id():
+    home_players, away_players = get_player_data(FIXTURE_ID)
+    assert [entry['player']['id'] for entry in home_players] == [401, 402]
+    assert [entry['player']['id'] for entry in away_players] == [501, 502]
+
+def test_injuries_are_split_by_team_id():
+    home_injuries, away_injuries = get_injury_data(FIXTURE_ID)
+    assert [entry['player']['id'] for entry in home_injuries] == [401, 402]
+    assert [entry['player']['id'] for entry in away_injuries] == [501]
+
+def test_only_key_player_injuries_are_returned():
+    key_home_injuries, key_away_injuries = get_key_player_injuries(FIXTURE_ID)
+    assert [entry['player']['name'] for entry in key_home_injuries] == ['M. Salah']
+    assert [entry['player']['name'] for entry in key_away_injuries] == ['E. Haaland']
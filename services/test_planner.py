@@ -0,0 +1,16 @@
+from helpers.rate_limiter import TokenBucket
+from services import planner
+from services.planner import prediction_budget
+
+def test_cold_start_budget_applies_until_the_quota_is_known(monkeypatch):
+    limiter = TokenBucket(per_minute=1000)
+    monkeypatch.setattr(planner, 'get_rate_limiter', lambda: limiter)
+
+    assert prediction_budget(budget=None, reserve=10, cold_start_budget=40) == 40
+    assert prediction_budget(budget=25, reserve=10, cold_start_budget=40) == 25
+    assert prediction_budget(budget=None, reserve=10, cold_start_budget=None) is None
+
+    limiter.update_from_headers({'x-ratelimit-requests-remaining': '500'})
+    assert prediction_budget(budget=None, reserve=10, cold_start_budget=40) == 490
+    limiter.update_from_headers({'x-ratelimit-requests-remaining': '5'})
+    assert prediction_budget(budget=None, reserve=10, cold_start_budget=40) == 0
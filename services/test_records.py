@@ -0,0 +1,21 @@
+from services.records import FixtureRecord, RatingRecord
+
+FIXTURE = FixtureRecord(1208021, '2024-10-05T14:00:00+00:00', 39, 'Premier League', 'England', 40, 'Liverpool', 50, 'Manchester City')
+FEATURES = {
+    'percent_home': 50, 'percent_draw': 25, 'percent_away': 25, 'win_ratio_difference': 1.5,
+    'goal_ratio_difference': 0.8, 'rank_difference': 6, 'home_points': 19, 'away_points': 11,
+    'home_goals_diff': 12, 'away_goals_diff': -2, 'home_form': 'WWDWW', 'away_form': 'LDLWL'
+}
+
+def test_rating_round_trip_keeps_the_features():
+    record = RatingRecord(FIXTURE, 7, 2, 'two_star', 'Liverpool', 'Liverpool', "comment", features=FEATURES)
+    loaded = RatingRecord.from_json(record.to_json())
+    assert loaded.features == FEATURES
+    assert (loaded.fixture_id, loaded.home_team_points, loaded.rating, loaded.comment) == (1208021, 7, 'two_star', "comment")
+
+def test_ratings_stored_without_features_still_load():
+    stored = [FIXTURE.to_list(), 7, 2, 'two_star', 'Liverpool', 'Liverpool', "comment", ""]
+    loaded = RatingRecord.from_json(stored)
+    assert loaded.features is None
+    assert loaded.warning == ""
+    assert RatingRecord.from_json(loaded.to_json()).features is None
@@ -0,0 +1,38 @@
+from helpers.data.cache import get_cache
+from services.fixtures import append_rated_fixture, compact_rated_fixtures
+from services.records import FixtureRecord, RatingRecord
+from services.sweep import build_sweep_dataset
+
+DATE = '2002-02-02'
+
+def finished(fixture_id, home_goals, away_goals):
+    return {
+        'fixture': {'id': fixture_id, 'status': {'short': 'FT'}},
+        'teams': {'home': {'id': 1}, 'away': {'id': 2}},
+        'score': {'fulltime': {'home': home_goals, 'away': away_goals}}
+    }
+
+def features(rank_difference, home_points):
+    return {
+        'percent_home': 60, 'percent_draw': 20, 'percent_away': 20, 'win_ratio_difference': 2,
+        'goal_ratio_difference': 1, 'rank_difference': rank_difference, 'home_points': home_points, 'away_points': 10,
+        'home_goals_diff': 5, 'away_goals_diff': -3, 'home_form': 'WWWDW', 'away_form': 'LLDLW'
+    }
+
+def rating(fixture_id, saved_features):
+    fixture = FixtureRecord(fixture_id, f'{DATE}T15:00:00+00:00', 9999, 'Test League', 'England', 1, 'Home', 2, 'Away')
+    return RatingRecord(fixture, 6, 1, 'three_star', 'Home', 'Home', "", features=saved_features)
+
+def test_sweep_uses_the_inputs_saved_at_rating_time():
+    append_rated_fixture('three_star_games', rating(9001, features(-7, 30)), DATE)
+    append_rated_fixture('three_star_games', rating(9002, features(5, 25)), DATE)
+    # Rated before the inputs were saved: left out rather than rebuilt from later standings
+    append_rated_fixture('one_star_games', rating(9003, None), DATE)
+    compact_rated_fixtures(DATE)
+    for fixture_id, score in ((9001, (2, 0)), (9002, (0, 1)), (9003, (1, 1))):
+        get_cache('fixture').set(fixture_id, finished(fixture_id, *score))
+
+    dataset = build_sweep_dataset(DATE, DATE)
+    assert dataset['rank_gap'].tolist() == [7, 5]
+    assert dataset['columns']['home_points'].tolist() == [30, 25]
+    assert dataset['outcome'].tolist() == [1, -1]